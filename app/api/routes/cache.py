@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from app.services.entity_cache import entity_cache
+
+router = APIRouter()
+
+
+@router.get("/", summary="Page/post/user cache hit rate and memory use")
+async def get_entity_cache_stats():
+    return await entity_cache.stats()
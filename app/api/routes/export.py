@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.database import (
+    analytics_reads, pages_collection, posts_collection, scrape_current_collection, scraper_collection,
+)
+from app.core.pagination import date_range
+from app.core.serialization import parse_fields
+from app.services.export_service import FORMATS, iter_export
+
+router = APIRouter()
+
+# collection, sort (backed by an index), date field for since/until;
+# exports are long scans, so they read with the analytics read preference
+EXPORTS = {
+    "scraped": (analytics_reads(scraper_collection), [("scraped_at", 1), ("_id", 1)], "scraped_at"),
+    "current": (analytics_reads(scrape_current_collection), [("last_seen", 1), ("_id", 1)], "last_seen"),
+    "posts": (analytics_reads(posts_collection), [("created_at", 1), ("post_id", 1)], "created_at"),
+    "pages": (analytics_reads(pages_collection), [("page_id", 1)], None),
+}
+
+@router.get("/{name}")
+async def export_collection(
+    name: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include"),
+    gzip: bool = False,
+    page_id: Optional[str] = None,
+    type: Optional[str] = Query(None, description="Scrape type, for scraped and current data"),
+    status: Optional[str] = Query(None, description="Scrape status, for scraped data only"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Stream a whole collection as NDJSON or CSV, optionally gzipped"""
+    if name not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{name}', expected one of {', '.join(EXPORTS)}")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}', expected one of {', '.join(FORMATS)}")
+    collection, sort, date_field = EXPORTS[name]
+
+    query = {}
+    if page_id:
+        query["page_id"] = page_id
+    if name in ("scraped", "current") and type:
+        query["type"] = type
+    if name == "scraped":
+        if status:
+            query["status"] = status
+    if date_field:
+        query.update(date_range(date_field, since, until))
+
+    field_list = parse_fields(fields)
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        iter_export(collection, query, sort, format, field_list, compress=gzip),
+        media_type=FORMATS[format],
+        headers=headers,
+    )
@@ -1,44 +1,74 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from pymongo.errors import DuplicateKeyError
 from app.core.database import pages_collection
+from app.core.serialization import BSONResponse
 from app.models.page import PageBase, PageCreate
+from app.services.analytics_service import page_insights
+from app.services.bulk_service import bulk_upsert, iter_rows
+from app.services.entity_cache import entity_cache, entity_response
 
 router = APIRouter()
 
 
 @router.post("/", summary="Create a new LinkedIn Page")
 async def create_page(page: PageCreate):
-    existing_page = await pages_collection.find_one({"page_id": page.page_id})
-    if existing_page:
+    # The unique page_id index rejects duplicates, even under concurrent creates.
+    # Insert a copy: insert_one adds an ObjectId _id to the dict it is given
+    new_page = page.model_dump(mode="json")
+    try:
+        await pages_collection.insert_one(dict(new_page))
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Page with this ID already exists")
-
-    new_page = page.model_dump()
-    await pages_collection.insert_one(new_page)
     return {"message": "Page created successfully", "page": new_page}
 
 
 @router.get("/{page_id}", summary="Get LinkedIn Page details")
-async def get_page(page_id: str):
-    page = await pages_collection.find_one({"page_id": page_id})
+async def get_page(page_id: str, request: Request):
+    page = await entity_cache.get("pages", page_id, lambda: pages_collection.find_one({"page_id": page_id}))
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
-    return {"page": page}
+    return entity_response(request, page)
+
+
+@router.get("/{page_id}/insights", summary="Engagement insights for a LinkedIn Page")
+async def get_page_insights(
+    page_id: str,
+    days: int = Query(30, ge=1, le=3650, description="Whole days to cover, ending today"),
+    source: str = Query("rollups", description="rollups (precomputed per day) or posts (aggregated on the fly)"),
+):
+    if source not in ("rollups", "posts"):
+        raise HTTPException(status_code=400, detail="source must be 'rollups' or 'posts'")
+    return BSONResponse({"insights": await page_insights(page_id, days, source)})
 
 
 @router.put("/{page_id}", summary="Update LinkedIn Page")
 async def update_page(page_id: str, updated_data: PageBase):
-    page = await pages_collection.find_one({"page_id": page_id})
+    try:
+        page = await pages_collection.find_one_and_update(
+            {"page_id": page_id}, {"$set": updated_data.model_dump(mode="json")}, projection={"_id": 1}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Page with this ID already exists")
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
-
-    await pages_collection.update_one({"page_id": page_id}, {"$set": updated_data.model_dump()})
+    await entity_cache.invalidate("pages", [page_id, updated_data.page_id])
     return {"message": "Page updated successfully"}
 
 
 @router.delete("/{page_id}", summary="Delete LinkedIn Page")
 async def delete_page(page_id: str):
-    page = await pages_collection.find_one({"page_id": page_id})
-    if not page:
+    result = await pages_collection.delete_one({"page_id": page_id})
+    if not result.deleted_count:
         raise HTTPException(status_code=404, detail="Page not found")
-
-    await pages_collection.delete_one({"page_id": page_id})
+    await entity_cache.invalidate("pages", [page_id])
     return {"message": "Page deleted successfully"}
+
+
+@router.post("/bulk", summary="Bulk import or update pages")
+async def bulk_upsert_pages(request: Request):
+    """Upsert pages keyed on page_id, from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns counts and per-row errors."""
+    try:
+        return await bulk_upsert(pages_collection, PageCreate, "page_id", iter_rows(request), json_mode=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
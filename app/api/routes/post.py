@@ -1,54 +1,110 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.core.database import posts_collection
+from fastapi import APIRouter, HTTPException, Query, Request
+from pymongo.errors import DuplicateKeyError
+from app.core.database import analytics_reads, posts_collection
+from app.core.pagination import date_range, paginate
+from app.core.serialization import BSONResponse, field_projection, parse_fields
 from app.models.post import PostCreate, PostDB
-from typing import List
+from app.services.analytics_service import ROLLUP_PROJECTION, TOP_SORT_FIELDS, record_post_changes, top_posts
+from app.services.bulk_service import bulk_upsert, iter_rows
+from app.services.entity_cache import entity_cache, entity_response
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter()
 
 
+@router.get("/top", summary="Top LinkedIn Posts by engagement")
+async def get_top_posts(
+    days: int = Query(30, ge=1, le=3650, description="Only posts from the last N days"),
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    by: str = Query("engagement", description="engagement (likes + comments + shares), likes, comments_count or shares"),
+    page_id: Optional[str] = Query(None, description="Only posts from this page"),
+):
+    if by not in TOP_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Cannot rank by '{by}', expected one of {', '.join(TOP_SORT_FIELDS)}")
+    return BSONResponse({"posts": await top_posts(days, limit, by, page_id)})
+
+
 @router.get("/{post_id}", summary="Get LinkedIn Post details")
-async def get_post(post_id: str):
-    post = await posts_collection.find_one({"post_id": post_id})
+async def get_post(post_id: str, request: Request):
+    post = await entity_cache.get("posts", post_id, lambda: posts_collection.find_one({"post_id": post_id}))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return {"post": post}
+    return entity_response(request, post)
+
+
+# Newest first; post_id breaks ties so cursor pages are stable
+POST_SORT = [("created_at", -1), ("post_id", -1)]
 
 
 @router.get("/", summary="Get all LinkedIn Posts")
 async def get_all_posts(
     skip: int = Query(0, description="Number of posts to skip"),
-    limit: int = Query(10, description="Number of posts to retrieve")
+    limit: int = Query(10, description="Number of posts to retrieve"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
+    page_id: Optional[str] = Query(None, description="Only posts from this page"),
+    since: Optional[datetime] = Query(None, description="Only posts created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only posts created before this time"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; the sort fields are always included"),
 ):
-    posts = await posts_collection.find().skip(skip).limit(limit).to_list(length=limit)
-    return {"posts": posts}
+    query = date_range("created_at", since, until)
+    if page_id:
+        query["page_id"] = page_id
+    projection = field_projection(parse_fields(fields), [field for field, _ in POST_SORT])
+    try:
+        posts, next_cursor = await paginate(
+            analytics_reads(posts_collection), query, POST_SORT, limit, skip, cursor, projection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BSONResponse({"posts": posts, "next_cursor": next_cursor})
 
 
 @router.post("/", summary="Create a new LinkedIn Post")
 async def create_post(post: PostCreate):
-    existing_post = await posts_collection.find_one({"post_id": post.post_id})
-    if existing_post:
-        raise HTTPException(status_code=400, detail="Post with this ID already exists")
-
+    # The unique post_id index rejects duplicates, even under concurrent creates.
+    # Insert a copy: insert_one adds an ObjectId _id to the dict it is given
     new_post = post.model_dump()
-    await posts_collection.insert_one(new_post)
+    try:
+        await posts_collection.insert_one(dict(new_post))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Post with this ID already exists")
+    await record_post_changes([], [new_post])
     return {"message": "Post created successfully", "post": new_post}
 
 
 @router.put("/{post_id}", summary="Update LinkedIn Post")
 async def update_post(post_id: str, updated_data: PostCreate):
-    post = await posts_collection.find_one({"post_id": post_id})
+    changes = updated_data.model_dump(exclude_unset=True)
+    try:
+        # The pre-update version is returned so the rollups can move with it
+        post = await posts_collection.find_one_and_update(
+            {"post_id": post_id}, {"$set": changes}, projection=ROLLUP_PROJECTION
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Post with this ID already exists")
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-
-    await posts_collection.update_one({"post_id": post_id}, {"$set": updated_data.model_dump(exclude_unset=True)})
+    await record_post_changes([post], [{**post, **changes}])
+    await entity_cache.invalidate("posts", [post_id, changes.get("post_id")])
     return {"message": "Post updated successfully"}
 
 
 @router.delete("/{post_id}", summary="Delete LinkedIn Post")
 async def delete_post(post_id: str):
-    post = await posts_collection.find_one({"post_id": post_id})
+    post = await posts_collection.find_one_and_delete({"post_id": post_id}, projection=ROLLUP_PROJECTION)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-
-    await posts_collection.delete_one({"post_id": post_id})
+    await record_post_changes([post], [])
+    await entity_cache.invalidate("posts", [post_id])
     return {"message": "Post deleted successfully"}
+
+
+@router.post("/bulk", summary="Bulk import or update posts")
+async def bulk_upsert_posts(request: Request):
+    """Upsert posts keyed on post_id, from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns counts and per-row errors."""
+    try:
+        return await bulk_upsert(posts_collection, PostCreate, "post_id", iter_rows(request), track=record_post_changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,53 @@
+from typing import Optional
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query
+from app.core.database import refresh_schedule_collection
+from app.core.pagination import paginate
+from app.core.serialization import BSONResponse
+from app.models.schedule import RefreshScheduleCreate
+from app.services.refresh_scheduler import refresh_scheduler
+
+router = APIRouter()
+
+# Soonest due first
+SCHEDULE_SORT = [("next_due", 1), ("_id", 1)]
+
+
+def _serialize(entry: dict) -> dict:
+    entry["_id"] = str(entry["_id"])
+    return entry
+
+
+@router.post("/", summary="Schedule periodic refreshes of a page")
+async def schedule_refresh(entry: RefreshScheduleCreate):
+    """Create or update the refresh schedule for a URL and type"""
+    return {"schedule": _serialize(await refresh_scheduler.add(entry))}
+
+
+@router.get("/", summary="List scheduled refreshes")
+async def list_schedule(
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    type: Optional[str] = None,
+):
+    query = {"type": type} if type else {}
+    try:
+        entries, next_cursor = await paginate(refresh_schedule_collection, query, SCHEDULE_SORT, limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BSONResponse({"schedule": entries, "next_cursor": next_cursor})
+
+
+@router.get("/stats", summary="Refresh backlog, lateness and rate limiting")
+async def get_schedule_stats():
+    return await refresh_scheduler.stats()
+
+
+@router.delete("/{schedule_id}", summary="Stop refreshing a page")
+async def delete_schedule(schedule_id: str):
+    if not ObjectId.is_valid(schedule_id):
+        raise HTTPException(status_code=400, detail="Invalid schedule ID")
+    result = await refresh_schedule_collection.delete_one({"_id": ObjectId(schedule_id)})
+    if not result.deleted_count:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"message": "Schedule deleted successfully"}
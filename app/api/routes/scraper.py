@@ -1,434 +1,375 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import os
-from dotenv import load_dotenv
-import time
+import asyncio
+import json
+from fastapi import APIRouter, Body, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from app.core.database import scraper_collection
-from typing import Optional, Dict, Any, List
+from typing import Any, List, Optional
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.pagination import date_range, paginate
+from app.core.serialization import BSONResponse, field_projection, parse_fields
+from app.core.database import (
+    analytics_reads, linkedin_sessions_collection, scrape_current_collection, scraper_collection,
+)
+from app.models.scraper import LinkedInSessionCreate, ScrapeRequest
+from app.services.driver_pool import driver_pool
+from app.services.change_tracking import page_history
+from app.services.scrape_cache import normalize_url, scrape_cache
+from app.services.series_service import INTERVALS, METRICS, metric_series
+from app.services.job_service import TERMINAL_STATUSES, get_job, submit_job
+from app.services.session_registry import session_id, session_registry
+from app.services.scraper_service import (
+    ScraperBusyError,
+    execute_scrape,
+    save_scrape_log,
+    save_scrape_logs,
+    scrape_executor,
+    versioned_log_document,
+)
 from bson import ObjectId
 
 router = APIRouter()
 
-# Load environment variables
-load_dotenv()
-SESSION_COOKIE = os.getenv("LI_AT")
-
-class ScrapeRequest(BaseModel):
-    url: HttpUrl
-    type: str = "company"  # Default to company, can be "company", "profile", or "post"
-    page_id: Optional[str] = None  # Optional ID of the LinkedIn page
-
-class ScraperLog(BaseModel):
-    page_id: Optional[str] = None  # ID of the scraped page (if available)
-    url: str  # URL of the LinkedIn page as string, not HttpUrl
-    scraped_at: datetime  # Timestamp of scraping
-    status: str  # "success" or "failed"
-    message: str  # General message about the scrape result
-    error_message: Optional[str] = None  # Store errors if the scrape fails
-    data: Optional[Dict[str, Any]] = None  # The actual scraped data
-    type: str  # Store the type of scrape (company, profile, post)
-    
-    class Config:
-        arbitrary_types_allowed = True
+def _require_session(available: bool = True):
+    """Fail early when there is no session cookie, or when every session is benched"""
+    if not session_registry.has_sessions():
+        raise HTTPException(status_code=500, detail="Missing LinkedIn session cookie")
+    retry_after = session_registry.retry_after() if available else None
+    if retry_after:
+        raise HTTPException(
+            status_code=503,
+            detail="Every LinkedIn session is cooling down, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
 
 @router.post("/scrape")
 async def scrape_linkedin_page(request: ScrapeRequest):
-    if not SESSION_COOKIE:
-        raise HTTPException(status_code=500, detail="Missing LinkedIn session cookie")
+    _require_session()
 
-    # Create a scraper log entry - convert HttpUrl to string
-    scraper_log = ScraperLog(
-        page_id=request.page_id,
-        url=str(request.url),  # Convert HttpUrl to string
-        scraped_at=datetime.now(),
-        status="pending",
-        message="Scraping in progress",
-        type=request.type  # Store the page type
-    )
+    # Recent results are served from cache and identical requests share one scrape
+    return await scrape_cache.get_or_scrape(request, _scrape_and_store)
 
-    # Set up Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36")
+async def _scrape_and_store(request: ScrapeRequest):
+    # The browser work runs on the scrape worker pool, not on the event loop
+    try:
+        scraper_log = await execute_scrape(request)
+    except ScraperBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
-    # Initialize Selenium WebDriver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # The browser itself failed, as opposed to a partial extraction
+    crashed = scraper_log.status == "failed" and scraper_log.message == "Exception during scraping"
 
+    # Store the scraper log in MongoDB
     try:
-        # Add LinkedIn session cookie
-        driver.get("https://www.linkedin.com")
-        driver.add_cookie({"name": "li_at", "value": SESSION_COOKIE, "domain": ".linkedin.com"})
-        
-        # Now navigate to the target page
-        driver.get(str(request.url))
-        
-        # Wait for page to load - more sophisticated wait
-        wait = WebDriverWait(driver, 15)
-        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        
-        # Scroll down to load dynamic content
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(3)
-        
-        # Choose scraping method based on page type
-        if request.type == "company":
-            data = scrape_company_page(driver)
-        elif request.type == "profile":
-            data = scrape_profile_page(driver)
-        elif request.type == "post":
-            data = scrape_post_page(driver)
-        else:
-            data = {"error": "Invalid page type specified"}
-        
-        # Update the scraper log with results
-        if "error" in data:
-            scraper_log.status = "failed"
-            scraper_log.message = "Failed to scrape page completely"
-            scraper_log.error_message = data["error"]
-            del data["error"]  # Remove error from data before storing
-        else:
-            scraper_log.status = "success"
-            scraper_log.message = f"Successfully scraped {request.type} page"
-        
-        # Add the scraped data to the log
-        # Include the type in the data for better filtering
-        data["page_type"] = request.type
-        scraper_log.data = data
-        
-        # Convert ScraperLog to a plain dictionary for MongoDB storage
-        scraper_log_dict = scraper_log.dict()
-        
-        # Store the scraper log in MongoDB
-        try:
-            result = await scraper_collection.insert_one(scraper_log_dict)
-            print(f"MongoDB insertion result: {result.acknowledged}, ID: {result.inserted_id}")
-            
-            if not result.acknowledged:
-                raise Exception("MongoDB did not acknowledge the insertion")
-                
-            # Return response with scraped data and log ID
-            return {
-                "status": scraper_log.status,
-                "message": scraper_log.message,
-                "log_id": str(result.inserted_id),
-                "data": data
-            }
-        except Exception as db_error:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Database error: {str(db_error)}"
-            )
-
-    except Exception as e:
-        # Update scraper log with error information
-        scraper_log.status = "failed"
-        scraper_log.message = "Exception during scraping"
-        scraper_log.error_message = str(e)
-        
-        # Still try to save the log
-        try:
-            # Convert to dict before saving
-            scraper_log_dict = scraper_log.dict()
-            result = await scraper_collection.insert_one(scraper_log_dict)
-            print(f"Error log insertion result: {result.acknowledged}, ID: {result.inserted_id}")
-        except Exception as mongo_error:
+        log_id = await save_scrape_log(scraper_log)
+    except Exception as mongo_error:
+        if crashed:
             # Return both the original error and the MongoDB error
             return {
                 "status": "error",
-                "detail": f"Scraping error: {str(e)}. Database error: {str(mongo_error)}"
+                "detail": f"Scraping error: {scraper_log.error_message}. Database error: {str(mongo_error)}"
             }
-            
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(mongo_error)}"
+        )
+
+    if crashed:
         return {
-            "status": "error", 
-            "detail": str(e)
+            "status": "error",
+            "detail": scraper_log.error_message
         }
-    finally:
-        driver.quit()
-
-def scrape_company_page(driver):
-    """Extract data from a LinkedIn company page"""
-    data = {
-        "page": {
-            "name": "",
-            "industry": "",
-            "website": "",
-            "company_size": "",
-            "headquarters": "",
-            "founded": "",
-            "specialties": []
-        },
-        "about": "",
-        "recent_posts": []
-    }
-    
-    try:
-        # Company name
-        try:
-            name_element = driver.find_element(By.CLASS_NAME, "org-top-card-summary__title")
-            data["page"]["name"] = name_element.text.strip()
-        except:
-            pass
-        
-        # Industry and other company info
-        try:
-            info_items = driver.find_elements(By.CLASS_NAME, "org-top-card-summary-info-list__info-item")
-            if info_items:
-                data["page"]["industry"] = info_items[0].text.strip()
-                
-            # More detailed company information
-            details = driver.find_elements(By.CLASS_NAME, "org-about-company-module__about-us-item")
-            for detail in details:
-                label = detail.find_element(By.CLASS_NAME, "org-about-company-module__about-us-label").text.strip().lower()
-                value = detail.find_element(By.CLASS_NAME, "org-about-company-module__about-us-text").text.strip()
-                
-                if "website" in label:
-                    data["page"]["website"] = value
-                elif "size" in label:
-                    data["page"]["company_size"] = value
-                elif "headquarters" in label:
-                    data["page"]["headquarters"] = value
-                elif "founded" in label:
-                    data["page"]["founded"] = value
-                elif "specialties" in label:
-                    data["page"]["specialties"] = [s.strip() for s in value.split(",")]
-        except:
-            pass
-            
-        # About section
-        try:
-            about_section = driver.find_element(By.CLASS_NAME, "org-about-us-organization-description__text")
-            data["about"] = about_section.text.strip()
-        except:
-            pass
-            
-        # Recent posts
-        try:
-            posts = driver.find_elements(By.CLASS_NAME, "occludable-update")
-            for i, post in enumerate(posts[:3]):  # Get first 3 posts
-                try:
-                    post_data = {
-                        "text": post.find_element(By.CLASS_NAME, "feed-shared-update-v2__description").text.strip(),
-                        "engagement": {}
-                    }
-                    
-                    # Try to get engagement metrics
-                    try:
-                        metrics = post.find_elements(By.CLASS_NAME, "social-details-social-counts__item")
-                        for metric in metrics:
-                            count_text = metric.text.strip().lower()
-                            if "like" in count_text:
-                                post_data["engagement"]["likes"] = count_text
-                            elif "comment" in count_text:
-                                post_data["engagement"]["comments"] = count_text
-                    except:
-                        pass
-                        
-                    data["recent_posts"].append(post_data)
-                except:
-                    continue
-        except:
-            pass
-            
-    except Exception as e:
-        data["error"] = str(e)
-        
-    return data
-
-def scrape_profile_page(driver):
-    """Extract data from a LinkedIn user profile page"""
-    data = {
-        "user": {
-            "name": "",
-            "headline": "",
-            "location": "",
-            "connections": "",
-            "about": ""
-        },
-        "experience": [],
-        "education": []
+
+    # Return response with scraped data and log ID
+    return {
+        "status": scraper_log.status,
+        "message": scraper_log.message,
+        "log_id": log_id,
+        "tier": scraper_log.tier,
+        "scraped_at": scraper_log.scraped_at,
+        "changed": scraper_log.changed,
+        "same_as": scraper_log.same_as,
+        "version": scraper_log.version,
+        "data": scraper_log.data
     }
-    
-    try:
-        # Basic profile information
-        try:
-            data["user"]["name"] = driver.find_element(By.CLASS_NAME, "text-heading-xlarge").text.strip()
-            data["user"]["headline"] = driver.find_element(By.CLASS_NAME, "text-body-medium").text.strip()
-            
-            location_element = driver.find_element(By.CSS_SELECTOR, ".pv-text-details__left-panel .text-body-small")
-            data["user"]["location"] = location_element.text.strip()
-            
-            connections_element = driver.find_element(By.CSS_SELECTOR, ".pv-text-details__right-panel .text-body-small")
-            data["user"]["connections"] = connections_element.text.strip()
-        except:
-            pass
-            
-        # About section
+
+@router.post("/scrape/batch")
+async def scrape_linkedin_pages(requests: List[Any] = Body(..., description="Scrape requests, as for /scrape")):
+    """Scrape many pages at once, streaming one NDJSON line per URL as each finishes.
+
+    Scrapes are spread over the worker pool and their logs are stored with
+    one insert_many per SCRAPE_BATCH_CHUNK results. An invalid or failed URL
+    produces its own line and never stops the rest of the batch.
+    """
+    _require_session()
+    if len(requests) > settings.SCRAPE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {settings.SCRAPE_BATCH_MAX} URLs")
+
+    # Items are validated one by one, so a malformed entry fails alone instead of the whole batch
+    valid, invalid = [], []
+    for index, item in enumerate(requests):
         try:
-            about_section = driver.find_element(By.ID, "about")
-            about_text = about_section.find_element(By.XPATH, "./following-sibling::div[1]//span")
-            data["user"]["about"] = about_text.text.strip()
-        except:
-            pass
-            
-        # Experience section
+            valid.append((index, ScrapeRequest.model_validate(item)))
+        except ValidationError as e:
+            invalid.append({
+                "index": index,
+                "url": item.get("url") if isinstance(item, dict) else None,
+                "status": "invalid",
+                "detail": e.errors(include_url=False),
+            })
+
+    # Keep a batch to one scrape per worker so single /scrape calls still get queue slots
+    workers = asyncio.Semaphore(scrape_executor.max_workers)
+
+    async def scrape_one(index: int, request: ScrapeRequest):
+        async with workers:
+            return index, await execute_scrape(request, wait=True)
+
+    async def results():
+        pending = []
+        tasks = [asyncio.create_task(scrape_one(i, r)) for i, r in valid]
         try:
-            experience_section = driver.find_element(By.ID, "experience")
-            experience_items = experience_section.find_elements(By.XPATH, "./following-sibling::div[1]//li")
-            
-            for item in experience_items:
+            for line in invalid:
+                yield json.dumps(line, default=str) + "\n"
+            for finished in asyncio.as_completed(tasks):
+                index, scraper_log = await finished
                 try:
-                    exp = {
-                        "title": item.find_element(By.CLASS_NAME, "t-bold").text.strip(),
-                        "company": item.find_element(By.CLASS_NAME, "t-normal").text.strip(),
-                        "duration": item.find_elements(By.CLASS_NAME, "t-normal")[1].text.strip() if len(item.find_elements(By.CLASS_NAME, "t-normal")) > 1 else ""
-                    }
-                    data["experience"].append(exp)
-                except:
+                    document = await versioned_log_document(scraper_log)
+                except Exception as db_error:
+                    yield json.dumps({"index": index, "status": "error", "detail": f"Database error: {str(db_error)}"}) + "\n"
                     continue
-        except:
-            pass
-            
-        # Education section
+                pending.append(document)
+                line = {
+                    "index": index,
+                    "url": scraper_log.url,
+                    "status": scraper_log.status,
+                    "message": scraper_log.message,
+                    "error_message": scraper_log.error_message,
+                    "log_id": str(document["_id"]),
+                    "tier": scraper_log.tier,
+                    "changed": scraper_log.changed,
+                    "same_as": scraper_log.same_as,
+                    "version": scraper_log.version,
+                    "data": scraper_log.data,
+                }
+                yield json.dumps(line, default=str) + "\n"
+
+                if len(pending) >= settings.SCRAPE_BATCH_CHUNK:
+                    documents, pending = pending, []
+                    yield await flush(documents)
+            if pending:
+                documents, pending = pending, []
+                yield await flush(documents)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # The client may have gone, but it was already sent these log IDs,
+            # and the pages' current versions and diffs point at them
+            if pending:
+                await asyncio.shield(flush(pending))
+
+    async def flush(documents):
         try:
-            education_section = driver.find_element(By.ID, "education")
-            education_items = education_section.find_elements(By.XPATH, "./following-sibling::div[1]//li")
-            
-            for item in education_items:
-                try:
-                    edu = {
-                        "school": item.find_element(By.CLASS_NAME, "t-bold").text.strip(),
-                        "degree": item.find_element(By.CLASS_NAME, "t-normal").text.strip() if item.find_elements(By.CLASS_NAME, "t-normal") else "",
-                        "years": item.find_elements(By.CLASS_NAME, "t-normal")[1].text.strip() if len(item.find_elements(By.CLASS_NAME, "t-normal")) > 1 else ""
-                    }
-                    data["education"].append(edu)
-                except:
-                    continue
-        except:
-            pass
-            
-    except Exception as e:
-        data["error"] = str(e)
-        
-    return data
-
-def scrape_post_page(driver):
-    """Extract data from a LinkedIn post page"""
-    data = {
-        "post": {
-            "author": "",
-            "author_headline": "",
-            "content": "",
-            "timestamp": "",
-            "engagement": {
-                "likes": "",
-                "comments": "",
-                "reposts": ""
+            await save_scrape_logs(documents)
+            return ""
+        except Exception as db_error:
+            line = {
+                "status": "error",
+                "detail": f"Database error: {str(db_error)}",
+                "log_ids": [str(d["_id"]) for d in documents],
             }
-        },
-        "comments": []
+            return json.dumps(line) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.post("/jobs", status_code=202)
+async def submit_scrape_job(request: ScrapeRequest):
+    """Queue a scrape and return immediately; poll the job for the result"""
+    # Benched sessions only delay queued jobs, so they are accepted anyway
+    _require_session(available=False)
+
+    job_id = await submit_job(request)
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/scraper/jobs/{job_id}",
     }
-    
-    try:
-        # Post author
-        try:
-            author_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__name")
-            data["post"]["author"] = author_element.text.strip()
-            
-            headline_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__description")
-            data["post"]["author_headline"] = headline_element.text.strip()
-            
-            timestamp_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__sub-description")
-            data["post"]["timestamp"] = timestamp_element.text.strip()
-        except:
-            pass
-            
-        # Post content
-        try:
-            content_element = driver.find_element(By.CLASS_NAME, "feed-shared-update-v2__description")
-            data["post"]["content"] = content_element.text.strip()
-        except:
-            pass
-            
-        # Engagement metrics
-        try:
-            metrics = driver.find_elements(By.CLASS_NAME, "social-details-social-counts__item")
-            for metric in metrics:
-                count_text = metric.text.strip().lower()
-                if "like" in count_text:
-                    data["post"]["engagement"]["likes"] = count_text
-                elif "comment" in count_text:
-                    data["post"]["engagement"]["comments"] = count_text
-                elif "repost" in count_text:
-                    data["post"]["engagement"]["reposts"] = count_text
-        except:
-            pass
-            
-        # Comments
-        try:
-            comments = driver.find_elements(By.CLASS_NAME, "comments-comment-item")
-            for i, comment in enumerate(comments[:5]):  # Get first 5 comments
-                try:
-                    comment_data = {
-                        "author": comment.find_element(By.CLASS_NAME, "comments-post-meta__name-text").text.strip(),
-                        "text": comment.find_element(By.CLASS_NAME, "comments-comment-item__main-content").text.strip()
-                    }
-                    data["comments"].append(comment_data)
-                except:
-                    continue
-        except:
-            pass
-            
-    except Exception as e:
-        data["error"] = str(e)
-        
-    return data
+
+async def _find_job(job_id: str):
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_scrape_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to long-poll for the job to finish"),
+):
+    """Get a scrape job's status and, once finished, its log ID and result"""
+    job = await _find_job(job_id)
+    deadline = asyncio.get_running_loop().time() + wait
+    while job["status"] not in TERMINAL_STATUSES and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.5)
+        job = await _find_job(job_id)
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def stream_scrape_job(job_id: str):
+    """Server-sent events with each status change of a scrape job"""
+    job = await _find_job(job_id)
+
+    async def events(job):
+        last_status = None
+        while True:
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield f"event: {last_status}\ndata: {json.dumps(job, default=str)}\n\n"
+            if last_status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(0.5)
+            job = await get_job(job_id)
+
+    return StreamingResponse(events(job), media_type="text/event-stream")
+
+@router.get("/executor")
+async def get_executor_stats():
+    """Get scrape worker pool usage"""
+    return scrape_executor.stats()
+
+@router.get("/cache")
+async def get_scrape_cache_stats():
+    """Get scrape result cache hit/miss counts"""
+    return scrape_cache.stats()
+
+@router.get("/pool")
+async def get_driver_pool_stats():
+    """Get warm browser pool size, lease wait times and recycle counts"""
+    return driver_pool.stats()
+
+@router.get("/sessions")
+async def get_sessions():
+    """Get each LinkedIn session's usage, success rate and cooldown (never the cookie)"""
+    return {"strategy": session_registry.strategy, "sessions": session_registry.stats()}
+
+@router.post("/sessions", status_code=201)
+async def add_session(session: LinkedInSessionCreate):
+    """Store a li_at cookie and start rotating scrapes onto it"""
+    sid = session_id(session.cookie)
+    await linkedin_sessions_collection.update_one(
+        {"_id": sid},
+        {"$set": {**session.model_dump(), "enabled": True}, "$setOnInsert": {"created_at": datetime.now()}},
+        upsert=True,
+    )
+    registered = session_registry.add(session.cookie, session.label, source="database")
+    return registered.stats(datetime.now())
+
+@router.delete("/sessions/{sid}")
+async def remove_session(sid: str):
+    """Stop using a session; configured cookies return on the next restart"""
+    if not session_registry.remove(sid):
+        raise HTTPException(status_code=404, detail="Session not found")
+    await linkedin_sessions_collection.update_one({"_id": sid}, {"$set": {"enabled": False}})
+    return {"message": "Session removed"}
 
 # Additional endpoints to retrieve scraped data
 
+# Newest first, with _id breaking ties so cursors never skip or repeat a log
+LOG_SORT = [("scraped_at", -1), ("_id", -1)]
+CURRENT_SORT = [("last_seen", -1), ("_id", -1)]
+
 @router.get("/logs")
-async def get_scraper_logs(limit: int = 10, skip: int = 0):
+async def get_scraper_logs(
+    limit: int = 10,
+    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
+    page_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; the sort fields are always included"),
+):
     """Get recent scraper logs with pagination"""
-    logs = await scraper_collection.find().sort("scraped_at", -1).skip(skip).limit(limit).to_list(limit)
-    # Convert ObjectId to string for JSON serialization
-    for log in logs:
-        log["_id"] = str(log["_id"])
-    return {"logs": logs}
+    query = date_range("scraped_at", since, until)
+    if page_id:
+        query["page_id"] = page_id
+    projection = field_projection(parse_fields(fields), [field for field, _ in LOG_SORT])
+    try:
+        logs, next_cursor = await paginate(
+            analytics_reads(scraper_collection), query, LOG_SORT, limit, skip, cursor, projection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BSONResponse({"logs": logs, "next_cursor": next_cursor})
 
 @router.get("/logs/{log_id}")
 async def get_scraper_log(log_id: str):
-    """Get a specific scraper log by ID"""
-    try:
-        log = await scraper_collection.find_one({"_id": ObjectId(log_id)})
-        if log:
-            log["_id"] = str(log["_id"])
-            return log
-        else:
-            raise HTTPException(status_code=404, detail="Log not found")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid log ID: {str(e)}")
+    """Get a specific scraper log by ID, with the data of the version it recorded"""
+    if not ObjectId.is_valid(log_id):
+        raise HTTPException(status_code=400, detail="Invalid log ID")
+    log = await scraper_collection.find_one({"_id": ObjectId(log_id)})
+    if not log:
+        raise HTTPException(status_code=404, detail="Log not found")
+    if "data" not in log and log.get("version"):
+        # Logs no longer carry their data; it is rebuilt from the page's diffs
+        versions = await page_history(log["url_key"], log["type"], 1, log["version"])
+        log["data"] = versions[0]["data"] if versions else None
+    return BSONResponse(log)
 
 @router.get("/data/{type}")
-async def get_scraped_data_by_type(type: str, limit: int = 10, skip: int = 0):
-    """Get scraped data by type (company, profile, post)"""
-    # Updated query to look for the type field at the top level
-    logs = await scraper_collection.find(
-        {"status": "success", "type": type}
-    ).sort("scraped_at", -1).skip(skip).limit(limit).to_list(limit)
-    
-    for log in logs:
-        log["_id"] = str(log["_id"])
-    
-    return {"data": logs}
\ No newline at end of file
+async def get_scraped_data_by_type(
+    type: str,
+    limit: int = 10,
+    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
+    page_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; the sort fields are always included"),
+):
+    """Get the current scraped data of each page of a type (company, profile, post),
+    most recently seen first; since/until filter on when it was last seen"""
+    query = {"type": type, **date_range("last_seen", since, until)}
+    if page_id:
+        query["page_id"] = page_id
+    projection = field_projection(parse_fields(fields), [field for field, _ in CURRENT_SORT])
+    try:
+        pages, next_cursor = await paginate(
+            analytics_reads(scrape_current_collection), query, CURRENT_SORT, limit, skip, cursor, projection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BSONResponse({"data": pages, "next_cursor": next_cursor})
+
+@router.get("/history")
+async def get_scrape_history(
+    url: str,
+    type: str = "company",
+    limit: int = Query(20, ge=1, le=500, description="Number of most recent versions"),
+    version: Optional[int] = Query(None, ge=1, description="Only this version"),
+):
+    """Reconstruct the versions of a page's scraped data, newest first"""
+    versions = await page_history(normalize_url(url), type, limit, version)
+    if not versions:
+        raise HTTPException(status_code=404, detail="No scrape history for this page")
+    return BSONResponse({"url": url, "type": type, "versions": versions})
+
+@router.get("/series")
+async def get_metric_series(
+    url: str,
+    metric: str,
+    type: str = "company",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    interval: str = Query("raw", description="raw, hour, day or month"),
+):
+    """One metric of a page over time, e.g. a company's followers, oldest first"""
+    if metric not in METRICS.get(type, {}):
+        raise HTTPException(
+            status_code=400, detail=f"Unknown {type} metric '{metric}', expected one of {', '.join(METRICS.get(type, {}))}"
+        )
+    if interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Unknown interval '{interval}', expected one of {', '.join(INTERVALS)}")
+    points = await metric_series(normalize_url(url), type, metric, since, until, interval)
+    return BSONResponse({"url": url, "type": type, "metric": metric, "interval": interval, "points": points})
@@ -1,45 +1,61 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from pymongo.errors import DuplicateKeyError
 from app.core.database import users_collection
 from app.models.user import UserCreate, UserBase
+from app.services.bulk_service import bulk_upsert, iter_rows
+from app.services.entity_cache import entity_cache, entity_response
 
 router = APIRouter()
 
 
 @router.post("/", summary="Create a new user")
 async def create_user(user: UserCreate):
-    existing_user = await users_collection.find_one({"linkedin_id": user.linkedin_id})
-    if existing_user:
+    # The unique linkedin_id index rejects duplicates, even under concurrent creates.
+    # Insert a copy: insert_one adds an ObjectId _id to the dict it is given
+    new_user = user.model_dump(mode="json")
+    try:
+        await users_collection.insert_one(dict(new_user))
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="User with this LinkedIn ID already exists")
-
-    new_user = user.model_dump()
-    await users_collection.insert_one(new_user)
     return {"message": "User created successfully", "user": new_user}
 
 
 @router.get("/{linkedin_id}", summary="Get user details")
-async def get_user(linkedin_id: str):
-    user = await users_collection.find_one({"linkedin_id": linkedin_id})
+async def get_user(linkedin_id: str, request: Request):
+    user = await entity_cache.get("users", linkedin_id, lambda: users_collection.find_one({"linkedin_id": linkedin_id}))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-
-    return {"user": user}
+    return entity_response(request, user)
 
 
 @router.put("/{linkedin_id}", summary="Update user details")
 async def update_user(linkedin_id: str, updated_data: UserBase):
-    user = await users_collection.find_one({"linkedin_id": linkedin_id})
+    try:
+        user = await users_collection.find_one_and_update(
+            {"linkedin_id": linkedin_id}, {"$set": updated_data.model_dump(mode="json")}, projection={"_id": 1}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="User with this LinkedIn ID already exists")
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-
-    await users_collection.update_one({"linkedin_id": linkedin_id}, {"$set": updated_data.model_dump()})
+    await entity_cache.invalidate("users", [linkedin_id, updated_data.linkedin_id])
     return {"message": "User updated successfully"}
 
 
 @router.delete("/{linkedin_id}", summary="Delete a user")
 async def delete_user(linkedin_id: str):
-    user = await users_collection.find_one({"linkedin_id": linkedin_id})
-    if not user:
+    result = await users_collection.delete_one({"linkedin_id": linkedin_id})
+    if not result.deleted_count:
         raise HTTPException(status_code=404, detail="User not found")
-
-    await users_collection.delete_one({"linkedin_id": linkedin_id})
+    await entity_cache.invalidate("users", [linkedin_id])
     return {"message": "User deleted successfully"}
+
+
+@router.post("/bulk", summary="Bulk import or update users")
+async def bulk_upsert_users(request: Request):
+    """Upsert users keyed on linkedin_id, from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns counts and per-row errors."""
+    try:
+        return await bulk_upsert(users_collection, UserCreate, "linkedin_id", iter_rows(request), json_mode=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
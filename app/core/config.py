@@ -6,4 +6,134 @@ load_dotenv()
 class Settings:
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://localhost:27017/linkedin_insights")
 
+    # LinkedIn sessions: LI_AT plus any comma-separated LI_AT_COOKIES (more can
+    # be stored in the linkedin_sessions collection). Scrapes take them
+    # "round_robin" or "lru"; a session sent to a login or checkpoint page is
+    # benched for SESSION_BACKOFF_BASE seconds, doubling up to SESSION_BACKOFF_MAX,
+    # and the scrape is retried on another, up to SESSION_MAX_ATTEMPTS in all
+    LI_AT_COOKIES: list = [
+        cookie.strip()
+        for cookie in [os.getenv("LI_AT", "")] + os.getenv("LI_AT_COOKIES", "").split(",")
+        if cookie.strip()
+    ]
+    SESSION_STRATEGY: str = os.getenv("SESSION_STRATEGY", "round_robin")
+    SESSION_BACKOFF_BASE: float = float(os.getenv("SESSION_BACKOFF_BASE", "300"))
+    SESSION_BACKOFF_MAX: float = float(os.getenv("SESSION_BACKOFF_MAX", "21600"))
+    SESSION_MAX_ATTEMPTS: int = int(os.getenv("SESSION_MAX_ATTEMPTS", "2"))
+    # MongoDB client: connection pool bounds, how long (ms) to wait for a
+    # server, a connection, a socket read (0 = no limit), and wire compressors
+    # in order of preference ("zstd" needs zstandard, "snappy" python-snappy)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "")
+    # Where analytics and list endpoints read from; writes and single-entity
+    # reads always use the primary. primary, primaryPreferred, secondary,
+    # secondaryPreferred or nearest; secondaries may lag by up to
+    # MONGO_MAX_STALENESS_S seconds (-1 = no limit, else at least 90)
+    MONGO_ANALYTICS_READ_PREFERENCE: str = os.getenv("MONGO_ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+    MONGO_MAX_STALENESS_S: int = int(os.getenv("MONGO_MAX_STALENESS_S", "-1"))
+    # Run explain() on each route's query at startup and warn on collection scans
+    MONGO_CHECK_QUERY_PLANS: bool = os.getenv("MONGO_CHECK_QUERY_PLANS", "false").lower() == "true"
+
+    # Rows validated and written per bulk_write by the /bulk endpoints
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+    # Documents fetched per cursor batch by the streaming export endpoints
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+    # Scrape executor: "thread" or "process" workers, with a cap on running
+    # scrapes and on how many more may wait before new requests are refused
+    SCRAPER_EXECUTOR: str = os.getenv("SCRAPER_EXECUTOR", "thread")
+    SCRAPER_MAX_WORKERS: int = int(os.getenv("SCRAPER_MAX_WORKERS", "2"))
+    SCRAPER_MAX_QUEUE: int = int(os.getenv("SCRAPER_MAX_QUEUE", "8"))
+
+    # Scrape result cache: how long (seconds) a successful scrape of each
+    # page type is served to new /scrape requests, and the in-process LRU size
+    SCRAPE_CACHE_TTL: dict = {
+        "default": int(os.getenv("SCRAPE_CACHE_TTL", "3600")),
+        "company": int(os.getenv("SCRAPE_CACHE_TTL_COMPANY", os.getenv("SCRAPE_CACHE_TTL", "3600"))),
+        "profile": int(os.getenv("SCRAPE_CACHE_TTL_PROFILE", os.getenv("SCRAPE_CACHE_TTL", "3600"))),
+        "post": int(os.getenv("SCRAPE_CACHE_TTL_POST", "600")),
+    }
+    SCRAPE_CACHE_MAX_ENTRIES: int = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "1000"))
+
+    # Read-through cache of GET /api/pages|posts|users/{id}: seconds an entry
+    # lives (0 turns it off), in-process LRU size, or a shared Redis instead
+    ENTITY_CACHE_TTL: int = int(os.getenv("ENTITY_CACHE_TTL", "60"))
+    ENTITY_CACHE_MAX_ENTRIES: int = int(os.getenv("ENTITY_CACHE_MAX_ENTRIES", "10000"))
+    ENTITY_CACHE_REDIS_URL: str = os.getenv("ENTITY_CACHE_REDIS_URL", "")
+
+    # Upsert successful scrapes into the typed pages/posts/users collections
+    SCRAPE_NORMALIZE: bool = os.getenv("SCRAPE_NORMALIZE", "true").lower() == "true"
+
+    # Versioned scrape data: a full snapshot instead of a diff every N versions
+    SCRAPE_SNAPSHOT_EVERY: int = int(os.getenv("SCRAPE_SNAPSHOT_EVERY", "50"))
+
+    # Scrape logs are lean metadata (status, timings, errors) deleted by a TTL
+    # index after this many days; 0 keeps them forever
+    SCRAPE_LOG_RETENTION_DAYS: int = int(os.getenv("SCRAPE_LOG_RETENTION_DAYS", "30"))
+
+    # Per-scrape metrics (followers, likes...) go to a time-series collection
+    # bucketed by SERIES_GRANULARITY (seconds, minutes or hours) and kept for
+    # SERIES_RETENTION_DAYS; their per-day downsampled rollups are kept for
+    # SERIES_DAILY_RETENTION_DAYS. 0 keeps either forever
+    SERIES_GRANULARITY: str = os.getenv("SERIES_GRANULARITY", "hours")
+    SERIES_RETENTION_DAYS: int = int(os.getenv("SERIES_RETENTION_DAYS", "90"))
+    SERIES_DAILY_RETENTION_DAYS: int = int(os.getenv("SERIES_DAILY_RETENTION_DAYS", "0"))
+
+    # Batch scrapes: largest accepted batch, and logs written per insert_many
+    SCRAPE_BATCH_MAX: int = int(os.getenv("SCRAPE_BATCH_MAX", "500"))
+    SCRAPE_BATCH_CHUNK: int = int(os.getenv("SCRAPE_BATCH_CHUNK", "50"))
+
+    # Warm Chrome pool (per worker process): drivers are recycled after
+    # DRIVER_MAX_USES scrapes or once their JS heap passes DRIVER_MAX_HEAP_MB
+    DRIVER_POOL_SIZE: int = int(os.getenv("DRIVER_POOL_SIZE", os.getenv("SCRAPER_MAX_WORKERS", "2")))
+    DRIVER_POOL_WARM: bool = os.getenv("DRIVER_POOL_WARM", "true").lower() == "true"
+    DRIVER_MAX_USES: int = int(os.getenv("DRIVER_MAX_USES", "50"))
+    DRIVER_LEASE_TIMEOUT: float = float(os.getenv("DRIVER_LEASE_TIMEOUT", "30"))
+    DRIVER_MAX_HEAP_MB: int = int(os.getenv("DRIVER_MAX_HEAP_MB", "512"))
+
+    # Try a plain HTTP fetch before launching a browser
+    SCRAPER_HTTP_FIRST: bool = os.getenv("SCRAPER_HTTP_FIRST", "true").lower() == "true"
+    SCRAPER_HTTP_TIMEOUT: float = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "10"))
+    SCRAPER_HTTP_POOL: int = int(os.getenv("SCRAPER_HTTP_POOL", "10"))
+
+    # Content-readiness waits (seconds) per page type, and incremental
+    # scrolling for company feed posts
+    READY_TIMEOUT_COMPANY: float = float(os.getenv("READY_TIMEOUT_COMPANY", "10"))
+    READY_TIMEOUT_PROFILE: float = float(os.getenv("READY_TIMEOUT_PROFILE", "10"))
+    READY_TIMEOUT_POST: float = float(os.getenv("READY_TIMEOUT_POST", "10"))
+    SCROLL_PAUSE: float = float(os.getenv("SCROLL_PAUSE", "0.4"))
+    SCROLL_TIMEOUT: float = float(os.getenv("SCROLL_TIMEOUT", "6"))
+
+    # chromedriver is resolved once at startup. CHROMEDRIVER_PATH skips the
+    # lookup entirely; SCRAPER_OFFLINE=true makes that path mandatory
+    CHROMEDRIVER_PATH: str = os.getenv("CHROMEDRIVER_PATH", "")
+    CHROMEDRIVER_VERSION: str = os.getenv("CHROMEDRIVER_VERSION", "")
+    SCRAPER_OFFLINE: bool = os.getenv("SCRAPER_OFFLINE", "false").lower() == "true"
+
+    # Scrape jobs: run them inside the API process, or leave them to
+    # `python -m app.worker`. Running jobs older than the timeout are retried
+    SCRAPE_JOBS_INLINE: bool = os.getenv("SCRAPE_JOBS_INLINE", "true").lower() == "true"
+    SCRAPE_JOB_POLL_INTERVAL: float = float(os.getenv("SCRAPE_JOB_POLL_INTERVAL", "1"))
+    SCRAPE_JOB_TIMEOUT: int = int(os.getenv("SCRAPE_JOB_TIMEOUT", "600"))
+
+    # Refresh scheduler: re-scrapes pages from the refresh_schedule collection,
+    # at most SCHEDULER_RATE_PER_MINUTE per domain (bursts of SCHEDULER_BURST),
+    # while fewer than SCHEDULER_MAX_QUEUE jobs are waiting. Due times are
+    # spread by +/- SCHEDULER_JITTER of each interval. Token buckets are per
+    # process, so enable it in one API process only
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_RATE_PER_MINUTE: float = float(os.getenv("SCHEDULER_RATE_PER_MINUTE", "6"))
+    SCHEDULER_BURST: int = int(os.getenv("SCHEDULER_BURST", "2"))
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", os.getenv("SCRAPER_MAX_WORKERS", "2")))
+    SCHEDULER_JITTER: float = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+    SCHEDULER_POLL_INTERVAL: float = float(os.getenv("SCHEDULER_POLL_INTERVAL", "5"))
+    # An entry whose job could not be queued is retried after this many
+    # seconds, doubling for each failure in a row, up to its interval
+    SCHEDULER_RETRY_DELAY: float = float(os.getenv("SCHEDULER_RETRY_DELAY", "60"))
+
 settings = Settings()
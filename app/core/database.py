@@ -1,6 +1,9 @@
 import os
 import motor.motor_asyncio
 from dotenv import load_dotenv
+from pymongo.read_preferences import Nearest, PrimaryPreferred, ReadPreference, Secondary, SecondaryPreferred
+from app.core.config import settings
+from app.core.metrics import MongoCommandTimer, MongoPoolMonitor
 
 load_dotenv()
 
@@ -11,44 +14,159 @@ DATABASE_NAME = "linked_microservice_insights"
 if not MONGO_URI:
     raise ValueError("MONGO_URI is not set in the environment variables.")
 
-# Singleton MongoDB Client
+# Read preferences by the names used in MongoDB connection strings
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# Connection pool usage, for the pool stats route and /metrics
+pool_monitor = MongoPoolMonitor()
+
+
+def client_options() -> dict:
+    """Keyword arguments for the Motor client, from Settings"""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        # Every command's latency and the pool's wait queue go to /metrics
+        "event_listeners": [MongoCommandTimer(), pool_monitor],
+    }
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
+
+
+def analytics_read_preference():
+    name = settings.MONGO_ANALYTICS_READ_PREFERENCE
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"MONGO_ANALYTICS_READ_PREFERENCE must be one of {', '.join(READ_PREFERENCES)}, not {name!r}")
+    if name == "primary":
+        return ReadPreference.PRIMARY
+    return READ_PREFERENCES[name](max_staleness=settings.MONGO_MAX_STALENESS_S)
+
+
+# Singleton MongoDB Client, created on first use: inside the running event
+# loop (the app's lifespan) rather than at import time
 class MongoDB:
     _client = None
 
     @classmethod
     def get_client(cls):
         if cls._client is None:
-            cls._client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+            cls._client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, **client_options())
         return cls._client
 
-# Initialize MongoDB Client
-client = MongoDB.get_client()
-database = client[DATABASE_NAME]
+    @classmethod
+    def close(cls):
+        if cls._client is not None:
+            cls._client.close()
+            cls._client = None
+
+
+class LazyCollection:
+    """Stands in for a Motor collection and resolves it from the current client on use.
+
+    Lets modules import collections at load time while the client itself is
+    only created, and re-created after a close, inside the event loop.
+    """
+
+    def __init__(self, name: str, read_preference=None):
+        self.name = name
+        self.read_preference = read_preference
+        self._client = None
+        self._collection = None
+
+    def _resolve(self):
+        client = MongoDB.get_client()
+        if client is not self._client:
+            collection = client[DATABASE_NAME][self.name]
+            if self.read_preference is not None:
+                collection = collection.with_options(read_preference=self.read_preference)
+            self._client, self._collection = client, collection
+        return self._collection
+
+    def __getattr__(self, attribute):
+        return getattr(self._resolve(), attribute)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+_analytics_reads = {}
+
+
+def analytics_reads(collection: LazyCollection) -> LazyCollection:
+    """``collection`` reading with MONGO_ANALYTICS_READ_PREFERENCE.
+
+    For aggregations and lists that tolerate replication lag; anything that
+    reads its own writes keeps using ``collection`` itself.
+    """
+    if collection.name not in _analytics_reads:
+        _analytics_reads[collection.name] = LazyCollection(collection.name, analytics_read_preference())
+    return _analytics_reads[collection.name]
+
+
+def get_database():
+    return MongoDB.get_client()[DATABASE_NAME]
+
+
+def pool_stats() -> dict:
+    """Connection pool usage plus the configured limits"""
+    return {
+        **pool_monitor.stats(),
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        "compressors": settings.MONGO_COMPRESSORS or None,
+        "analytics_read_preference": settings.MONGO_ANALYTICS_READ_PREFERENCE,
+    }
+
 
 # Collections
-pages_collection = database["pages"]
-posts_collection = database["posts"]
-users_collection = database["users"]
-scraper_collection = database["scraper"]
-comment_collection = database["comments"]
+pages_collection = LazyCollection("pages")
+posts_collection = LazyCollection("posts")
+users_collection = LazyCollection("users")
+scraper_collection = LazyCollection("scraper")
+scrape_jobs_collection = LazyCollection("scrape_jobs")
+post_daily_rollups_collection = LazyCollection("post_daily_rollups")
+scrape_current_collection = LazyCollection("scrape_current")
+scrape_diffs_collection = LazyCollection("scrape_diffs")
+refresh_schedule_collection = LazyCollection("refresh_schedule")
+linkedin_sessions_collection = LazyCollection("linkedin_sessions")
+scrape_series_collection = LazyCollection("scrape_series")
+scrape_series_daily_collection = LazyCollection("scrape_series_daily")
+comment_collection = LazyCollection("comments")
 
-# Test Connection
+# Test Connection; this is also what creates the client, inside the running loop
 async def check_mongo_connection():
     try:
-        await client.admin.command("ping")
+        await MongoDB.get_client().admin.command("ping")
         print(" MongoDB Connected Successfully!")
     except Exception as e:
         print(f" MongoDB Connection Failed: {e}")
 
 # Close MongoDB Connection on FastAPI Shutdown
 async def close_mongo_connection():
-    if client:
-        client.close() 
+    if MongoDB._client is not None:
+        MongoDB.close()
         print("🔌 MongoDB Connection Closed.")
 
 # Export collections for easy import
 __all__ = [
-    "database", "pages_collection", "posts_collection",
-    "users_collection", "scraper_collection", "comment_collection",
+    "get_database", "pages_collection", "posts_collection",
+    "users_collection", "scraper_collection", "scrape_jobs_collection",
+    "post_daily_rollups_collection", "scrape_current_collection", "scrape_diffs_collection",
+    "refresh_schedule_collection", "linkedin_sessions_collection",
+    "scrape_series_collection", "scrape_series_daily_collection",
+    "comment_collection", "analytics_reads", "pool_stats",
     "check_mongo_connection", "close_mongo_connection"
 ]
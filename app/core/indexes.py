@@ -0,0 +1,158 @@
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from app.core.config import settings
+from app.core.database import (
+    get_database, pages_collection, posts_collection, users_collection,
+    scraper_collection, scrape_jobs_collection, post_daily_rollups_collection,
+    scrape_current_collection, scrape_diffs_collection, refresh_schedule_collection,
+    scrape_series_collection, scrape_series_daily_collection,
+)
+
+# Declarative index set; create_indexes is a no-op for indexes that already exist
+INDEXES = [
+    (pages_collection, [
+        IndexModel([("page_id", ASCENDING)], unique=True, name="page_id_unique"),
+    ]),
+    (posts_collection, [
+        IndexModel([("post_id", ASCENDING)], unique=True, name="post_id_unique"),
+        IndexModel([("page_id", ASCENDING), ("created_at", DESCENDING), ("post_id", DESCENDING)], name="page_id_created_at_post_id"),
+        IndexModel([("created_at", DESCENDING), ("post_id", DESCENDING)], name="created_at_post_id"),
+    ]),
+    (users_collection, [
+        IndexModel([("linkedin_id", ASCENDING)], unique=True, name="linkedin_id_unique"),
+    ]),
+    (scraper_collection, [
+        IndexModel([("type", ASCENDING), ("status", ASCENDING), ("scraped_at", DESCENDING), ("_id", DESCENDING)], name="type_status_scraped_at_id"),
+        IndexModel([("scraped_at", DESCENDING), ("_id", DESCENDING)], name="scraped_at_id"),
+        IndexModel([("page_id", ASCENDING), ("scraped_at", DESCENDING), ("_id", DESCENDING)], name="page_id_scraped_at_id"),
+    ]),
+    (scrape_current_collection, [
+        IndexModel([("url_key", ASCENDING), ("type", ASCENDING)], unique=True, name="url_key_type_unique"),
+        IndexModel([("type", ASCENDING), ("last_seen", DESCENDING), ("_id", DESCENDING)], name="type_last_seen_id"),
+        IndexModel([("page_id", ASCENDING), ("last_seen", DESCENDING), ("_id", DESCENDING)], name="page_id_last_seen_id"),
+    ]),
+    (scrape_diffs_collection, [
+        IndexModel([("url_key", ASCENDING), ("type", ASCENDING), ("version", ASCENDING)], unique=True, name="url_key_type_version_unique"),
+    ]),
+    (refresh_schedule_collection, [
+        IndexModel([("url_key", ASCENDING), ("type", ASCENDING)], unique=True, name="url_key_type_unique"),
+        IndexModel([("enabled", ASCENDING), ("next_due", ASCENDING)], name="enabled_next_due"),
+    ]),
+    (scrape_jobs_collection, [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ]),
+    (post_daily_rollups_collection, [
+        IndexModel([("page_id", ASCENDING), ("day", ASCENDING)], unique=True, name="page_id_day_unique"),
+    ]),
+    (scrape_series_collection, [
+        IndexModel([("meta.url_key", ASCENDING), ("meta.type", ASCENDING), ("scraped_at", ASCENDING)], name="url_key_type_scraped_at"),
+    ]),
+    (scrape_series_daily_collection, [
+        IndexModel([("url_key", ASCENDING), ("type", ASCENDING), ("day", ASCENDING)], unique=True, name="url_key_type_day_unique"),
+    ]),
+]
+
+# Retention: collection, date field, setting holding the days to keep (0 = forever)
+TTL_INDEXES = [
+    (scraper_collection, "scraped_at", "SCRAPE_LOG_RETENTION_DAYS"),
+    (scrape_series_daily_collection, "day", "SERIES_DAILY_RETENTION_DAYS"),
+]
+
+# The queries behind each route, checked with explain() when enabled
+ROUTE_QUERIES = [
+    ("GET /api/pages/{page_id}", pages_collection, {"page_id": "x"}, None),
+    ("GET /api/posts/{post_id}", posts_collection, {"post_id": "x"}, None),
+    ("GET /api/users/{linkedin_id}", users_collection, {"linkedin_id": "x"}, None),
+    ("GET /api/posts/", posts_collection, {}, [("created_at", -1), ("post_id", -1)]),
+    ("GET /api/posts/?page_id=", posts_collection, {"page_id": "x"}, [("created_at", -1), ("post_id", -1)]),
+    ("GET /api/scraper/logs", scraper_collection, {}, [("scraped_at", -1), ("_id", -1)]),
+    ("GET /api/scraper/data/{type}", scrape_current_collection, {"type": "company"}, [("last_seen", -1), ("_id", -1)]),
+    ("POST /api/scraper/scrape (cache)", scrape_current_collection, {"url_key": "x", "type": "company"}, None),
+    ("refresh scheduler claim", refresh_schedule_collection, {"enabled": True, "next_due": {"$lte": datetime.min}}, [("priority", -1), ("next_due", 1)]),
+    ("GET /api/scraper/history", scrape_diffs_collection, {"url_key": "x", "type": "company", "version": {"$gte": 1}}, [("version", 1)]),
+    ("scrape job claim", scrape_jobs_collection, {"status": "queued"}, [("created_at", 1)]),
+    ("GET /api/pages/{page_id}/insights", post_daily_rollups_collection, {"page_id": "x", "day": {"$gte": datetime.min}}, [("day", 1)]),
+    ("GET /api/posts/top?page_id=", posts_collection, {"page_id": "x", "created_at": {"$gte": datetime.min}}, None),
+    ("GET /api/scraper/series", scrape_series_collection, {"meta.url_key": "x", "meta.type": "company", "scraped_at": {"$gte": datetime.min}}, [("scraped_at", 1)]),
+    ("GET /api/scraper/series?interval=day", scrape_series_daily_collection, {"url_key": "x", "type": "company", "day": {"$gte": datetime.min}}, [("day", 1)]),
+]
+
+
+async def ensure_series_collection():
+    """Create scrape_series as a time-series collection, or bring its retention in line with the settings.
+
+    The granularity only applies on creation: MongoDB can raise it later
+    with collMod but never lower it.
+    """
+    database = get_database()
+    name = scrape_series_collection.name
+    expire = settings.SERIES_RETENTION_DAYS * 86400
+    try:
+        if name not in await database.list_collection_names(filter={"name": name}):
+            options = {"timeseries": {"timeField": "scraped_at", "metaField": "meta", "granularity": settings.SERIES_GRANULARITY}}
+            if expire:
+                options["expireAfterSeconds"] = expire
+            await database.create_collection(name, **options)
+        else:
+            await database.command("collMod", name, expireAfterSeconds=expire or "off")
+    except Exception as e:
+        print(f" Time-series collection {name} not set up: {e}")
+
+
+async def ensure_ttl(collection, field: str, days: int):
+    """Make the ``<field>_ttl`` index expire documents after ``days``, or drop it for 0"""
+    name = f"{field}_ttl"
+    try:
+        existing = (await collection.index_information()).get(name)
+        if not days:
+            if existing:
+                await collection.drop_index(name)
+        elif existing is None:
+            await collection.create_index([(field, ASCENDING)], name=name, expireAfterSeconds=days * 86400)
+        elif existing.get("expireAfterSeconds") != days * 86400:
+            # A changed retention applies in place, without rebuilding the index
+            await get_database().command(
+                "collMod", collection.name, index={"name": name, "expireAfterSeconds": days * 86400}
+            )
+    except OperationFailure as e:
+        print(f" TTL index {collection.name}.{name} not set up: {e}")
+
+
+async def ensure_indexes():
+    """Create any missing indexes, one at a time so one failure does not block the rest"""
+    # Time-series collections must exist before their first insert creates them as regular ones
+    await ensure_series_collection()
+    for collection, field, setting in TTL_INDEXES:
+        await ensure_ttl(collection, field, getattr(settings, setting))
+    for collection, indexes in INDEXES:
+        for index in indexes:
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                # e.g. duplicates left over from before a unique index existed
+                print(f" Index {collection.name}.{index.document['name']} not created: {e}")
+
+
+def _plan_stages(plan: dict):
+    yield plan.get("stage")
+    if "inputStage" in plan:
+        yield from _plan_stages(plan["inputStage"])
+    for stage in plan.get("inputStages", []):
+        yield from _plan_stages(stage)
+
+
+async def check_query_plans():
+    """Warn about route queries whose winning plan is a collection scan"""
+    for route, collection, query, sort in ROUTE_QUERIES:
+        cursor = collection.find(query).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            explained = await cursor.explain()
+        except Exception as e:
+            print(f" Could not explain {route}: {e}")
+            continue
+        winning_plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            print(f" Query plan warning: {route} scans {collection.name} without an index")
@@ -0,0 +1,179 @@
+"""Prometheus metrics, and the stage timer that feeds the scrape histograms.
+
+Scrapes are timed stage by stage wherever they run (a thread or a process
+worker) and the durations travel back with the result, so the histograms
+are only ever observed in the process that serves /metrics.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+# Browser stages take seconds, HTTP and MongoDB milliseconds
+SCRAPE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+SCRAPE_STAGE_SECONDS = Histogram(
+    "scrape_stage_seconds", "Time spent in each stage of a scrape", ["stage", "type", "tier"], buckets=SCRAPE_BUCKETS
+)
+SCRAPE_SECONDS = Histogram(
+    "scrape_seconds", "Time from leasing a worker to having the scraped data", ["type", "tier", "status"],
+    buckets=SCRAPE_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "API request latency by route template", ["method", "route", "status"],
+    buckets=FAST_BUCKETS,
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_seconds", "MongoDB command latency as seen by the driver", ["command", "outcome"],
+    buckets=FAST_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures", "MongoDB commands that failed", ["command"])
+MONGO_POOL_WAIT_SECONDS = Histogram(
+    "mongo_pool_wait_seconds", "Time an operation waited to check a connection out of the pool", buckets=FAST_BUCKETS
+)
+MONGO_POOL_WAITING = Gauge("mongo_pool_waiting", "Operations waiting for a pooled connection")
+MONGO_POOL_CONNECTIONS = Gauge("mongo_pool_connections", "Pooled MongoDB connections", ["state"])
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures", "Connection check-outs that failed", ["reason"]
+)
+
+
+class StageTimer:
+    """Wall-clock seconds per named stage; a repeated stage adds up"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+def stage(timer: Optional[StageTimer], name: str):
+    """``timer.stage(name)``, or a no-op when there is no timer"""
+    return timer.stage(name) if timer is not None else _untimed()
+
+
+@contextmanager
+def _untimed():
+    yield
+
+
+def observe_scrape(timings: Dict[str, float], page_type: str, tier: str, status: str):
+    for name, seconds in timings.items():
+        SCRAPE_STAGE_SECONDS.labels(name, page_type, tier).observe(seconds)
+    SCRAPE_SECONDS.labels(page_type, tier, status).observe(sum(timings.values()))
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Feeds every command the driver runs into MONGO_COMMAND_SECONDS"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_SECONDS.labels(event.command_name, "success").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_COMMAND_SECONDS.labels(event.command_name, "failure").observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(event.command_name).inc()
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool usage: how many operations wait for a connection, and for how long.
+
+    Callbacks arrive on the driver's own threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            "open": 0, "in_use": 0, "waiting": 0, "max_waiting": 0,
+            "checkouts": 0, "checkout_failures": 0, "wait_total": 0.0, "wait_max": 0.0,
+            "created": 0, "closed": 0, "cleared": 0,
+        }
+
+    def _gauges(self):
+        MONGO_POOL_WAITING.set(self._stats["waiting"])
+        MONGO_POOL_CONNECTIONS.labels("open").set(self._stats["open"])
+        MONGO_POOL_CONNECTIONS.labels("in_use").set(self._stats["in_use"])
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._stats["waiting"] += 1
+            self._stats["max_waiting"] = max(self._stats["max_waiting"], self._stats["waiting"])
+            self._gauges()
+
+    def connection_checked_out(self, event):
+        # ``duration`` arrived in pymongo 4.7
+        waited = getattr(event, "duration", None) or 0.0
+        with self._lock:
+            self._stats["waiting"] -= 1
+            self._stats["in_use"] += 1
+            self._stats["checkouts"] += 1
+            self._stats["wait_total"] += waited
+            self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+            self._gauges()
+        MONGO_POOL_WAIT_SECONDS.observe(waited)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._stats["waiting"] -= 1
+            self._stats["checkout_failures"] += 1
+            self._gauges()
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._gauges()
+
+    def connection_created(self, event):
+        with self._lock:
+            self._stats["open"] += 1
+            self._stats["created"] += 1
+            self._gauges()
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._stats["open"] -= 1
+            self._stats["closed"] += 1
+            self._gauges()
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._stats["cleared"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        checkouts = stats["checkouts"]
+        stats["wait_avg"] = stats["wait_total"] / checkouts if checkouts else 0.0
+        return stats
+
+
+def render_metrics():
+    """The registry in Prometheus text format, and its content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
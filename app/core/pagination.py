@@ -0,0 +1,65 @@
+import base64
+from typing import List, Optional, Tuple
+from bson import json_util
+
+
+def encode_cursor(values: list) -> str:
+    """Opaque cursor for the sort-key values of the last document on a page"""
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: list) -> dict:
+    """Filter for documents strictly after ``values`` in ``sort`` order.
+
+    For sort [(a, -1), (b, -1)] this is: a < va, or a == va and b < vb.
+    """
+    if len(values) != len(sort):
+        raise ValueError("Invalid cursor")
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {prev: values[j] for j, (prev, _) in enumerate(sort[:i])}
+        branch[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        branches.append(branch)
+    return {"$or": branches}
+
+
+async def paginate(collection, query: dict, sort: List[Tuple[str, int]], limit: int,
+                   skip: int = 0, cursor: Optional[str] = None, projection: Optional[dict] = None):
+    """Fetch one page of ``query`` in ``sort`` order.
+
+    With a cursor the page starts right after it, at constant cost however
+    deep it is; without one, ``skip`` works as before. Returns the documents
+    and the cursor for the next page, or None on the last page.
+    """
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor))]}
+        skip = 0
+
+    documents = await collection.find(query, projection).sort(sort).skip(skip).limit(limit).to_list(limit)
+
+    next_cursor = None
+    if limit and len(documents) == limit:
+        last = documents[-1]
+        next_cursor = encode_cursor([last.get(field) for field, _ in sort])
+    return documents, next_cursor
+
+
+def date_range(field: str, since=None, until=None) -> dict:
+    """Query fragment for ``since <= field < until``; empty when both are unset"""
+    bounds = {}
+    if since is not None:
+        bounds["$gte"] = since
+    if until is not None:
+        bounds["$lt"] = until
+    return {field: bounds} if bounds else {}
@@ -0,0 +1,70 @@
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def to_jsonable(value):
+    """Copy of a MongoDB document with ObjectIds and datetimes turned into strings"""
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_default(value):
+    # orjson handles dicts, lists, datetimes and dates itself; only the rest lands here
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def encode(value) -> bytes:
+    """Compact UTF-8 JSON for MongoDB documents, in one pass and without copying them"""
+    return orjson.dumps(value, default=_encode_default)
+
+
+def dumps(value) -> str:
+    """Compact JSON for a MongoDB document; anything else unknown falls back to str()"""
+    return encode(value).decode()
+
+
+class BSONResponse(JSONResponse):
+    """JSON response that takes raw Motor documents (ObjectId, datetime) as they are.
+
+    Returning one from a route skips FastAPI's jsonable_encoder pass, which
+    walks every value of a large list response in Python.
+    """
+
+    def render(self, content) -> bytes:
+        return encode(content)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """``"a,b"`` from a ``fields`` query parameter as a list; None when unset or empty"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+
+def field_projection(fields: Optional[List[str]], required: Iterable[str] = ()) -> Optional[dict]:
+    """Inclusion projection of ``fields`` plus ``required``; None fetches whole documents.
+
+    ``_id`` is left out unless it is one of them, as in the exports.
+    """
+    if not fields:
+        return None
+    projection = {field: 1 for field in [*fields, *required]}
+    projection.setdefault("_id", 0)
+    return projection
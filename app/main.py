@@ -1,38 +1,128 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from app.api.routes.page import router as page_router
 from app.api.routes.post import router as post_router
 from app.api.routes.user import router as user_router
 from app.api.routes.scraper import router as scraper_router
-from app.core.database import scraper_collection, check_mongo_connection, close_mongo_connection
+from app.api.routes.export import router as export_router
+from app.api.routes.schedule import router as schedule_router
+from app.api.routes.cache import router as cache_router
+from app.core.database import scraper_collection, check_mongo_connection, close_mongo_connection, pool_stats
+from app.core.config import settings
+from app.core.serialization import BSONResponse
+from app.core.indexes import check_query_plans, ensure_indexes
+from app.core.metrics import HTTP_REQUEST_SECONDS, render_metrics
+from app.services.analytics_service import ensure_post_rollups
+from app.services.driver_pool import driver_pool, resolve_chromedriver
+from app.services.job_service import job_runner
+from app.services.refresh_scheduler import refresh_scheduler
+from app.services.scraper_service import scrape_executor, warm_driver_pool
+from app.services.session_registry import session_registry
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup()
+    try:
+        yield
+    finally:
+        await shutdown()
 
 app = FastAPI(
     title="LinkedIn Insights Microservice",
     description="A microservice to scrape and retrieve LinkedIn page insights",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Run MongoDB connection check on startup
-@app.on_event("startup")
-async def startup_event():
+async def startup():
+    # The first MongoDB call creates the client, here inside uvicorn's loop
     await check_mongo_connection()
+    await ensure_indexes()
+    if settings.MONGO_CHECK_QUERY_PLANS:
+        await check_query_plans()
+    await ensure_post_rollups()
+    await session_registry.load()
+    # Pin the chromedriver binary now rather than on the first scrape
+    try:
+        chromedriver = await asyncio.to_thread(resolve_chromedriver)
+        print(f"Using chromedriver at {chromedriver}")
+    except Exception as e:
+        print(f"Chromedriver resolution failed, scraping is unavailable: {e}")
+    else:
+        # Browsers live in this process only with the thread executor
+        if settings.DRIVER_POOL_WARM and settings.SCRAPER_EXECUTOR == "thread":
+            asyncio.get_running_loop().run_in_executor(None, warm_driver_pool)
+    if settings.SCRAPE_JOBS_INLINE:
+        job_runner.start()
+    if settings.SCHEDULER_ENABLED:
+        refresh_scheduler.start()
 
 # Registering the routers
-app.include_router(page_router, prefix="/api/pages", tags=["Pages"])
-app.include_router(post_router, prefix="/api/posts", tags=["Posts"])
-app.include_router(user_router, prefix="/api/users", tags=["Users"])
-app.include_router(scraper_router, prefix="/api/scraper", tags=["Scraper"])
+ROUTERS = [
+    (page_router, "/api/pages", "Pages"),
+    (post_router, "/api/posts", "Posts"),
+    (user_router, "/api/users", "Users"),
+    (scraper_router, "/api/scraper", "Scraper"),
+    (export_router, "/api/export", "Export"),
+    (schedule_router, "/api/schedule", "Schedule"),
+    (cache_router, "/api/cache", "Cache"),
+]
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+
+# Full path of each included route, by id (routes are unhashable). FastAPI may
+# match the router's own route, whose path lacks the prefix, rather than a prefixed copy
+ROUTE_TEMPLATES = {id(route): prefix + route.path for router, prefix, _ in ROUTERS for route in router.routes}
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.labels(request.method, route_template(request), str(status)).observe(
+            time.perf_counter() - start
+        )
+
+def route_template(request: Request) -> str:
+    """The matched route as declared, e.g. /api/pages/{page_id}, so IDs do not explode the series"""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    return ROUTE_TEMPLATES.get(id(route), route.path)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape target"""
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+@app.get("/mongo/pool", tags=["Root"])
+async def get_mongo_pool_stats():
+    """MongoDB connection pool usage: open and busy connections, waiters and wait times"""
+    return pool_stats()
 
 @app.get("/", tags=["Root"])
 async def root():
     return {"message": "Welcome to LinkedIn Insights Microservice!"}
 
-# Fetch scraped data
+# Fetch the first 100 scrape logs (GET /api/export/scraped streams them all). Logs of
+# successful scrapes carry data_hash and version, not data: the pages' current data is
+# at GET /api/scraper/data/{type}, and GET /api/scraper/logs/{log_id} adds a log's data
 @app.get("/scraped_data", tags=["Scraper"])
 async def get_scraped_data():
-    data = await scraper_collection.find().to_list(100)  
-    return {"scraped_data": data}
+    data = await scraper_collection.find().to_list(100)
+    return BSONResponse({"scraped_data": data})
 
 
-@app.on_event("shutdown")
 async def shutdown():
+    await refresh_scheduler.stop()
+    await job_runner.stop()
+    scrape_executor.shutdown()
+    driver_pool.close()
     await close_mongo_connection()
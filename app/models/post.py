@@ -1,9 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from bson import ObjectId
 from pydantic import Field
 
+
+def naive_utc(moment: datetime) -> datetime:
+    """``moment`` as the naive UTC datetime MongoDB stores; naive values are taken as UTC already"""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
 class PostBase(BaseModel):
     page_id: str
     post_id: str
@@ -13,6 +20,9 @@ class PostBase(BaseModel):
     shares: int = 0
     created_at: datetime
 
+    # Stored, bucketed into rollup days and grouped by $dateToString alike, in UTC
+    _created_at_utc = field_validator("created_at")(naive_utc)
+
 class PostCreate(PostBase):
     pass  # Used for inserting new posts
 
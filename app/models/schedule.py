@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field, HttpUrl
+from datetime import datetime
+from typing import Optional
+
+class RefreshScheduleCreate(BaseModel):
+    url: HttpUrl
+    type: str = "company"  # "company", "profile" or "post"
+    page_id: Optional[str] = None
+    interval: int = Field(3600, ge=60)  # Seconds between refreshes
+    priority: int = 0  # Higher runs first when several refreshes are due
+
+class RefreshSchedule(RefreshScheduleCreate):
+    url_key: str  # Normalized URL, unique per type
+    domain: str  # Rate limits are kept per domain
+    enabled: bool = True
+    next_due: datetime
+    created_at: datetime
+    last_dispatched: Optional[datetime] = None
+    last_job_id: Optional[str] = None
+    failures: int = 0  # Dispatches that failed in a row
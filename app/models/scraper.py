@@ -1,11 +1,47 @@
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
+
+class ScrapeRequest(BaseModel):
+    url: HttpUrl
+    type: str = "company"  # Default to company, can be "company", "profile", or "post"
+    page_id: Optional[str] = None  # Optional ID of the LinkedIn page
+    max_age: Optional[int] = None  # Accept a cached scrape up to this many seconds old (0 = never)
+    force: bool = False  # Always scrape, ignoring cached results
 
 class ScraperLog(BaseModel):
     page_id: Optional[str] = None  # ID of the scraped page (if available)
-    url: HttpUrl  # URL of the LinkedIn page
+    url: str  # URL of the LinkedIn page as string, not HttpUrl
+    url_key: Optional[str] = None  # Normalized URL used to find earlier scrapes
     scraped_at: datetime  # Timestamp of scraping
     status: str  # "success" or "failed"
     message: str  # General message about the scrape result
     error_message: Optional[str] = None  # Store errors if the scrape fails
+    data: Optional[Dict[str, Any]] = None  # The actual scraped data
+    type: str  # Store the type of scrape (company, profile, post)
+    tier: Optional[str] = None  # What served the scrape: "http" or "browser"
+    data_hash: Optional[str] = None  # Hash of the data, compared with the page's current version
+    version: Optional[int] = None  # Version of the page's data this scrape saw
+    changed: Optional[bool] = None  # Whether the data differed from the previous version
+    same_as: Optional[str] = None  # ID of the log that first stored this data, when unchanged
+    session: Optional[str] = None  # ID of the LinkedIn session that served the scrape
+    timings: Optional[Dict[str, float]] = None  # Seconds spent in each scrape stage
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class LinkedInSessionCreate(BaseModel):
+    cookie: str  # The li_at cookie value
+    label: str = ""  # Human-readable name shown in session stats
+
+class ScrapeJob(BaseModel):
+    request: Dict[str, Any]  # The submitted ScrapeRequest
+    status: str  # "queued", "running", "done" or "failed"
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    attempts: int = 0
+    worker: Optional[str] = None  # Worker that claimed the job
+    log_id: Optional[str] = None  # ID of the stored ScraperLog
+    result: Optional[Dict[str, Any]] = None  # The scrape's status and error_message
+    error_message: Optional[str] = None
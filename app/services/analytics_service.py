@@ -0,0 +1,163 @@
+"""Engagement analytics over posts, served from per-day rollups.
+
+Each post write adjusts the ``post_daily_rollups`` document for its page and
+day by the difference between the post before and after the write, so
+insights read at most one small document per day instead of aggregating the
+page's posts. The same figures can be recomputed from the posts themselves
+with ``source="posts"``.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from pymongo import UpdateOne
+from app.core.database import analytics_reads, posts_collection, post_daily_rollups_collection
+from app.models.post import naive_utc
+
+METRICS = ("likes", "comments_count", "shares")
+
+# Fields a rollup delta needs from the stored version of a post
+ROLLUP_PROJECTION = {"_id": 0, "post_id": 1, "page_id": 1, "created_at": 1, **{m: 1 for m in METRICS}}
+
+TOP_SORT_FIELDS = ("engagement",) + METRICS
+
+DAY_FORMAT = "%Y-%m-%d"
+
+
+def day_of(moment: datetime) -> datetime:
+    """Midnight of the UTC day of ``moment``, the day $dateToString groups it into"""
+    return naive_utc(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def window_start(days: int, now: Optional[datetime] = None) -> datetime:
+    """Midnight starting a window of ``days`` whole days that ends today"""
+    return day_of(now or datetime.now()) - timedelta(days=days - 1)
+
+
+def rollup_operations(before: Iterable[dict], after: Iterable[dict]) -> List[UpdateOne]:
+    """$inc upserts that move the rollups from the ``before`` posts to the ``after`` posts"""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for sign, posts in ((-1, before), (1, after)):
+        for post in posts:
+            if not post or not isinstance(post.get("created_at"), datetime):
+                continue
+            delta = deltas[(post["page_id"], day_of(post["created_at"]))]
+            delta["posts"] += sign
+            for metric in METRICS:
+                delta[metric] += sign * (post.get(metric) or 0)
+
+    operations = []
+    for (page_id, day), delta in deltas.items():
+        changes = {field: value for field, value in delta.items() if value}
+        if changes:
+            operations.append(UpdateOne({"page_id": page_id, "day": day}, {"$inc": changes}, upsert=True))
+    return operations
+
+
+async def record_post_changes(before: Iterable[dict], after: Iterable[dict]):
+    """Apply the rollup deltas for a set of post writes; never raises"""
+    operations = rollup_operations(before, after)
+    if not operations:
+        return
+    try:
+        await post_daily_rollups_collection.bulk_write(operations, ordered=False)
+    except Exception as e:
+        # Rollups are derived data; rebuild_post_rollups() repairs them
+        print(f" Post rollups not updated: {e}")
+
+
+async def stored_posts(post_ids: List[str]) -> dict:
+    """Current rollup fields of the given posts, by post_id"""
+    cursor = posts_collection.find({"post_id": {"$in": post_ids}}, ROLLUP_PROJECTION)
+    return {post["post_id"]: post async for post in cursor}
+
+
+def daily_pipeline(match: dict) -> list:
+    """Aggregation grouping the posts matching ``match`` by page and day"""
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"page_id": "$page_id", "day": {"$dateToString": {"format": DAY_FORMAT, "date": "$created_at"}}},
+            "posts": {"$sum": 1},
+            **{metric: {"$sum": f"${metric}"} for metric in METRICS},
+        }},
+    ]
+
+
+def rollup_from_group(group: dict) -> dict:
+    """Rollup document for one group produced by daily_pipeline"""
+    return {
+        "page_id": group["_id"]["page_id"],
+        "day": datetime.strptime(group["_id"]["day"], DAY_FORMAT),
+        "posts": group["posts"],
+        **{metric: group[metric] for metric in METRICS},
+    }
+
+
+async def rebuild_post_rollups(page_id: Optional[str] = None) -> int:
+    """Recompute rollups from the posts collection, for one page or all of them"""
+    match = {"page_id": page_id} if page_id else {}
+    rollups = [rollup_from_group(g) async for g in posts_collection.aggregate(daily_pipeline(match))]
+    await post_daily_rollups_collection.delete_many(match)
+    if rollups:
+        await post_daily_rollups_collection.insert_many(rollups, ordered=False)
+    return len(rollups)
+
+
+async def ensure_post_rollups():
+    """Backfill rollups for posts stored before rollups were maintained"""
+    if await post_daily_rollups_collection.estimated_document_count():
+        return
+    if await posts_collection.estimated_document_count():
+        print(f" Built {await rebuild_post_rollups()} daily post rollups")
+
+
+def _summarize(page_id: str, since: datetime, daily: List[dict], source: str) -> dict:
+    totals = {field: sum(day[field] for day in daily) for field in ("posts",) + METRICS}
+    posts = totals["posts"]
+    engagement = sum(totals[metric] for metric in METRICS)
+    return {
+        "page_id": page_id,
+        "since": since,
+        "source": source,
+        **totals,
+        "engagement": engagement,
+        "avg_likes": totals["likes"] / posts if posts else 0.0,
+        "avg_comments": totals["comments_count"] / posts if posts else 0.0,
+        "avg_shares": totals["shares"] / posts if posts else 0.0,
+        "avg_engagement": engagement / posts if posts else 0.0,
+        "daily": daily,
+    }
+
+
+async def page_insights(page_id: str, days: int, source: str = "rollups") -> dict:
+    """Post counts, engagement totals and per-post averages for the last ``days`` days"""
+    since = window_start(days)
+    if source == "posts":
+        groups = analytics_reads(posts_collection).aggregate(
+            daily_pipeline({"page_id": page_id, "created_at": {"$gte": since}}) + [{"$sort": {"_id.day": 1}}]
+        )
+        daily = [rollup_from_group(g) async for g in groups]
+    else:
+        cursor = analytics_reads(post_daily_rollups_collection).find(
+            {"page_id": page_id, "day": {"$gte": since}}, {"_id": 0}
+        ).sort("day", 1)
+        # Days whose posts were all deleted or moved keep an all-zero document
+        daily = [day async for day in cursor if day.get("posts")]
+
+    daily = [{"day": d["day"], "posts": d["posts"], **{m: d.get(m, 0) for m in METRICS}} for d in daily]
+    return _summarize(page_id, since, daily, source)
+
+
+async def top_posts(days: int, limit: int, by: str = "engagement", page_id: Optional[str] = None) -> List[dict]:
+    """Posts of the last ``days`` days with the most engagement (likes + comments + shares) or ``by``"""
+    match = {"created_at": {"$gte": window_start(days)}}
+    if page_id:
+        match["page_id"] = page_id
+    pipeline = [
+        {"$match": match},
+        {"$addFields": {"engagement": {"$add": [f"${metric}" for metric in METRICS]}}},
+        {"$sort": {by: -1, "post_id": 1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0}},
+    ]
+    return [post async for post in analytics_reads(posts_collection).aggregate(pipeline)]
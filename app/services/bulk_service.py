@@ -0,0 +1,137 @@
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from fastapi import Request
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.services.entity_cache import entity_cache
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Row errors kept in a report; the failed count still covers every row
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_rows(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Yield ``(row_number, parsed_json)`` from a JSON array or an NDJSON stream.
+
+    NDJSON is parsed line by line as it arrives, so large uploads are never
+    held in memory whole. A line that is not valid JSON is yielded as a
+    ValueError for the caller to report.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in NDJSON_TYPES:
+        rows = json.loads(await request.body())
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON array")
+        for number, row in enumerate(rows):
+            yield number, row
+        return
+
+    number = 0
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield number, _parse_line(line)
+                number += 1
+    if buffer.strip():
+        yield number, _parse_line(buffer)
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+
+class BulkReport:
+    """Counts and per-row errors for one bulk upsert request"""
+
+    def __init__(self):
+        self.received = 0
+        self.upserted = 0
+        self.modified = 0
+        self.matched = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "upserted": self.upserted,
+            "matched": self.matched,
+            "modified": self.modified,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+async def bulk_upsert(collection, model, key: str, rows: AsyncIterator, json_mode: bool = False,
+                      track: Optional[Callable[[List[dict], List[dict]], Awaitable]] = None) -> dict:
+    """Validate ``rows`` against ``model`` and upsert them by ``key``.
+
+    Rows are validated and written in chunks of BULK_CHUNK_SIZE with one
+    unordered bulk_write each, so a bad row only fails itself. ``track``,
+    when given, is awaited after each chunk with the stored and the new
+    versions of the documents it wrote, to keep derived data in step.
+    """
+    report = BulkReport()
+    chunk = []  # (row_number, document)
+
+    async def flush():
+        stored = {}
+        if track is not None:
+            keys = [doc[key] for _, doc in chunk]
+            stored = {doc[key]: doc async for doc in collection.find({key: {"$in": keys}}, {"_id": 0})}
+
+        operations = [UpdateOne({key: doc[key]}, {"$set": doc}, upsert=True) for _, doc in chunk]
+        failed = set()
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            for write_error in details.get("writeErrors", []):
+                failed.add(write_error["index"])
+                report.error(chunk[write_error["index"]][0], write_error.get("errmsg", "Write failed"))
+
+        # Cached GET responses are keyed by collection name and key
+        await entity_cache.invalidate(collection.name, [doc[key] for _, doc in chunk])
+        if track is not None:
+            written = {}
+            for index, (_, doc) in enumerate(chunk):
+                if index not in failed:
+                    written[doc[key]] = {**written.get(doc[key], stored.get(doc[key], {})), **doc}
+            await track([stored[k] for k in written if k in stored], list(written.values()))
+        report.upserted += details.get("nUpserted", 0)
+        report.matched += details.get("nMatched", 0)
+        report.modified += details.get("nModified", 0)
+
+    async for number, raw in rows:
+        report.received += 1
+        if isinstance(raw, ValueError):
+            report.error(number, str(raw))
+            continue
+        try:
+            document = model.model_validate(raw).model_dump(mode="json" if json_mode else "python")
+        except ValidationError as e:
+            report.error(number, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        chunk.append((number, document))
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            await flush()
+            chunk = []
+
+    if chunk:
+        await flush()
+    return report.as_dict()
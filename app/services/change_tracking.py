@@ -0,0 +1,209 @@
+"""Versioned scrape data: one current document per URL and type, plus diffs.
+
+A successful scrape is hashed (leaving out relative fields such as post
+timestamps) and compared with the page's current version. When nothing
+changed only ``last_seen`` moves. A change bumps the version,
+replaces the current data and stores the field-level changes from the
+previous version; every SCRAPE_SNAPSHOT_EVERY versions the whole payload is
+stored instead, so replaying history never starts further back than that.
+"""
+import copy
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.core.database import scrape_current_collection, scrape_diffs_collection
+
+
+# Fields rendered relative to now ("1h", "2d") that change without the page changing
+VOLATILE_FIELDS = {"timestamp"}
+
+# A diff whose writer stopped before moving the current version gives that version up after this long
+ORPHANED_DIFF_SECONDS = 60
+
+
+def without_volatile(data):
+    """``data`` without VOLATILE_FIELDS, at any depth"""
+    if isinstance(data, dict):
+        return {key: without_volatile(value) for key, value in data.items() if key not in VOLATILE_FIELDS}
+    if isinstance(data, list):
+        return [without_volatile(value) for value in data]
+    return data
+
+
+def content_hash(data) -> str:
+    """Stable hash of a scraped payload, independent of key order and volatile fields"""
+    encoded = json.dumps(without_volatile(data), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def diff_data(old, new, path: tuple = ()) -> List[dict]:
+    """Changes that turn ``old`` into ``new``.
+
+    Dicts are compared key by key and lists index by index, so a tick in
+    one post's like count is a single ``set`` of that count.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key, value in new.items():
+            if key in old:
+                changes.extend(diff_data(old[key], value, path + (key,)))
+            else:
+                changes.append({"op": "set", "path": list(path + (key,)), "value": value})
+        for key in old:
+            if key not in new:
+                changes.append({"op": "unset", "path": list(path + (key,))})
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for index, value in enumerate(new):
+            if index < len(old):
+                changes.extend(diff_data(old[index], value, path + (index,)))
+            else:
+                changes.append({"op": "set", "path": list(path + (index,)), "value": value})
+        if len(new) < len(old):
+            changes.append({"op": "truncate", "path": list(path), "value": len(new)})
+        return changes
+
+    if old != new or type(old) is not type(new):
+        return [{"op": "set", "path": list(path), "value": new}]
+    return []
+
+
+def apply_changes(data, changes: List[dict]):
+    """Inverse of diff_data: ``data`` with ``changes`` applied, as a new object"""
+    data = copy.deepcopy(data)
+    for change in changes:
+        path = change["path"]
+        if not path:
+            data = copy.deepcopy(change["value"])
+            continue
+        parent = data
+        for step in path[:-1]:
+            parent = parent[step]
+        last = path[-1]
+        if change["op"] == "unset":
+            parent.pop(last, None)
+        elif change["op"] == "truncate":
+            del parent[last][change["value"]:]
+        elif isinstance(parent, list) and last == len(parent):
+            parent.append(copy.deepcopy(change["value"]))
+        else:
+            parent[last] = copy.deepcopy(change["value"])
+    return data
+
+
+async def record_version(document: dict) -> dict:
+    """Fold a successful scrape log document into its page's current version.
+
+    ``document`` must already carry its ``_id``. Returns ``changed``,
+    ``version``, ``hash`` and ``log_id``: the log this data was first stored
+    under, which is an earlier one when nothing changed.
+    """
+    key = {"url_key": document["url_key"], "type": document["type"]}
+    data = document.get("data") or {}
+    digest = content_hash(data)
+    scraped_at = document["scraped_at"]
+
+    # Retried when a concurrent scrape of the same page moves the version first
+    for _ in range(3):
+        current = await scrape_current_collection.find_one(key, {"hash": 1, "version": 1, "data": 1, "log_id": 1})
+        if current is not None and current["hash"] == digest:
+            await scrape_current_collection.update_one(
+                {"_id": current["_id"]}, {"$set": {"last_seen": scraped_at}, "$inc": {"seen": 1}}
+            )
+            return {"changed": False, "version": current["version"], "hash": digest, "log_id": current["log_id"]}
+
+        version = current["version"] + 1 if current else 1
+        log_id = str(document["_id"])
+        snapshot = current is None or (version - 1) % settings.SCRAPE_SNAPSHOT_EVERY == 0
+        changes = [{"op": "set", "path": [], "value": data}] if snapshot else diff_data(current["data"], data)
+
+        # The diff goes in first and claims the version (the diffs' key is
+        # unique), so the current document never points past its history
+        diff_id = ObjectId()
+        try:
+            await scrape_diffs_collection.insert_one({
+                "_id": diff_id,
+                **key,
+                "version": version,
+                "snapshot": snapshot,
+                "hash": digest,
+                "log_id": log_id,
+                "scraped_at": scraped_at,
+                "changes": changes,
+            })
+        except DuplicateKeyError:
+            stale = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=ORPHANED_DIFF_SECONDS))
+            await scrape_diffs_collection.delete_one({**key, "version": version, "_id": {"$lt": stale}})
+            continue
+
+        try:
+            result = await scrape_current_collection.update_one(
+                {**key, "version": current["version"] if current else {"$exists": False}},
+                {
+                    "$set": {
+                        "url": document["url"],
+                        "page_id": document.get("page_id"),
+                        "tier": document.get("tier"),
+                        "data": data,
+                        "hash": digest,
+                        "version": version,
+                        "log_id": log_id,
+                        "last_seen": scraped_at,
+                        "last_changed": scraped_at,
+                    },
+                    "$setOnInsert": {"first_seen": scraped_at},
+                    "$inc": {"seen": 1},
+                },
+                upsert=current is None,
+            )
+            moved = current is None or result.matched_count
+        except DuplicateKeyError:
+            moved = False
+        if not moved:
+            await scrape_diffs_collection.delete_one({"_id": diff_id})
+            continue
+        return {"changed": True, "version": version, "hash": digest, "log_id": log_id}
+
+    raise RuntimeError(f"Could not record a new version of {document['url_key']}: too many concurrent changes")
+
+
+async def get_current(url_key: str, page_type: str) -> Optional[dict]:
+    return await scrape_current_collection.find_one({"url_key": url_key, "type": page_type}, {"_id": 0})
+
+
+async def page_history(url_key: str, page_type: str, limit: int, version: Optional[int] = None) -> List[dict]:
+    """The newest ``limit`` versions of a page's data, newest first, or just ``version``"""
+    key = {"url_key": url_key, "type": page_type}
+    current = await scrape_current_collection.find_one(key, {"version": 1})
+    if current is None:
+        return []
+    last = min(version or current["version"], current["version"])
+    first = last if version else max(1, last - limit + 1)
+
+    # Replay from the nearest full snapshot at or before the first wanted version
+    snapshot = await scrape_diffs_collection.find_one(
+        {**key, "snapshot": True, "version": {"$lte": first}}, {"version": 1}, sort=[("version", -1)]
+    )
+    start = snapshot["version"] if snapshot else 1
+    cursor = scrape_diffs_collection.find({**key, "version": {"$gte": start, "$lte": last}}).sort("version", 1)
+
+    data = None
+    versions = []
+    async for diff in cursor:
+        data = apply_changes(data, diff["changes"])
+        if diff["version"] >= first:
+            versions.append({
+                "version": diff["version"],
+                "scraped_at": diff["scraped_at"],
+                "log_id": diff["log_id"],
+                "hash": diff["hash"],
+                "changed_fields": None if diff["snapshot"] else [c["path"] for c in diff["changes"]],
+                "data": data,
+            })
+    return versions[::-1]
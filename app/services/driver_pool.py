@@ -0,0 +1,277 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+from app.core.config import settings
+from app.core.metrics import StageTimer, stage
+from app.services.session_registry import SessionBlockedError
+
+LINKEDIN_HOME = "https://www.linkedin.com"
+
+# chromedriver binary, resolved once per process
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def resolve_chromedriver() -> str:
+    """Return the chromedriver binary path, resolving it on first use only.
+
+    An explicit CHROMEDRIVER_PATH is used as-is. Otherwise webdriver-manager
+    looks up (and if needed downloads) CHROMEDRIVER_VERSION or the latest
+    release, which SCRAPER_OFFLINE forbids.
+    """
+    global _chromedriver_path
+    if _chromedriver_path:
+        return _chromedriver_path
+
+    with _chromedriver_lock:
+        if _chromedriver_path:
+            return _chromedriver_path
+
+        if settings.CHROMEDRIVER_PATH:
+            path = settings.CHROMEDRIVER_PATH
+            if not (os.path.isfile(path) and os.access(path, os.X_OK)):
+                raise RuntimeError(f"CHROMEDRIVER_PATH is not an executable file: {path}")
+        elif settings.SCRAPER_OFFLINE:
+            raise RuntimeError("SCRAPER_OFFLINE is set but CHROMEDRIVER_PATH is not")
+        else:
+            path = ChromeDriverManager(driver_version=settings.CHROMEDRIVER_VERSION or None).install()
+
+        _chromedriver_path = path
+        return path
+
+
+def build_chrome_options() -> Options:
+    """Headless Chrome options shared by every pooled driver"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36")
+
+    # Keep long-lived browsers small: one renderer, bounded V8 heap
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--renderer-process-limit=1")
+    chrome_options.add_argument(f"--js-flags=--max-old-space-size={settings.DRIVER_MAX_HEAP_MB}")
+    return chrome_options
+
+
+def launch_driver():
+    """Start a new headless Chrome session"""
+    service = Service(resolve_chromedriver())
+    return webdriver.Chrome(service=service, options=build_chrome_options())
+
+
+class PooledDriver:
+    """A pooled browser plus the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.cookie = None
+
+
+class DriverPool:
+    """Keeps warm, authenticated Chrome sessions and leases them to scrapes.
+
+    Drivers are health-checked before each lease and recycled after
+    ``max_uses`` scrapes, when a scrape crashes them, or when their JS heap
+    grows past ``max_heap_mb``.
+    """
+
+    def __init__(self, factory, size: int, max_uses: int, lease_timeout: float, max_heap_mb: int):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.max_heap_mb = max_heap_mb
+        # Each slot holds a PooledDriver, or None until a driver is launched
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._stats = {
+            "leases": 0,
+            "lease_timeouts": 0,
+            "lease_wait_total": 0.0,
+            "lease_wait_max": 0.0,
+            "launched": 0,
+            "recycled_max_uses": 0,
+            "recycled_unhealthy": 0,
+            "recycled_crashed": 0,
+            "recycled_memory": 0,
+        }
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _launch(self) -> PooledDriver:
+        entry = PooledDriver(self.factory())
+        self._count("launched")
+        return entry
+
+    def _ensure_cookie(self, entry: PooledDriver, cookie: str):
+        # Cookies can only be set for the domain the browser is on
+        if entry.cookie == cookie:
+            return
+        if not entry.driver.current_url.startswith(LINKEDIN_HOME):
+            entry.driver.get(LINKEDIN_HOME)
+        # Another account's JSESSIONID and friends must not leak into this one
+        entry.driver.delete_all_cookies()
+        entry.driver.add_cookie({"name": "li_at", "value": cookie, "domain": ".linkedin.com"})
+        entry.cookie = cookie
+
+    def _take_idle(self, cookie: str):
+        """An idle slot, preferring a driver already signed in with ``cookie``"""
+        with self._idle.mutex:
+            for index in range(len(self._idle.queue) - 1, -1, -1):
+                entry = self._idle.queue[index]
+                if entry is not None and entry.cookie == cookie:
+                    del self._idle.queue[index]
+                    self._idle.not_full.notify()
+                    return entry
+        return self._idle.get(timeout=self.lease_timeout)
+
+    def _health_problem(self, entry: PooledDriver):
+        """Return why ``entry`` should be recycled, or None if it is usable"""
+        try:
+            heap = entry.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+        except Exception:
+            return "recycled_unhealthy"
+        if heap and heap > self.max_heap_mb * 1024 * 1024:
+            return "recycled_memory"
+        return None
+
+    def _discard(self, entry: PooledDriver, reason: str):
+        self._count(reason)
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    def warm(self, cookie: str):
+        """Launch every empty slot and attach ``cookie`` up front"""
+        entries = []
+        while True:
+            try:
+                entries.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            for i, entry in enumerate(entries):
+                if entry is None:
+                    entry = entries[i] = self._launch()
+                self._ensure_cookie(entry, cookie)
+        finally:
+            for entry in entries:
+                self._idle.put(entry)
+
+    @contextmanager
+    def lease(self, cookie: str, timer: Optional[StageTimer] = None):
+        """Borrow a healthy driver with ``cookie`` set, for one scrape.
+
+        With a ``timer``, getting a running browser is timed as
+        ``driver_acquire`` and signing it in as ``cookie``.
+        """
+        start = time.perf_counter()
+        try:
+            entry = self._take_idle(cookie)
+        except queue.Empty:
+            self._count("lease_timeouts")
+            raise TimeoutError(f"No browser became available within {self.lease_timeout}s")
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._stats["leases"] += 1
+            self._stats["lease_wait_total"] += waited
+            self._stats["lease_wait_max"] = max(self._stats["lease_wait_max"], waited)
+
+        try:
+            with stage(timer, "driver_acquire"):
+                if entry is not None:
+                    problem = self._health_problem(entry)
+                    if problem:
+                        self._discard(entry, problem)
+                        entry = None
+                if entry is None:
+                    entry = self._launch()
+            if timer is not None:
+                timer.add("driver_acquire", waited)
+            with stage(timer, "cookie"):
+                self._ensure_cookie(entry, cookie)
+        except Exception:
+            if entry is not None:
+                self._discard(entry, "recycled_crashed")
+            self._idle.put(None)
+            raise
+
+        try:
+            yield entry.driver
+        except SessionBlockedError:
+            # The browser is fine, only its cookie is not; the next lease signs it in again
+            entry.cookie = None
+            raise
+        except Exception:
+            self._discard(entry, "recycled_crashed")
+            entry = None
+            raise
+        finally:
+            if entry is not None:
+                entry.uses += 1
+                if entry.uses >= self.max_uses:
+                    self._discard(entry, "recycled_max_uses")
+                    entry = None
+            self._idle.put(entry)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        leases = stats["leases"]
+        stats["lease_wait_avg"] = stats["lease_wait_total"] / leases if leases else 0.0
+        stats.update({
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "max_uses": self.max_uses,
+            "lease_timeout": self.lease_timeout,
+            "max_heap_mb": self.max_heap_mb,
+        })
+        return stats
+
+    def close(self):
+        """Quit every idle driver, leaving their slots empty"""
+        drained = 0
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            drained += 1
+            if entry is not None:
+                try:
+                    entry.driver.quit()
+                except Exception:
+                    pass
+        for _ in range(drained):
+            self._idle.put(None)
+
+
+# One pool per process: with the process executor every worker owns its own
+driver_pool = DriverPool(
+    launch_driver,
+    size=settings.DRIVER_POOL_SIZE,
+    max_uses=settings.DRIVER_MAX_USES,
+    lease_timeout=settings.DRIVER_LEASE_TIMEOUT,
+    max_heap_mb=settings.DRIVER_MAX_HEAP_MB,
+)
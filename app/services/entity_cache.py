@@ -0,0 +1,231 @@
+"""Read-through cache for single page, post and user lookups.
+
+Entries are the encoded GET response and its ETag, keyed by collection and
+ID, so a hit is served without touching MongoDB or re-encoding anything.
+The default backend is an in-process TTL-LRU; with ENTITY_CACHE_REDIS_URL
+entries live in Redis instead and are shared by every process. Writes to
+an entity invalidate it; whatever a write misses (another process's
+memory cache, a write made outside the API) ages out after
+ENTITY_CACHE_TTL seconds.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.serialization import encode
+from app.services.single_flight import SingleFlight
+
+# Key field of each cached collection, and the name the GET response wraps it in
+ENTITIES = {
+    "pages": ("page_id", "page"),
+    "posts": ("post_id", "post"),
+    "users": ("linkedin_id", "user"),
+}
+
+
+class CachedEntity:
+    """An encoded GET response and its ETag"""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+    @classmethod
+    def encode(cls, kind: str, document: dict) -> "CachedEntity":
+        body = encode({ENTITIES[kind][1]: document})
+        return cls(body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+    def pack(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.body
+
+    @classmethod
+    def unpack(cls, value: bytes) -> "CachedEntity":
+        etag, _, body = value.partition(b"\n")
+        return cls(body, etag.decode())
+
+
+class MemoryBackend:
+    """TTL-LRU of packed entries in this process"""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._bytes = 0
+
+    def _drop(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (self.clock() + ttl, value)
+        self._bytes += len(key) + len(value)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def delete(self, keys: list):
+        for key in keys:
+            if key in self._entries:
+                self._drop(key)
+
+    async def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+        }
+
+
+class RedisBackend:
+    """Entries in Redis under ``prefix``.
+
+    ``client`` is anything with redis-py's asyncio get/set/delete/info/dbsize,
+    so tests can hand in a local stand-in instead of a server.
+    """
+
+    def __init__(self, client, prefix: str = "entity:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def delete(self, keys: list):
+        if keys:
+            await self.client.delete(*[self.prefix + key for key in keys])
+
+    async def stats(self) -> dict:
+        memory = await self.client.info("memory")
+        return {
+            "backend": "redis",
+            # The whole Redis database, which may hold more than this cache
+            "keys": await self.client.dbsize(),
+            "bytes": memory.get("used_memory"),
+        }
+
+
+def build_backend(redis_url: str, max_entries: int):
+    if not redis_url:
+        return MemoryBackend(max_entries)
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        raise RuntimeError("ENTITY_CACHE_REDIS_URL is set but the redis package is not installed (pip install redis)")
+    return RedisBackend(redis.Redis.from_url(redis_url))
+
+
+class EntityCache:
+    """Serves single-entity GETs from ``backend`` and loads misses from MongoDB.
+
+    Concurrent misses for the same entity share one load, and a load that
+    an invalidation overtakes is returned but not cached. A failing backend
+    only costs hits: lookups then go straight to MongoDB.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight = SingleFlight()  # keyed by cache key
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0, "errors": 0}
+
+    async def get(self, kind: str, key: str, load: Callable[[], Awaitable[Optional[dict]]]) -> Optional[CachedEntity]:
+        """The cached entity, or ``await load()`` encoded and cached; None if it does not exist"""
+        if self.ttl <= 0:
+            document = await load()
+            return CachedEntity.encode(kind, document) if document is not None else None
+
+        cache_key = f"{kind}:{key}"
+        try:
+            value = await self.backend.get(cache_key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f" Entity cache read failed: {e}")
+            value = None
+        if value is not None:
+            self._stats["hits"] += 1
+            return CachedEntity.unpack(value)
+
+        async def load_entity():
+            document = await load()
+            return CachedEntity.encode(kind, document) if document is not None else None
+
+        self._stats["coalesced" if cache_key in self._inflight else "misses"] += 1
+        flight = await self._inflight.do(cache_key, load_entity)
+        entity = flight.result
+        if entity is not None and not flight.shared and not flight.overtaken:
+            try:
+                await self.backend.set(cache_key, entity.pack(), self.ttl)
+            except Exception as e:
+                self._stats["errors"] += 1
+                print(f" Entity cache write failed: {e}")
+        return entity
+
+    async def invalidate(self, kind: str, keys: Iterable[str]):
+        """Forget the given entities of ``kind``; never raises"""
+        cache_keys = [f"{kind}:{key}" for key in set(keys) if key]
+        if not cache_keys:
+            return
+        self._stats["invalidations"] += len(cache_keys)
+        self._inflight.invalidate(cache_keys)
+        try:
+            await self.backend.delete(cache_keys)
+        except Exception as e:
+            # The entry then lives out its TTL
+            self._stats["errors"] += 1
+            print(f" Entity cache invalidation failed: {e}")
+
+    async def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+        try:
+            backend = await self.backend.stats()
+        except Exception as e:
+            backend = {"error": str(e)}
+        return {
+            **self._stats,
+            "hit_rate": (self._stats["hits"] + self._stats["coalesced"]) / lookups if lookups else 0.0,
+            "ttl": self.ttl,
+            **backend,
+        }
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names ``etag``"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 asks of If-None-Match
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def entity_response(request: Request, entity: CachedEntity) -> Response:
+    """200 with the encoded entity, or 304 if the client already has this version"""
+    headers = {"ETag": entity.etag, "Cache-Control": "no-cache"}
+    if if_none_match(request, entity.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entity.body, media_type="application/json", headers=headers)
+
+
+entity_cache = EntityCache(
+    build_backend(settings.ENTITY_CACHE_REDIS_URL, settings.ENTITY_CACHE_MAX_ENTRIES), settings.ENTITY_CACHE_TTL
+)
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List, Optional
+from app.core.config import settings
+from app.core.serialization import dumps, to_jsonable
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_cell(value):
+    # Nested documents and lists go into a single cell as JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+async def iter_export(collection, query: dict, sort: list, fmt: str,
+                      fields: Optional[List[str]] = None, compress: bool = False) -> AsyncIterator[bytes]:
+    """Stream every document matching ``query`` as NDJSON or CSV bytes.
+
+    Documents are read from the cursor EXPORT_BATCH_SIZE at a time and
+    written out per batch, so memory use does not grow with the export.
+    CSV columns are ``fields`` when given, otherwise the keys of the first
+    document; keys that only appear later are left out.
+    """
+    projection = {field: 1 for field in fields} if fields else None
+    if projection is not None and "_id" not in fields:
+        projection["_id"] = 0
+    cursor = collection.find(query, projection, batch_size=settings.EXPORT_BATCH_SIZE).sort(sort)
+
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31: gzip container
+    buffer = io.StringIO()
+    writer = None
+    pending = 0
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    try:
+        async for document in cursor:
+            if fmt == "csv":
+                row = to_jsonable(document)
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=fields or list(row), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow({key: _csv_cell(value) for key, value in row.items()})
+            else:
+                buffer.write(dumps(document))
+                buffer.write("\n")
+            pending += 1
+            if pending >= settings.EXPORT_BATCH_SIZE:
+                yield drain()
+                pending = 0
+
+        if fmt == "csv" and writer is None and fields:
+            csv.writer(buffer).writerow(fields)
+        tail = drain()
+        if compressor is not None:
+            tail += compressor.flush()
+        if tail:
+            yield tail
+    finally:
+        await cursor.close()
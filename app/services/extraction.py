@@ -0,0 +1,282 @@
+"""Single-pass extraction of scraped pages.
+
+The browser hands over ``page_source`` once and everything is parsed here, in
+process, from declarative selector specs. Nothing in this module touches
+Selenium, so the extractors run the same against a live page or stored HTML.
+"""
+from typing import Optional
+from bs4 import BeautifulSoup
+from app.core.metrics import StageTimer, stage
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html or "", "lxml")
+
+
+def node_text(node) -> str:
+    """Visible-ish text of a node with whitespace collapsed, like WebElement.text"""
+    if node is None:
+        return ""
+    return " ".join(node.get_text(" ", strip=True).split())
+
+
+class Text:
+    """Text of the ``index``-th match of a CSS selector"""
+
+    def __init__(self, selector: str, index: int = 0, default: str = "", required: bool = False):
+        self.selector = selector
+        self.index = index
+        self.default = default
+        self.required = required
+
+    def extract(self, node):
+        matches = node.select(self.selector, limit=self.index + 1)
+        if len(matches) > self.index:
+            return node_text(matches[self.index])
+        return None if self.required else self.default
+
+
+class Matching:
+    """Text of the first match of a CSS selector that contains ``keyword``"""
+
+    def __init__(self, selector: str, keyword: str, default: str = ""):
+        self.selector = selector
+        self.keyword = keyword
+        self.default = default
+
+    def extract(self, node):
+        for match in node.select(self.selector):
+            text = node_text(match)
+            if self.keyword in text.lower():
+                return text
+        return self.default
+
+
+class Attribute:
+    """An attribute of the node itself, or of the first match of ``selector``"""
+
+    def __init__(self, name: str, selector: str = None, default: str = ""):
+        self.name = name
+        self.selector = selector
+        self.default = default
+
+    def extract(self, node):
+        target = node.select_one(self.selector) if self.selector else node
+        value = target.get(self.name) if target is not None else None
+        return value if value else self.default
+
+
+class SiblingText:
+    """Text under the first ``sibling`` after an anchor element, e.g. a profile section"""
+
+    def __init__(self, anchor: str, selector: str, sibling: str = "div"):
+        self.anchor = anchor
+        self.selector = selector
+        self.sibling = sibling
+
+    def extract(self, node):
+        anchor = node.select_one(self.anchor)
+        container = anchor.find_next_sibling(self.sibling) if anchor else None
+        return node_text(container.select_one(self.selector)) if container else ""
+
+
+class Each:
+    """A list built from the first ``limit`` matches of ``selector``.
+
+    Items missing a required field are dropped, as are items that raise.
+    """
+
+    def __init__(self, selector: str, item: dict, limit: int = None, anchor: str = None, sibling: str = "div"):
+        self.selector = selector
+        self.item = item
+        self.limit = limit
+        self.anchor = anchor
+        self.sibling = sibling
+
+    def _scope(self, node):
+        if self.anchor is None:
+            return node
+        anchor = node.select_one(self.anchor)
+        return anchor.find_next_sibling(self.sibling) if anchor else None
+
+    def extract(self, node):
+        scope = self._scope(node)
+        if scope is None:
+            return []
+        items = []
+        for match in scope.select(self.selector, limit=self.limit):
+            try:
+                value = extract(self.item, match)
+            except Exception:
+                continue
+            if value is not None:
+                items.append(value)
+        return items
+
+
+class Labelled:
+    """Fields taken from label/value rows, matched by a keyword in the label.
+
+    The fields are merged into the enclosing dict; missing ones default to ""
+    or to ``defaults[key]()``.
+    """
+
+    def __init__(self, row: str, label: str, value: str, fields: dict, transforms: dict = None, defaults: dict = None):
+        self.row = row
+        self.label = label
+        self.value = value
+        self.fields = fields  # output key -> label keyword, checked in order
+        self.transforms = transforms or {}
+        self.defaults = defaults or {}
+
+    def extract(self, node):
+        found = {key: self.defaults[key]() if key in self.defaults else "" for key in self.fields}
+        for row in node.select(self.row):
+            label = node_text(row.select_one(self.label)).lower()
+            value = node_text(row.select_one(self.value))
+            for key, keyword in self.fields.items():
+                if keyword in label:
+                    transform = self.transforms.get(key)
+                    found[key] = transform(value) if transform else value
+                    break
+        return found
+
+
+class Counts:
+    """Engagement counters ("1,234 likes") sorted into keys by keyword"""
+
+    def __init__(self, selector: str, fields: dict, defaults: bool = False):
+        self.selector = selector
+        self.fields = fields  # output key -> keyword
+        self.defaults = defaults
+
+    def extract(self, node):
+        counts = {key: "" for key in self.fields} if self.defaults else {}
+        for metric in node.select(self.selector):
+            count_text = node_text(metric).lower()
+            for key, keyword in self.fields.items():
+                if keyword in count_text:
+                    counts[key] = count_text
+                    break
+        return counts
+
+
+def extract(spec, node):
+    """Apply a spec (a dict of fields, or a single field) to a parsed node.
+
+    Returns None when a required field is missing.
+    """
+    if not isinstance(spec, dict):
+        return spec.extract(node)
+    result = {}
+    for key, field in spec.items():
+        if isinstance(field, Labelled):
+            result.update(field.extract(node))
+            continue
+        value = extract(field, node)
+        if value is None:
+            return None
+        result[key] = value
+    return result
+
+
+def split_list(value: str):
+    return [s.strip() for s in value.split(",")]
+
+
+COMPANY_SPEC = {
+    "page": {
+        "name": Text(".org-top-card-summary__title"),
+        "industry": Text(".org-top-card-summary-info-list__info-item"),
+        "followers": Matching(".org-top-card-summary-info-list__info-item", "follower"),
+        "details": Labelled(
+            row=".org-about-company-module__about-us-item",
+            label=".org-about-company-module__about-us-label",
+            value=".org-about-company-module__about-us-text",
+            fields={
+                "website": "website",
+                "company_size": "size",
+                "headquarters": "headquarters",
+                "founded": "founded",
+                "specialties": "specialties",
+            },
+            transforms={"specialties": split_list},
+            defaults={"specialties": list},
+        ),
+    },
+    "about": Text(".org-about-us-organization-description__text"),
+    "recent_posts": Each(".occludable-update", limit=3, item={
+        "urn": Attribute("data-urn"),
+        "timestamp": Text(".feed-shared-actor__sub-description"),
+        "text": Text(".feed-shared-update-v2__description", required=True),
+        "engagement": Counts(".social-details-social-counts__item", {"likes": "like", "comments": "comment", "reposts": "repost"}),
+    }),
+}
+
+PROFILE_SPEC = {
+    "user": {
+        "name": Text(".text-heading-xlarge"),
+        "headline": Text(".text-body-medium"),
+        "location": Text(".pv-text-details__left-panel .text-body-small"),
+        "connections": Text(".pv-text-details__right-panel .text-body-small"),
+        "about": SiblingText("#about", "span"),
+    },
+    "experience": Each("li", anchor="#experience", item={
+        "title": Text(".t-bold", required=True),
+        "company": Text(".t-normal", required=True),
+        "duration": Text(".t-normal", index=1),
+    }),
+    "education": Each("li", anchor="#education", item={
+        "school": Text(".t-bold", required=True),
+        "degree": Text(".t-normal"),
+        "years": Text(".t-normal", index=1),
+    }),
+}
+
+POST_SPEC = {
+    "post": {
+        "author": Text(".feed-shared-actor__name"),
+        "author_headline": Text(".feed-shared-actor__description"),
+        "content": Text(".feed-shared-update-v2__description"),
+        "timestamp": Text(".feed-shared-actor__sub-description"),
+        "engagement": Counts(
+            ".social-details-social-counts__item",
+            {"likes": "like", "comments": "comment", "reposts": "repost"},
+            defaults=True,
+        ),
+    },
+    "comments": Each(".comments-comment-item", limit=5, item={
+        "author": Text(".comments-post-meta__name-text", required=True),
+        "text": Text(".comments-comment-item__main-content", required=True),
+    }),
+}
+
+SPECS = {
+    "company": COMPANY_SPEC,
+    "profile": PROFILE_SPEC,
+    "post": POST_SPEC,
+}
+
+
+def extract_page(page_type: str, html: str, timer: Optional[StageTimer] = None) -> dict:
+    """Extract a page of the given type from its HTML.
+
+    With a ``timer``, parsing and each top-level section of the spec are
+    timed as ``parse`` and ``extract.<section>``.
+    """
+    spec = SPECS.get(page_type)
+    if spec is None:
+        return {"error": "Invalid page type specified"}
+    try:
+        with stage(timer, "parse"):
+            node = parse_html(html)
+        result = {}
+        for key, field in spec.items():
+            with stage(timer, f"extract.{key}"):
+                section = extract({key: field}, node)
+            if section is None:
+                return {"error": f"Missing required section {key}"}
+            result.update(section)
+        return result
+    except Exception as e:
+        return {"error": str(e)}
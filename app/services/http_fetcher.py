@@ -0,0 +1,69 @@
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from app.core.config import settings
+from app.core.metrics import StageTimer, stage
+from app.services.extraction import extract_page
+from app.services.session_registry import block_reason
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"
+
+# Fields that must come back non-empty for static HTML to count as a full scrape
+REQUIRED_FIELDS = {
+    "company": [("page", "name"), ("page", "industry")],
+    "profile": [("user", "name"), ("user", "headline")],
+    "post": [("post", "author"), ("post", "content")],
+}
+
+_local = threading.local()
+
+
+def get_http_session() -> requests.Session:
+    """Keep-alive session for the current scrape worker thread"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.SCRAPER_HTTP_POOL)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        _local.session = session
+    return session
+
+
+def has_required_fields(page_type: str, data: dict) -> bool:
+    for section, field in REQUIRED_FIELDS.get(page_type, []):
+        if not data.get(section, {}).get(field):
+            return False
+    return True
+
+
+def fetch_static_page(url: str, page_type: str, cookie: str, timer: Optional[StageTimer] = None) -> Optional[dict]:
+    """Try to scrape ``url`` from its initial HTML, without a browser.
+
+    Returns the extracted data, or None when the browser is needed: the
+    request failed or was redirected to a login wall, or required fields
+    came back empty.
+    """
+    if page_type not in REQUIRED_FIELDS:
+        return None
+    try:
+        with stage(timer, "http_fetch"):
+            response = get_http_session().get(
+                url, cookies={"li_at": cookie}, timeout=settings.SCRAPER_HTTP_TIMEOUT
+            )
+    except requests.RequestException:
+        return None
+
+    if response.status_code != 200 or block_reason(response.url):
+        return None
+
+    data = extract_page(page_type, response.text, timer)
+    if "error" in data or not has_required_fields(page_type, data):
+        return None
+    return data
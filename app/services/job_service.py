@@ -0,0 +1,131 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.core.database import scrape_jobs_collection
+from app.models.scraper import ScrapeJob, ScrapeRequest
+from app.services.scraper_service import execute_scrape, save_scrape_log, scrape_executor
+
+TERMINAL_STATUSES = ("done", "failed")
+
+
+async def submit_job(request: ScrapeRequest) -> str:
+    """Queue a scrape and return its job ID"""
+    job = ScrapeJob(
+        request=request.model_dump(mode="json"),
+        status="queued",
+        created_at=datetime.now(),
+    )
+    result = await scrape_jobs_collection.insert_one(job.model_dump())
+    job_runner.notify()
+    return str(result.inserted_id)
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    job = await scrape_jobs_collection.find_one({"_id": ObjectId(job_id)})
+    if job:
+        job["_id"] = str(job["_id"])
+    return job
+
+
+async def claim_next_job(worker: str) -> Optional[dict]:
+    """Atomically take the oldest queued job (or a stalled running one)"""
+    now = datetime.now()
+    stalled = now - timedelta(seconds=settings.SCRAPE_JOB_TIMEOUT)
+    return await scrape_jobs_collection.find_one_and_update(
+        {"$or": [
+            {"status": "queued"},
+            {"status": "running", "started_at": {"$lt": stalled}},
+        ]},
+        {"$set": {"status": "running", "started_at": now, "worker": worker}, "$inc": {"attempts": 1}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def run_job(job: dict):
+    """Scrape a claimed job and record its log ID, status and error on it.
+
+    The scraped data is not copied onto the job; it lives in the page's
+    current version, as for every other scrape.
+    """
+    try:
+        # Jobs wait for a free scrape worker instead of being refused
+        scraper_log = await execute_scrape(ScrapeRequest(**job["request"]), wait=True)
+        log_id = await save_scrape_log(scraper_log)
+        update = {
+            "status": "done",
+            "log_id": log_id,
+            "result": {"status": scraper_log.status, "error_message": scraper_log.error_message},
+        }
+    except Exception as e:
+        update = {"status": "failed", "error_message": str(e)}
+    update["finished_at"] = datetime.now()
+    await scrape_jobs_collection.update_one({"_id": job["_id"]}, {"$set": update})
+
+
+class JobRunner:
+    """Claims queued scrape jobs from MongoDB and runs up to ``concurrency`` at once.
+
+    Several runners (the API process and any number of ``app.worker``
+    processes) can share the queue; claims are atomic.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._task = None
+        self._wake = None
+        self._running = set()
+
+    def notify(self):
+        """Wake the runner early when a job is submitted in this process"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+
+    async def _loop(self):
+        slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            await slots.acquire()
+            self._wake.clear()
+            try:
+                job = await claim_next_job(self.worker)
+            except Exception as e:
+                print(f"Job claim failed: {e}")
+                job = None
+
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(run_job(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+
+job_runner = JobRunner(scrape_executor.max_workers, settings.SCRAPE_JOB_POLL_INTERVAL)
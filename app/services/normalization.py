@@ -0,0 +1,259 @@
+"""Turn successful scrape logs into typed pages, posts and users.
+
+Scraped values are display strings ("1.2K likes", "3d • Edited"); here they
+are parsed into numbers and dates and upserted into the collections the
+CRUD routes and analytics queries read, keyed on their unique IDs.
+"""
+import hashlib
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+from urllib.parse import urlsplit
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.database import pages_collection, posts_collection, users_collection
+from app.models.page import PageCreate
+from app.models.post import PostCreate
+from app.models.user import UserCreate
+from app.services.analytics_service import record_post_changes, stored_posts
+from app.services.entity_cache import ENTITIES, entity_cache
+
+COUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kmb])?\b", re.IGNORECASE)
+MULTIPLIERS = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+AGE_RE = re.compile(r"^(\d+)\s*(mo|yr|y|w|d|h|m|s)\b", re.IGNORECASE)
+AGE_SECONDS = {
+    "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400,
+    "mo": 30 * 86400, "y": 365 * 86400, "yr": 365 * 86400,
+}
+
+ACTIVITY_RE = re.compile(r"activity[:-](\d+)")
+
+
+def parse_count(text) -> Optional[int]:
+    """Integer in a display count: "1.2K" -> 1200, "3,401 comments" -> 3401; None if there is none"""
+    if isinstance(text, int):
+        return text
+    match = COUNT_RE.search(text or "")
+    if match is None:
+        return None
+    number = float(match.group(1).replace(",", ""))
+    suffix = (match.group(2) or "").lower()
+    return int(round(number * MULTIPLIERS.get(suffix, 1)))
+
+
+def parse_age(text: str, now: datetime) -> Optional[datetime]:
+    """Absolute time for a relative LinkedIn timestamp such as "3d • Edited" """
+    match = AGE_RE.match((text or "").strip())
+    if match is None:
+        return None
+    return now - timedelta(seconds=int(match.group(1)) * AGE_SECONDS[match.group(2).lower()])
+
+
+def url_slug(url: str, marker: str) -> Optional[str]:
+    """Path segment after ``marker``, e.g. the company in /company/<slug>/about"""
+    parts = [p for p in urlsplit(str(url)).path.split("/") if p]
+    if marker in parts[:-1]:
+        return parts[parts.index(marker) + 1].lower()
+    return None
+
+
+def derive_post_id(page_id: str, urn: str = "", text: str = "") -> str:
+    """LinkedIn's activity URN when the page had one, else a hash of the post itself"""
+    if urn:
+        return urn
+    return hashlib.sha1(f"{page_id}\n{text}".encode()).hexdigest()[:24]
+
+
+def _with_scheme(url: str) -> Optional[str]:
+    if not url:
+        return None
+    return url if url.startswith(("http://", "https://")) else f"https://{url}"
+
+
+def _validated(model, fields: dict):
+    try:
+        return model.model_validate(fields)
+    except ValidationError as e:
+        print(f" Skipping {model.__name__}: {e.errors()[0]['msg']}")
+        return None
+
+
+def _post_document(post: PostCreate, stored: Optional[dict]) -> dict:
+    document = post.model_dump()
+    # Relative timestamps drift between scrapes, so the first one sticks
+    if stored is not None:
+        document["created_at"] = stored.get("created_at", document["created_at"])
+    return document
+
+
+def _post_operation(post: PostCreate) -> UpdateOne:
+    document = post.model_dump()
+    created_at = document.pop("created_at")
+    return UpdateOne(
+        {"post_id": post.post_id},
+        {"$set": document, "$setOnInsert": {"created_at": created_at}},
+        upsert=True,
+    )
+
+
+def _set_operation(key: str):
+    def operation(model) -> UpdateOne:
+        return UpdateOne({key: getattr(model, key)}, {"$set": model.model_dump(mode="json")}, upsert=True)
+    return operation
+
+
+def normalize_company(log: dict) -> dict:
+    """Page and posts of a company scrape"""
+    data = log.get("data") or {}
+    page = data.get("page") or {}
+    page_id = log.get("page_id") or url_slug(log["url"], "company")
+    found = {"pages": [], "posts": []}
+    if not page_id or not page.get("name"):
+        return found
+
+    created = _validated(PageCreate, {
+        "page_id": page_id,
+        "name": page["name"],
+        "url": log["url"],
+        "description": data.get("about") or None,
+        "website": _with_scheme(page.get("website")),
+        "industry": page.get("industry") or None,
+        "followers": parse_count(page.get("followers")),
+        # "1,001-5,000 employees": the lower bound of LinkedIn's size band
+        "head_count": parse_count(page.get("company_size")),
+        "specialities": [s for s in page.get("specialties") or [] if s] or None,
+    })
+    if created is not None:
+        found["pages"].append(created)
+
+    for item in data.get("recent_posts") or []:
+        engagement = item.get("engagement") or {}
+        post = _validated(PostCreate, {
+            "page_id": page_id,
+            "post_id": derive_post_id(page_id, item.get("urn", ""), item.get("text", "")),
+            "content": item.get("text") or None,
+            "likes": parse_count(engagement.get("likes")) or 0,
+            "comments_count": parse_count(engagement.get("comments")) or 0,
+            "shares": parse_count(engagement.get("reposts")) or 0,
+            "created_at": parse_age(item.get("timestamp"), log["scraped_at"]) or log["scraped_at"],
+        })
+        if post is not None:
+            found["posts"].append(post)
+    return found
+
+
+def normalize_post(log: dict) -> dict:
+    """The post of a single post scrape"""
+    post = (log.get("data") or {}).get("post") or {}
+    # /posts/<company>_<title>-activity-<id>
+    slug = url_slug(log["url"], "posts")
+    page_id = log.get("page_id") or (slug.split("_")[0] if slug else None)
+    if not page_id or not post.get("content"):
+        return {}
+
+    activity = ACTIVITY_RE.search(log["url"])
+    urn = f"urn:li:activity:{activity.group(1)}" if activity else ""
+    engagement = post.get("engagement") or {}
+    created = _validated(PostCreate, {
+        "page_id": page_id,
+        "post_id": derive_post_id(page_id, urn, post["content"]),
+        "content": post["content"],
+        "likes": parse_count(engagement.get("likes")) or 0,
+        "comments_count": parse_count(engagement.get("comments")) or 0,
+        "shares": parse_count(engagement.get("reposts")) or 0,
+        "created_at": parse_age(post.get("timestamp"), log["scraped_at"]) or log["scraped_at"],
+    })
+    return {"posts": [created]} if created is not None else {}
+
+
+def normalize_profile(log: dict) -> dict:
+    """The user of a profile scrape"""
+    data = log.get("data") or {}
+    user = data.get("user") or {}
+    linkedin_id = url_slug(log["url"], "in")
+    if not linkedin_id or not user.get("name"):
+        return {}
+
+    headline = user.get("headline") or ""
+    latest = (data.get("experience") or [{}])[0]
+    job_title, _, company = headline.partition(" at ")
+    created = _validated(UserCreate, {
+        "linkedin_id": linkedin_id,
+        "name": user["name"],
+        "profile_url": log["url"],
+        "job_title": latest.get("title") or job_title or None,
+        # "Acme Robotics · Full-time"
+        "company": (latest.get("company") or "").split(" · ")[0] or company or None,
+    })
+    return {"users": [created]} if created is not None else {}
+
+
+NORMALIZERS = {
+    "company": normalize_company,
+    "post": normalize_post,
+    "profile": normalize_profile,
+}
+
+# collection, upsert operation for a validated model
+TARGETS = {
+    "pages": (pages_collection, _set_operation("page_id")),
+    "posts": (posts_collection, _post_operation),
+    "users": (users_collection, _set_operation("linkedin_id")),
+}
+
+
+async def _write(name: str, models: list) -> int:
+    """Upsert one collection's models; returns how many documents changed"""
+    collection, operation = TARGETS[name]
+    if name == "posts":
+        # Unique by post_id, so each post's rollup delta is counted once
+        models = list({post.post_id: post for post in models}.values())
+        stored = await stored_posts([post.post_id for post in models])
+
+    failed = set()
+    try:
+        result = await collection.bulk_write([operation(model) for model in models], ordered=False)
+        changed = result.upserted_count + result.modified_count
+    except BulkWriteError as e:
+        failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        changed = e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+        print(f" {len(failed)} normalized {name} not written: {e.details['writeErrors'][0].get('errmsg')}")
+
+    await entity_cache.invalidate(name, [getattr(model, ENTITIES[name][0]) for model in models])
+    if name == "posts":
+        written = [post for index, post in enumerate(models) if index not in failed]
+        await record_post_changes(
+            [stored[post.post_id] for post in written if post.post_id in stored],
+            [_post_document(post, stored.get(post.post_id)) for post in written],
+        )
+    return changed
+
+
+async def normalize_scrapes(logs: List[dict]) -> dict:
+    """Upsert the pages, posts and users found in successful scrape logs.
+
+    One unordered bulk_write per collection covers the whole list. Failures
+    are printed, never raised: the raw logs are already stored.
+    """
+    models = {name: [] for name in TARGETS}
+    for log in logs:
+        normalizer = NORMALIZERS.get(log.get("type"))
+        if log.get("status") != "success" or normalizer is None:
+            continue
+        try:
+            for name, found in normalizer(log).items():
+                models[name].extend(found)
+        except Exception as e:
+            print(f" Could not normalize scrape of {log.get('url')}: {e}")
+
+    written = {}
+    for name, found in models.items():
+        if not found:
+            continue
+        try:
+            written[name] = await _write(name, found)
+        except Exception as e:
+            print(f" Normalized {name} not written: {e}")
+    return written
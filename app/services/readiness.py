@@ -0,0 +1,79 @@
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from app.core.config import settings
+
+# What "rendered" means for each page type: any of the selectors being in the
+# DOM, how long to wait for them, and how many feed posts to scroll for
+READINESS = {
+    "company": {
+        "selectors": [".org-top-card-summary__title", ".org-about-us-organization-description__text"],
+        "timeout": settings.READY_TIMEOUT_COMPANY,
+        "posts": 3,
+    },
+    "profile": {
+        "selectors": [".text-heading-xlarge"],
+        "timeout": settings.READY_TIMEOUT_PROFILE,
+        "posts": 0,
+    },
+    "post": {
+        "selectors": [".feed-shared-update-v2__description", ".feed-shared-actor__name"],
+        "timeout": settings.READY_TIMEOUT_POST,
+        "posts": 0,
+    },
+}
+
+POST_SELECTOR = "occludable-update"
+
+# Scroll one viewport and report how many feed posts are now in the DOM
+SCROLL_AND_COUNT = (
+    "window.scrollBy(0, window.innerHeight);"
+    "return document.getElementsByClassName(arguments[0]).length;"
+)
+
+
+def wait_until_ready(driver, page_type: str) -> bool:
+    """Wait until the page type's own content has rendered.
+
+    Returns False if it did not appear within the type's timeout, in which
+    case the caller extracts whatever is there.
+    """
+    spec = READINESS.get(page_type)
+    if spec is None:
+        return False
+
+    # One round trip per poll for all selectors at once
+    selector = ", ".join(spec["selectors"])
+    try:
+        WebDriverWait(driver, spec["timeout"], poll_frequency=0.2).until(
+            lambda d: d.execute_script("return document.querySelector(arguments[0]) !== null;", selector)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def scroll_for_posts(driver, page_type: str) -> int:
+    """Scroll in steps until enough feed posts are loaded or no new ones appear.
+
+    Returns the number of posts in the DOM when scrolling stopped.
+    """
+    spec = READINESS.get(page_type)
+    wanted = spec["posts"] if spec else 0
+    if not wanted:
+        return 0
+
+    deadline = time.monotonic() + settings.SCROLL_TIMEOUT
+    count = 0
+    stalled = 0
+    while time.monotonic() < deadline:
+        new_count = driver.execute_script(SCROLL_AND_COUNT, POST_SELECTOR) or 0
+        if new_count >= wanted:
+            return new_count
+        # Give lazy loading a couple of chances before concluding the feed is exhausted
+        stalled = stalled + 1 if new_count <= count else 0
+        if stalled >= 2:
+            return new_count
+        count = new_count
+        time.sleep(settings.SCROLL_PAUSE)
+    return count
@@ -0,0 +1,268 @@
+"""Periodic re-scrapes from the refresh_schedule collection.
+
+Due entries become scrape jobs, highest priority first, paced by a token
+bucket per domain and only while the job queue is short, so workers stay
+evenly busy instead of receiving bursts. Each entry's next due time is its
+interval from now, give or take SCHEDULER_JITTER, so pages added together
+drift apart rather than coming due together forever.
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.core.database import refresh_schedule_collection, scrape_jobs_collection
+from app.models.schedule import RefreshSchedule, RefreshScheduleCreate
+from app.models.scraper import ScrapeRequest
+from app.services.job_service import submit_job
+from app.services.scrape_cache import normalize_url
+
+# Dispatch lateness samples kept for the percentiles in stats()
+LATENESS_SAMPLES = 500
+
+
+class SystemClock:
+    """Wall clock; tests substitute one whose time they move by hand"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``"""
+
+    def __init__(self, rate: float, burst: int, clock):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock.now()
+
+    def _refill(self):
+        now = self.clock.now()
+        elapsed = (now - self.updated).total_seconds()
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self) -> bool:
+        if not self.available():
+            return False
+        self.tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """Seconds until the next token"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+def domain_of(url: str) -> str:
+    host = urlsplit(str(url)).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+async def _submit(entry: dict) -> str:
+    request = ScrapeRequest(url=entry["url"], type=entry["type"], page_id=entry.get("page_id"), force=True)
+    return await submit_job(request)
+
+
+class RefreshScheduler:
+    """Turns due refresh_schedule entries into scrape jobs.
+
+    ``clock`` supplies now() and sleep(), and ``dispatch`` receives each due
+    entry and returns a job ID; both are swappable so the pacing can be
+    tested without waiting or scraping.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, max_queue: int, jitter: float, poll_interval: float,
+                 retry_delay: float = 60, clock=None, dispatch: Optional[Callable[[dict], Awaitable[str]]] = None,
+                 rng=None):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_queue = max_queue
+        self.jitter = jitter
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.clock = clock or SystemClock()
+        self.dispatch = dispatch or _submit
+        self.random = rng or random.Random()
+        self._buckets = {}  # domain -> TokenBucket
+        self._task = None
+        self._wake = None
+        self._stats = {"dispatched": 0, "rate_limited": 0, "queue_full": 0, "failed": 0}
+        self._lateness = []  # seconds past next_due at dispatch, newest last
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        if domain not in self._buckets:
+            self._buckets[domain] = TokenBucket(self.rate, self.burst, self.clock)
+        return self._buckets[domain]
+
+    def next_due(self, interval: int, now: datetime) -> datetime:
+        spread = interval * self.jitter
+        return now + timedelta(seconds=interval + self.random.uniform(-spread, spread))
+
+    async def add(self, entry: RefreshScheduleCreate) -> dict:
+        """Create or update the schedule for a URL and type.
+
+        A new entry first comes due at a random point within its interval,
+        so a bulk import does not turn into a burst.
+        """
+        now = self.clock.now()
+        url_key = normalize_url(entry.url)
+        fields = entry.model_dump(mode="json")
+        first_due = now + timedelta(seconds=self.random.uniform(0, entry.interval))
+        schedule = RefreshSchedule(
+            **fields, url_key=url_key, domain=domain_of(entry.url), next_due=first_due, created_at=now
+        ).model_dump(mode="json", exclude={"next_due", "created_at", "last_dispatched", "last_job_id", "failures"})
+        document = await refresh_schedule_collection.find_one_and_update(
+            {"url_key": url_key, "type": entry.type},
+            {
+                "$set": schedule,
+                "$setOnInsert": {"next_due": first_due, "created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self.notify()
+        return document
+
+    async def _claim(self, now: datetime, skip_domains: list) -> Optional[dict]:
+        """Atomically take the most urgent due entry and move its next_due on.
+
+        The returned entry is the version from before the claim, so its
+        next_due can be put back if the entry is not dispatched after all.
+        """
+        query = {"enabled": True, "next_due": {"$lte": now}}
+        if skip_domains:
+            query["domain"] = {"$nin": skip_domains}
+        entry = await refresh_schedule_collection.find_one(query, sort=[("priority", -1), ("next_due", 1)])
+        if entry is None:
+            return None
+        # Conditional on next_due so that two schedulers never both take it
+        claimed = await refresh_schedule_collection.find_one_and_update(
+            {"_id": entry["_id"], "next_due": entry["next_due"]},
+            {"$set": {"next_due": self.next_due(entry["interval"], now)}},
+        )
+        return claimed
+
+    async def tick(self) -> int:
+        """Dispatch every entry that is due and allowed now; returns how many"""
+        dispatched = 0
+        skip_domains = [domain for domain, bucket in self._buckets.items() if not bucket.available()]
+        while True:
+            if await scrape_jobs_collection.count_documents({"status": "queued"}) >= self.max_queue:
+                self._stats["queue_full"] += 1
+                break
+            now = self.clock.now()
+            entry = await self._claim(now, skip_domains)
+            if entry is None:
+                break
+            bucket = self._bucket(entry["domain"])
+            if not bucket.take():
+                # Put it back; the next tick after a refill takes it
+                await refresh_schedule_collection.update_one(
+                    {"_id": entry["_id"]}, {"$set": {"next_due": entry["next_due"]}}
+                )
+                self._stats["rate_limited"] += 1
+                skip_domains.append(entry["domain"])
+                continue
+
+            try:
+                job_id = await self.dispatch(entry)
+            except Exception as e:
+                print(f"Scheduled refresh of {entry['url']} failed to dispatch: {e}")
+                self._stats["failed"] += 1
+                # Retry well before the next interval, but not within this tick
+                failures = entry.get("failures", 0) + 1
+                delay = min(self.retry_delay * 2 ** (failures - 1), entry["interval"])
+                await refresh_schedule_collection.update_one(
+                    {"_id": entry["_id"]},
+                    {"$set": {"next_due": now + timedelta(seconds=delay), "failures": failures}},
+                )
+                continue
+            await refresh_schedule_collection.update_one(
+                {"_id": entry["_id"]}, {"$set": {"last_job_id": job_id, "last_dispatched": now, "failures": 0}}
+            )
+            self._stats["dispatched"] += 1
+            self._lateness.append((now - entry["next_due"]).total_seconds())
+            del self._lateness[:-LATENESS_SAMPLES]
+            dispatched += 1
+            if not bucket.available():
+                skip_domains.append(entry["domain"])
+        return dispatched
+
+    def _idle_time(self) -> float:
+        waits = [bucket.wait_time() for bucket in self._buckets.values() if not bucket.available()]
+        return max(min(waits + [self.poll_interval]), 0.05)
+
+    def notify(self):
+        """Wake the scheduler early, e.g. after an entry was added"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            self._wake.clear()
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Refresh scheduler tick failed: {e}")
+            sleeper = asyncio.ensure_future(self.clock.sleep(self._idle_time()))
+            waker = asyncio.ensure_future(self._wake.wait())
+            await asyncio.wait([sleeper, waker], return_when=asyncio.FIRST_COMPLETED)
+            sleeper.cancel()
+            waker.cancel()
+
+    async def stats(self) -> dict:
+        now = self.clock.now()
+        due = {"enabled": True, "next_due": {"$lte": now}}
+        oldest = await refresh_schedule_collection.find_one(due, {"next_due": 1}, sort=[("next_due", 1)])
+        lateness = sorted(self._lateness)
+
+        def percentile(p):
+            return lateness[min(int(p * len(lateness)), len(lateness) - 1)] if lateness else 0.0
+
+        return {
+            **self._stats,
+            "entries": await refresh_schedule_collection.count_documents({"enabled": True}),
+            "backlog": await refresh_schedule_collection.count_documents(due),
+            "max_lateness": (now - oldest["next_due"]).total_seconds() if oldest else 0.0,
+            "dispatch_lateness_p50": percentile(0.5),
+            "dispatch_lateness_p95": percentile(0.95),
+            "queued_jobs": await scrape_jobs_collection.count_documents({"status": "queued"}),
+            "max_queue": self.max_queue,
+            "rate_per_minute": self.rate * 60,
+            "tokens": {domain: round(bucket.tokens, 2) for domain, bucket in self._buckets.items()},
+        }
+
+
+refresh_scheduler = RefreshScheduler(
+    settings.SCHEDULER_RATE_PER_MINUTE,
+    settings.SCHEDULER_BURST,
+    settings.SCHEDULER_MAX_QUEUE,
+    settings.SCHEDULER_JITTER,
+    settings.SCHEDULER_POLL_INTERVAL,
+    settings.SCHEDULER_RETRY_DELAY,
+)
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.core.database import scrape_current_collection
+from app.models.scraper import ScrapeRequest
+from app.services.single_flight import SingleFlight
+
+
+def normalize_url(url: str) -> str:
+    """Cache key form of a LinkedIn URL: no scheme, www, query, fragment or trailing slash"""
+    parts = urlsplit(str(url).strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def default_max_age(page_type: str) -> int:
+    """Configured freshness window, in seconds, for a page type"""
+    return settings.SCRAPE_CACHE_TTL.get(page_type, settings.SCRAPE_CACHE_TTL["default"])
+
+
+class ScrapeCache:
+    """Serves recent successful scrapes instead of launching new ones.
+
+    Looks in an in-process LRU first, then at the page's current version in
+    scrape_current_collection. Concurrent requests for the same URL and type share
+    one scrape.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (url_key, type) -> response dict
+        self._inflight = SingleFlight()  # keyed by (url_key, type)
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "coalesced": 0}
+
+    def _remember(self, key, response: dict):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _lookup_memory(self, key, max_age: int) -> Optional[dict]:
+        response = self._entries.get(key)
+        if response is None:
+            return None
+        if response["scraped_at"] < datetime.now() - timedelta(seconds=max_age):
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def _lookup_db(self, key, max_age: int) -> Optional[dict]:
+        current = await scrape_current_collection.find_one({
+            "url_key": key[0],
+            "type": key[1],
+            "last_seen": {"$gte": datetime.now() - timedelta(seconds=max_age)},
+        })
+        if current is None:
+            return None
+        return {
+            "status": "success",
+            "message": f"Successfully scraped {key[1]} page",
+            "log_id": current["log_id"],
+            "tier": current.get("tier"),
+            "scraped_at": current["last_seen"],
+            "changed": False,
+            "version": current["version"],
+            "data": current["data"],
+        }
+
+    async def get_or_scrape(self, request: ScrapeRequest, scrape) -> dict:
+        """Return a fresh-enough cached response, or the result of ``await scrape(request)``.
+
+        ``scrape`` must return a response dict; only ``status == "success"``
+        results with a ``scraped_at`` are cached.
+        """
+        key = (normalize_url(request.url), request.type)
+        max_age = request.max_age if request.max_age is not None else default_max_age(request.type)
+
+        if not request.force and max_age > 0:
+            cached = self._lookup_memory(key, max_age)
+            if cached is not None:
+                self._stats["memory_hits"] += 1
+                return {**cached, "cached": True}
+            cached = await self._lookup_db(key, max_age)
+            if cached is not None:
+                self._stats["db_hits"] += 1
+                self._remember(key, cached)
+                return {**cached, "cached": True}
+
+        # Piggyback on an identical scrape that is already running
+        self._stats["coalesced" if key in self._inflight else "misses"] += 1
+        flight = await self._inflight.do(key, lambda: scrape(request))
+        response = flight.result
+        if flight.shared:
+            return {**response, "cached": True}
+
+        if response.get("status") == "success" and response.get("scraped_at"):
+            self._remember(key, response)
+        return {**response, "cached": False}
+
+    def stats(self) -> dict:
+        lookups = sum(self._stats.values())
+        hits = self._stats["memory_hits"] + self._stats["db_hits"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "ttl": settings.SCRAPE_CACHE_TTL,
+        }
+
+
+scrape_cache = ScrapeCache(settings.SCRAPE_CACHE_MAX_ENTRIES)
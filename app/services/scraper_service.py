@@ -0,0 +1,324 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from typing import List
+from bson import ObjectId
+from app.core.config import settings
+from app.core.database import scraper_collection
+from app.core.metrics import SCRAPE_STAGE_SECONDS, StageTimer, observe_scrape
+from app.models.scraper import ScrapeRequest, ScraperLog
+from app.services.driver_pool import driver_pool
+from app.services.extraction import extract_page
+from app.services.http_fetcher import fetch_static_page
+from app.services.change_tracking import record_version
+from app.services.normalization import normalize_scrapes
+from app.services.scrape_cache import normalize_url
+from app.services.series_service import record_series
+from app.services.session_registry import NoSessionAvailable, SessionBlockedError, block_reason, session_registry
+from app.services.readiness import scroll_for_posts, wait_until_ready
+
+
+class ScraperBusyError(Exception):
+    """Raised when every scrape worker is busy and the wait queue is full"""
+
+
+class ScrapeExecutor:
+    """Runs blocking Selenium scrapes on a dedicated worker pool.
+
+    At most ``max_workers`` scrapes run at once and at most ``max_queue`` more
+    may wait for a worker; anything beyond that is refused straight away so the
+    event loop (and every other route) never stalls behind the browser.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_queue: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._slots = None
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="scraper"
+                )
+        return self._executor
+
+    def _get_slots(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._slots
+
+    async def run(self, fn, *args, wait: bool = False):
+        """Run ``fn(*args)`` on a worker.
+
+        Raises ScraperBusyError when the queue is full, unless ``wait`` is set,
+        in which case the caller waits for a free slot instead.
+        """
+        slots = self._get_slots()
+        if slots.locked() and not wait:
+            self._rejected += 1
+            raise ScraperBusyError("Scraper queue is full, try again later")
+
+        await slots.acquire()
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker is done, not until the caller stops
+        # waiting: a cancelled caller leaves its scrape running in the browser
+        future.add_done_callback(lambda _: self._finished(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self._in_flight -= 1
+        self._slots.release()
+
+    def _finished(self, loop):
+        # Runs on the worker's thread; the counters belong to the event loop
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # The loop is closed, and its slots with it
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(self._in_flight, self.max_workers),
+            "queued": max(self._in_flight - self.max_workers, 0),
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+scrape_executor = ScrapeExecutor(
+    settings.SCRAPER_EXECUTOR, settings.SCRAPER_MAX_WORKERS, settings.SCRAPER_MAX_QUEUE
+)
+
+
+def scrape_page(url: str, page_type: str, cookie: str) -> dict:
+    """Blocking scrape of a single LinkedIn page; runs on a scrape worker.
+
+    Returns the extracted ``data``, the ``tier`` that served it and the
+    seconds spent in each stage as ``timings``.
+    """
+    timer = StageTimer()
+
+    # Static HTML is often enough, and far cheaper than a browser
+    if settings.SCRAPER_HTTP_FIRST:
+        data = fetch_static_page(url, page_type, cookie, timer)
+        if data is not None:
+            return {"data": data, "tier": "http", "timings": timer.timings}
+
+    # Lease a warm browser that already carries the session cookie
+    with driver_pool.lease(cookie, timer) as driver:
+        with timer.stage("navigate"):
+            driver.get(url)
+        reason = block_reason(driver.current_url)
+        if reason:
+            raise SessionBlockedError(reason)
+
+        # Wait for the page type's own content rather than a fixed delay,
+        # then scroll only as far as needed to load the posts we extract
+        with timer.stage("wait"):
+            wait_until_ready(driver, page_type)
+        with timer.stage("scroll"):
+            scroll_for_posts(driver, page_type)
+
+        with timer.stage("page_source"):
+            html = driver.page_source
+        data = extract_page(page_type, html, timer)
+        return {"data": data, "tier": "browser", "timings": timer.timings}
+
+
+def warm_driver_pool():
+    """Pre-launch the pooled browsers with the first session cookie attached"""
+    cookie = session_registry.first_cookie()
+    if not cookie:
+        return
+    try:
+        driver_pool.warm(cookie)
+        print(f"Driver pool warmed with {driver_pool.size} browsers")
+    except Exception as e:
+        print(f"Driver pool warm-up failed: {e}")
+
+
+async def execute_scrape(request: ScrapeRequest, wait: bool = False) -> ScraperLog:
+    """Scrape ``request`` on the worker pool and return the resulting log.
+
+    Scrape failures are recorded on the log rather than raised; only
+    ScraperBusyError escapes, when the pool cannot take more work. A scrape
+    whose session is blocked is retried on another session.
+    """
+    # Create a scraper log entry - convert HttpUrl to string
+    scraper_log = ScraperLog(
+        page_id=request.page_id,
+        url=str(request.url),  # Convert HttpUrl to string
+        url_key=normalize_url(request.url),
+        scraped_at=datetime.now(),
+        status="pending",
+        message="Scraping in progress",
+        type=request.type  # Store the page type
+    )
+
+    for _ in range(settings.SESSION_MAX_ATTEMPTS):
+        try:
+            session = session_registry.acquire()
+        except NoSessionAvailable as e:
+            scraper_log.status = "failed"
+            if scraper_log.session:
+                # An earlier attempt was blocked; that is the cause worth keeping
+                scraper_log.error_message = f"{scraper_log.error_message}. {e}"
+            else:
+                scraper_log.message = "No LinkedIn session available"
+                scraper_log.error_message = str(e)
+            return scraper_log
+        scraper_log.session = session.id
+
+        try:
+            result = await scrape_executor.run(
+                scrape_page, str(request.url), request.type, session.cookie, wait=wait
+            )
+        except ScraperBusyError:
+            raise
+        except SessionBlockedError as e:
+            session_registry.report_blocked(session, e.reason)
+            scraper_log.status = "failed"
+            scraper_log.message = "LinkedIn session blocked"
+            scraper_log.error_message = f"Session {session.label} was sent to a {e.reason} page"
+            continue
+        except Exception as e:
+            session_registry.report_failure(session)
+            # Update scraper log with error information
+            scraper_log.status = "failed"
+            scraper_log.message = "Exception during scraping"
+            scraper_log.error_message = str(e)
+            return scraper_log
+        break
+    else:
+        return scraper_log
+
+    data = result["data"]
+    scraper_log.tier = result["tier"]
+    scraper_log.timings = result["timings"]
+
+    # Update the scraper log with results
+    if "error" in data:
+        scraper_log.status = "failed"
+        scraper_log.message = "Failed to scrape page completely"
+        scraper_log.error_message = data["error"]
+        del data["error"]  # Remove error from data before storing
+    else:
+        scraper_log.status = "success"
+        scraper_log.message = f"Successfully scraped {request.type} page"
+    session_registry.report_success(session)
+    observe_scrape(scraper_log.timings, request.type, scraper_log.tier, scraper_log.status)
+
+    # Include the type in the data for better filtering
+    data["page_type"] = request.type
+    scraper_log.data = data
+    return scraper_log
+
+
+async def save_scrape_log(scraper_log: ScraperLog) -> str:
+    """Store a scraper log in MongoDB and return its ID"""
+    document = await versioned_log_document(scraper_log)
+    start = time.perf_counter()
+    result = await scraper_collection.insert_one(document)
+    observe_persist(document, time.perf_counter() - start)
+    print(f"MongoDB insertion result: {result.acknowledged}, ID: {result.inserted_id}")
+
+    if not result.acknowledged:
+        raise Exception("MongoDB did not acknowledge the insertion")
+    return str(result.inserted_id)
+
+
+def new_log_document(scraper_log: ScraperLog) -> dict:
+    """MongoDB document for a log, with its ID assigned before insertion"""
+    document = scraper_log.dict()
+    document["_id"] = ObjectId()
+    return document
+
+
+async def versioned_log_document(scraper_log: ScraperLog) -> dict:
+    """The log document to store for a scrape.
+
+    Logs are lean: status, timings and errors, never the scraped data.
+    Successful scrapes add their metrics to the page's series and go
+    through change tracking, and their log keeps only the hash and version,
+    the data itself living in the page's current document and diffs.
+    Changed data is normalized; unchanged data is not, and its log points
+    at the log that first stored it with ``same_as``.
+    """
+    document = new_log_document(scraper_log)
+    if scraper_log.status != "success":
+        # Whatever a failed scrape got is partial at best
+        document.pop("data", None)
+        return document
+
+    timer = StageTimer()
+    with timer.stage("series"):
+        await record_series(document)
+    try:
+        with timer.stage("track"):
+            version = await record_version(document)
+    except Exception as e:
+        # Keep the full log rather than lose the scrape
+        print(f" Change tracking failed for {scraper_log.url}: {e}")
+        return document
+
+    scraper_log.data_hash = version["hash"]
+    scraper_log.version = version["version"]
+    scraper_log.changed = version["changed"]
+    if not version["changed"]:
+        scraper_log.same_as = version["log_id"]
+    if version["changed"] and settings.SCRAPE_NORMALIZE:
+        with timer.stage("normalize"):
+            await normalize_scrapes([document])
+    observe_stages(timer.timings, document)
+    scraper_log.timings = {**(scraper_log.timings or {}), **timer.timings}
+
+    document.pop("data", None)
+    document.update(
+        data_hash=scraper_log.data_hash, version=scraper_log.version, changed=scraper_log.changed,
+        same_as=scraper_log.same_as, timings=scraper_log.timings,
+    )
+    return document
+
+
+def observe_stages(timings: dict, document: dict):
+    for name, seconds in timings.items():
+        SCRAPE_STAGE_SECONDS.labels(name, document["type"], document.get("tier") or "none").observe(seconds)
+
+
+def observe_persist(document: dict, seconds: float):
+    """Insert time is only known once the log is stored, so it goes to /metrics alone"""
+    observe_stages({"persist": seconds}, document)
+
+
+async def save_scrape_logs(documents: List[dict]):
+    """Store a chunk of log documents with a single insert_many"""
+    start = time.perf_counter()
+    result = await scraper_collection.insert_many(documents, ordered=False)
+    # Each log is charged its share of the insert
+    share = (time.perf_counter() - start) / len(documents)
+    for document in documents:
+        observe_persist(document, share)
+    if not result.acknowledged:
+        raise Exception("MongoDB did not acknowledge the insertion")
+
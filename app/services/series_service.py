@@ -0,0 +1,150 @@
+"""Metrics over time: follower counts, connections and post engagement per scrape.
+
+Every successful scrape, changed or not, adds one measurement to the
+``scrape_series`` time-series collection (``meta`` holds the page, so
+MongoDB buckets measurements per page and time) and folds it into that
+page's ``scrape_series_daily`` rollup. Raw measurements expire after
+SERIES_RETENTION_DAYS; the daily rollups are the downsampled history that
+outlives them. A page's series is a range scan on either.
+"""
+from datetime import datetime
+from typing import List, Optional
+from app.core.pagination import date_range
+from app.core.database import analytics_reads, scrape_series_collection, scrape_series_daily_collection
+from app.services.analytics_service import day_of
+from app.services.normalization import parse_count
+
+# Metrics recorded per scrape type: name -> path into the scraped data
+METRICS = {
+    "company": {"followers": ("page", "followers"), "head_count": ("page", "company_size")},
+    "profile": {"connections": ("user", "connections")},
+    "post": {
+        "likes": ("post", "engagement", "likes"),
+        "comments": ("post", "engagement", "comments"),
+        "reposts": ("post", "engagement", "reposts"),
+    },
+}
+
+# Bucket sizes a series can be read at, with the $dateToString format that buckets it
+INTERVALS = {"raw": None, "hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+
+def series_metrics(page_type: str, data: Optional[dict]) -> dict:
+    """The metrics of ``page_type`` found in scraped ``data``, parsed into numbers"""
+    metrics = {}
+    for name, path in METRICS.get(page_type, {}).items():
+        value = data or {}
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        number = parse_count(value) if value is not None else None
+        if number is not None:
+            metrics[name] = number
+    return metrics
+
+
+async def record_series(document: dict):
+    """Add a successful scrape's metrics to its page's series; never raises"""
+    metrics = series_metrics(document["type"], document.get("data"))
+    if not metrics:
+        return
+    scraped_at = document["scraped_at"]
+    try:
+        await scrape_series_collection.insert_one({
+            "scraped_at": scraped_at,
+            "meta": {"url_key": document["url_key"], "type": document["type"], "page_id": document.get("page_id")},
+            **metrics,
+        })
+        await scrape_series_daily_collection.update_one(
+            {"url_key": document["url_key"], "type": document["type"], "day": day_of(scraped_at)},
+            {
+                "$set": {
+                    "page_id": document.get("page_id"),
+                    "last_at": scraped_at,
+                    **{f"{name}.last": value for name, value in metrics.items()},
+                },
+                "$min": {f"{name}.min": value for name, value in metrics.items()},
+                "$max": {f"{name}.max": value for name, value in metrics.items()},
+                "$inc": {
+                    "samples": 1,
+                    **{f"{name}.sum": value for name, value in metrics.items()},
+                    **{f"{name}.count": 1 for name in metrics},
+                },
+            },
+            upsert=True,
+        )
+    except Exception as e:
+        # The series is derived data; the scrape itself is already recorded
+        print(f" Series not recorded for {document['url']}: {e}")
+
+
+def _bucket(at: datetime, low, high, total, count, last) -> dict:
+    return {"at": at, "min": low, "max": high, "avg": total / count if count else None, "last": last, "samples": count}
+
+
+async def _raw_series(url_key, page_type, metric, since, until, interval) -> List[dict]:
+    match = {
+        "meta.url_key": url_key, "meta.type": page_type,
+        metric: {"$ne": None}, **date_range("scraped_at", since, until),
+    }
+    collection = analytics_reads(scrape_series_collection)
+    if interval == "raw":
+        cursor = collection.find(match, {"_id": 0, "scraped_at": 1, metric: 1}).sort("scraped_at", 1)
+        return [{"at": point["scraped_at"], "value": point[metric]} async for point in cursor]
+
+    fmt = INTERVALS[interval]
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"scraped_at": 1}},
+        {"$group": {
+            "_id": {"$dateToString": {"format": fmt, "date": "$scraped_at"}},
+            "min": {"$min": f"${metric}"},
+            "max": {"$max": f"${metric}"},
+            "sum": {"$sum": f"${metric}"},
+            "count": {"$sum": 1},
+            "last": {"$last": f"${metric}"},
+        }},
+        {"$sort": {"_id": 1}},
+    ]
+    return [
+        _bucket(datetime.strptime(g["_id"], fmt), g["min"], g["max"], g["sum"], g["count"], g["last"])
+        async for g in collection.aggregate(pipeline)
+    ]
+
+
+async def _daily_series(url_key, page_type, metric, since, until, interval) -> List[dict]:
+    match = {
+        "url_key": url_key, "type": page_type,
+        f"{metric}.count": {"$gt": 0}, **date_range("day", day_of(since) if since else None, until),
+    }
+    cursor = analytics_reads(scrape_series_daily_collection).find(match, {"_id": 0, "day": 1, metric: 1}).sort("day", 1)
+    buckets = []
+    async for day in cursor:
+        stats = day[metric]
+        at = day["day"] if interval == "day" else day["day"].replace(day=1)
+        if buckets and buckets[-1]["at"] == at:
+            # Months merge their days here rather than in a second pipeline
+            bucket = buckets[-1]
+            total = bucket["avg"] * bucket["samples"] + stats["sum"]
+            bucket["samples"] += stats["count"]
+            bucket.update(
+                min=min(bucket["min"], stats["min"]), max=max(bucket["max"], stats["max"]),
+                avg=total / bucket["samples"], last=stats["last"],
+            )
+        else:
+            buckets.append(_bucket(at, stats["min"], stats["max"], stats["sum"], stats["count"], stats["last"]))
+    return buckets
+
+
+async def metric_series(
+    url_key: str, page_type: str, metric: str, since: Optional[datetime] = None,
+    until: Optional[datetime] = None, interval: str = "raw",
+) -> List[dict]:
+    """``metric`` of one page in scrape order, as raw points or per-interval buckets.
+
+    Raw points and hourly buckets come from the raw measurements, so they
+    reach back SERIES_RETENTION_DAYS; daily and monthly buckets come from
+    the rollups and reach back SERIES_DAILY_RETENTION_DAYS.
+    """
+    if interval in ("raw", "hour"):
+        return await _raw_series(url_key, page_type, metric, since, until, interval)
+    return await _daily_series(url_key, page_type, metric, since, until, interval)
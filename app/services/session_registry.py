@@ -0,0 +1,192 @@
+"""LinkedIn session cookies shared out to scrapes.
+
+Cookies come from LI_AT / LI_AT_COOKIES and the linkedin_sessions
+collection. Each scrape borrows one, round-robin or least recently used.
+A scrape that lands on a login or checkpoint page benches its session for
+an exponentially growing cooldown and is retried on another one.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import List, Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.core.database import linkedin_sessions_collection
+
+# Where LinkedIn sends a session it will not serve (leading path segments), and what that means
+BLOCK_MARKERS = (
+    (("checkpoint",), "checkpoint"),
+    (("authwall",), "expired"),
+    (("uas", "login"), "expired"),
+    (("login",), "expired"),
+)
+
+
+class SessionBlockedError(Exception):
+    """Raised by a scrape whose session was sent to a login or checkpoint page"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class NoSessionAvailable(Exception):
+    """Raised when every session is benched; ``retry_after`` is in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Every LinkedIn session is cooling down, try again later")
+        self.retry_after = retry_after
+
+
+def block_reason(url: str) -> Optional[str]:
+    """"expired" or "checkpoint" when ``url`` is one of LinkedIn's login walls.
+
+    Only the start of the path counts, so /company/loginradius/ is a page,
+    not a login wall.
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    for marker, reason in BLOCK_MARKERS:
+        if tuple(segments[:len(marker)]) == marker:
+            return reason
+    return None
+
+
+def session_id(cookie: str) -> str:
+    """Stable, non-secret name for a cookie"""
+    return hashlib.sha1(cookie.encode()).hexdigest()[:10]
+
+
+class Session:
+    """One li_at cookie and its health counters"""
+
+    def __init__(self, cookie: str, label: str, source: str):
+        self.id = session_id(cookie)
+        self.cookie = cookie
+        self.label = label
+        self.source = source  # "config" or "database"
+        self.uses = 0
+        self.successes = 0
+        self.failures = 0
+        self.blocks = 0
+        self.consecutive_blocks = 0
+        self.benched_until: Optional[datetime] = None
+        self.last_used: Optional[datetime] = None
+        self.last_block_reason: Optional[str] = None
+
+    def available(self, now: datetime) -> bool:
+        return self.benched_until is None or self.benched_until <= now
+
+    def stats(self, now: datetime) -> dict:
+        finished = self.successes + self.failures + self.blocks
+        return {
+            "id": self.id,
+            "label": self.label,
+            "source": self.source,
+            "available": self.available(now),
+            "uses": self.uses,
+            "successes": self.successes,
+            "failures": self.failures,
+            "blocks": self.blocks,
+            "success_rate": self.successes / finished if finished else None,
+            "last_used": self.last_used,
+            "last_block_reason": self.last_block_reason,
+            "benched_until": self.benched_until,
+            "cooldown_remaining": max((self.benched_until - now).total_seconds(), 0) if self.benched_until else 0,
+        }
+
+
+class SessionRegistry:
+    """Hands out session cookies and keeps per-session health.
+
+    Lives on the event loop of one process; worker processes only ever see
+    the cookie string they were given.
+    """
+
+    def __init__(self, strategy: str, backoff_base: float, backoff_max: float):
+        self.strategy = strategy  # "round_robin" or "lru"
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sessions = {}  # id -> Session, in insertion order
+        self._next = 0
+
+    def add(self, cookie: str, label: str = "", source: str = "config") -> Session:
+        existing = self._sessions.get(session_id(cookie))
+        if existing is not None:
+            return existing
+        session = Session(cookie, label or f"session-{len(self._sessions) + 1}", source)
+        self._sessions[session.id] = session
+        return session
+
+    def remove(self, sid: str) -> bool:
+        return self._sessions.pop(sid, None) is not None
+
+    def has_sessions(self) -> bool:
+        return bool(self._sessions)
+
+    async def load(self):
+        """Register the configured cookies and the enabled ones stored in MongoDB"""
+        for cookie in settings.LI_AT_COOKIES:
+            self.add(cookie, source="config")
+        try:
+            async for document in linkedin_sessions_collection.find({"enabled": {"$ne": False}}):
+                self.add(document["cookie"], document.get("label", ""), source="database")
+        except Exception as e:
+            print(f"Could not load LinkedIn sessions from MongoDB: {e}")
+        print(f"{len(self._sessions)} LinkedIn session(s) registered")
+
+    def retry_after(self) -> Optional[int]:
+        """Seconds until a session is free again, or None if one is free now"""
+        now = datetime.now()
+        sessions = list(self._sessions.values())
+        if any(s.available(now) for s in sessions):
+            return None
+        if not sessions:
+            return 60
+        soonest = min(s.benched_until for s in sessions)
+        return max(int((soonest - now).total_seconds()) + 1, 1)
+
+    def first_cookie(self) -> Optional[str]:
+        for session in self._sessions.values():
+            return session.cookie
+        return None
+
+    def acquire(self) -> Session:
+        """Pick a session for one scrape; raises NoSessionAvailable if all are benched"""
+        now = datetime.now()
+        available = [s for s in self._sessions.values() if s.available(now)]
+        if not available:
+            raise NoSessionAvailable(self.retry_after())
+
+        if self.strategy == "lru":
+            session = min(available, key=lambda s: s.last_used or datetime.min)
+        else:
+            session = available[self._next % len(available)]
+            self._next += 1
+        session.uses += 1
+        session.last_used = now
+        return session
+
+    def report_success(self, session: Session):
+        session.successes += 1
+        session.consecutive_blocks = 0
+
+    def report_failure(self, session: Session):
+        """A scrape failed for a reason that says nothing about the session"""
+        session.failures += 1
+
+    def report_blocked(self, session: Session, reason: str):
+        """Bench ``session`` for backoff_base * 2^(n-1) seconds after its n-th block in a row"""
+        session.blocks += 1
+        session.consecutive_blocks += 1
+        session.last_block_reason = reason
+        cooldown = min(self.backoff_base * 2 ** (session.consecutive_blocks - 1), self.backoff_max)
+        session.benched_until = datetime.now() + timedelta(seconds=cooldown)
+        print(f"LinkedIn session {session.label} benched for {cooldown:.0f}s: {reason}")
+
+    def stats(self) -> List[dict]:
+        now = datetime.now()
+        return [session.stats(now) for session in self._sessions.values()]
+
+
+session_registry = SessionRegistry(
+    settings.SESSION_STRATEGY, settings.SESSION_BACKOFF_BASE, settings.SESSION_BACKOFF_MAX
+)
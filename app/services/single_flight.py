@@ -0,0 +1,62 @@
+"""One load per key at a time, shared by every caller that asks meanwhile.
+
+Used by the scrape and entity caches so concurrent misses for the same
+page or entity cost one scrape or query.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Iterable, NamedTuple
+
+
+class Flight(NamedTuple):
+    result: Any
+    shared: bool  # Came from a load another caller started
+    overtaken: bool  # The key was invalidated while this caller's load ran
+
+
+class SingleFlight:
+    """In-flight loads by key.
+
+    Each load runs in its own task, so cancelling the caller that started it
+    (a client gone, a batch cancelled) leaves it running for the others.
+    """
+
+    def __init__(self):
+        self._tasks = {}  # key -> asyncio.Task of (result, overtaken)
+        self._overtaken = set()  # keys invalidated since their load began
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def _run(self, key: Hashable, load: Callable[[], Awaitable[Any]]):
+        try:
+            result = await load()
+            return result, key in self._overtaken
+        finally:
+            self._tasks.pop(key, None)
+            self._overtaken.discard(key)
+
+    @staticmethod
+    def _retrieve(task: asyncio.Task):
+        # Mark the exception retrieved so a load nobody waits for any more does not warn
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Flight:
+        """``await load()``, or the result of the load already running for ``key``"""
+        task = self._tasks.get(key)
+        if task is not None:
+            result, _ = await asyncio.shield(task)
+            return Flight(result, True, False)
+
+        task = asyncio.get_running_loop().create_task(self._run(key, load))
+        task.add_done_callback(self._retrieve)
+        self._tasks[key] = task
+        result, overtaken = await asyncio.shield(task)
+        return Flight(result, False, overtaken)
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        """Mark the running loads of ``keys`` as overtaken, so they are not cached"""
+        self._overtaken.update(key for key in keys if key in self._tasks)
@@ -0,0 +1,41 @@
+"""Standalone scrape worker: takes queued jobs from the scrape_jobs collection.
+
+Run alongside (or instead of) the API's inline runner, with
+SCRAPE_JOBS_INLINE=false on the API so that only workers scrape:
+
+    python -m app.worker
+"""
+import asyncio
+from app.core.config import settings
+from app.core.database import check_mongo_connection, close_mongo_connection
+from app.core.indexes import ensure_series_collection
+from app.services.driver_pool import driver_pool, resolve_chromedriver
+from app.services.job_service import job_runner
+from app.services.scraper_service import scrape_executor, warm_driver_pool
+from app.services.session_registry import session_registry
+
+
+async def main():
+    await check_mongo_connection()
+    await ensure_series_collection()
+    await session_registry.load()
+    print(f"Using chromedriver at {resolve_chromedriver()}")
+    if settings.DRIVER_POOL_WARM and settings.SCRAPER_EXECUTOR == "thread":
+        await asyncio.to_thread(warm_driver_pool)
+
+    job_runner.start()
+    print(f"Scrape worker {job_runner.worker} waiting for jobs")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_runner.stop()
+        scrape_executor.shutdown()
+        driver_pool.close()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,81 @@
+"""Benchmark: chromedriver resolution and cold vs warm browser acquisition.
+
+"before" resolves chromedriver and launches a fresh Chrome with the cookie
+round trip for every scrape, as the scrape handler used to. "after" resolves
+once and leases from the warm driver pool. Needs Chrome installed locally;
+the target URL defaults to a page that does not require a session.
+
+    python benchmarks/driver_startup.py --runs 5 --url https://example.com
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.chrome.service import Service  # noqa: E402
+from webdriver_manager.chrome import ChromeDriverManager  # noqa: E402
+
+from app.services.driver_pool import (  # noqa: E402
+    LINKEDIN_HOME,
+    DriverPool,
+    build_chrome_options,
+    launch_driver,
+    resolve_chromedriver,
+)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def report(label, values):
+    print(f"{label:34} median={statistics.median(values):9.1f}ms  max={max(values):9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", default="https://example.com")
+    parser.add_argument("--cookie", default=os.getenv("LI_AT", "benchmark"))
+    args = parser.parse_args()
+
+    report("resolve: ChromeDriverManager()", [
+        timed(lambda: ChromeDriverManager().install()) for _ in range(args.runs)
+    ])
+    resolve_chromedriver()
+    report("resolve: cached path", [timed(resolve_chromedriver) for _ in range(args.runs)])
+
+    def cold_scrape():
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=build_chrome_options())
+        try:
+            driver.get(LINKEDIN_HOME)
+            driver.add_cookie({"name": "li_at", "value": args.cookie, "domain": ".linkedin.com"})
+            driver.get(args.url)
+        finally:
+            driver.quit()
+
+    report("scrape: cold (before)", [timed(cold_scrape) for _ in range(args.runs)])
+
+    pool = DriverPool(launch_driver, size=1, max_uses=args.runs + 1, lease_timeout=60, max_heap_mb=512)
+    first = timed(lambda: pool.warm(args.cookie))
+
+    def warm_scrape():
+        with pool.lease(args.cookie) as driver:
+            driver.get(args.url)
+
+    try:
+        report("scrape: warm pool (after)", [timed(warm_scrape) for _ in range(args.runs)])
+        print(f"{'pool warm-up (paid once)':34} {first:9.1f}ms")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
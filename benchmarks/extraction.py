@@ -0,0 +1,88 @@
+"""Benchmark: per-element WebDriver extraction vs single-pass page_source parsing.
+
+By default both strategies run against FakeWebDriver, which adds ``--rtt``
+per WebDriver call (local chromedriver round trips are typically 1-5 ms).
+With ``--chrome`` the fixtures are loaded into real headless Chrome instead.
+
+    python benchmarks/extraction.py --runs 20 --rtt 0.002
+    python benchmarks/extraction.py --runs 5 --chrome
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from app.services.extraction import extract_page  # noqa: E402
+from fake_webdriver import FakeWebDriver  # noqa: E402
+import legacy_extraction  # noqa: E402
+
+FIXTURES = os.path.join(HERE, "fixtures")
+LEGACY = {
+    "company": legacy_extraction.scrape_company_page,
+    "profile": legacy_extraction.scrape_profile_page,
+    "post": legacy_extraction.scrape_post_page,
+}
+
+
+def fixture_path(page_type):
+    return os.path.join(FIXTURES, f"{page_type}.html")
+
+
+def time_runs(fn, runs):
+    values = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - start) * 1000)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--rtt", type=float, default=0.002, help="seconds per fake WebDriver call")
+    parser.add_argument("--chrome", action="store_true", help="use real headless Chrome")
+    args = parser.parse_args()
+
+    if args.chrome:
+        from app.services.driver_pool import launch_driver
+        driver = launch_driver()
+    else:
+        driver = FakeWebDriver(rtt=args.rtt)
+
+    try:
+        for page_type, legacy in LEGACY.items():
+            path = fixture_path(page_type)
+            if args.chrome:
+                driver.get(f"file://{path}")
+            else:
+                with open(path) as f:
+                    driver.default_html = f.read()
+                driver.get(path)
+
+            calls_before = getattr(driver, "round_trips", 0)
+            legacy_ms = time_runs(lambda: legacy(driver), args.runs)
+            legacy_calls = (getattr(driver, "round_trips", 0) - calls_before) // args.runs
+
+            calls_before = getattr(driver, "round_trips", 0)
+            single_ms = time_runs(lambda: extract_page(page_type, driver.page_source), args.runs)
+            single_calls = (getattr(driver, "round_trips", 0) - calls_before) // args.runs
+
+            legacy_median = statistics.median(legacy_ms)
+            single_median = statistics.median(single_ms)
+            print(
+                f"{page_type:8} per-element: {legacy_median:8.2f}ms ({legacy_calls} calls)  "
+                f"single-pass: {single_median:8.2f}ms ({single_calls} calls)  "
+                f"speedup x{legacy_median / single_median:.1f}"
+            )
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""A stand-in for Selenium's Chrome driver that serves stored HTML.
+
+It implements only the WebDriver calls the scraper makes. Every call counts
+as one round trip and can sleep ``rtt`` seconds to model the chromedriver
+HTTP hop. That lets the benchmarks compare extraction strategies without a
+browser or a LinkedIn session.
+"""
+import time
+
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+
+def _class_xpath(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def to_xpath(by, value):
+    if by == By.XPATH:
+        return value
+    if by == By.CLASS_NAME:
+        return f".//*[{_class_xpath(value)}]"
+    if by == By.ID:
+        return f".//*[@id='{value}']"
+    if by == By.TAG_NAME:
+        return f".//{value}"
+    if by == By.CSS_SELECTOR:
+        # Only descendant chains of class selectors, which is all the scraper uses
+        steps = [f"//*[{_class_xpath(part.lstrip('.'))}]" for part in value.split()]
+        return "." + "".join(steps)
+    raise ValueError(f"Unsupported locator: {by}")
+
+
+class FakeElement:
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self):
+        self._driver._round_trip()
+        return " ".join(self._node.text_content().split())
+
+    def find_element(self, by, value):
+        return self._driver._find(self._node, by, value, many=False)
+
+    def find_elements(self, by, value):
+        return self._driver._find(self._node, by, value, many=True)
+
+
+class FakeWebDriver:
+    """Serves ``pages[url]`` (or ``default_html``) for every ``get``"""
+
+    def __init__(self, pages=None, default_html="<html><body></body></html>", rtt=0.0):
+        self.pages = pages or {}
+        self.default_html = default_html
+        self.rtt = rtt
+        self.round_trips = 0
+        self.current_url = "about:blank"
+        self.cookies = {}
+        self._html = default_html
+        self._tree = None
+        self._soup = None
+        self._scrolled = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def _document(self):
+        if self._tree is None:
+            self._tree = lxml_html.fromstring(self._html)
+        return self._tree
+
+    def _find(self, node, by, value, many):
+        self._round_trip()
+        matches = node.xpath(to_xpath(by, value))
+        if many:
+            return [FakeElement(self, match) for match in matches]
+        if not matches:
+            raise NoSuchElementException(f"{by}={value}")
+        return FakeElement(self, matches[0])
+
+    def get(self, url):
+        self._round_trip()
+        self.current_url = url
+        self._html = self.pages.get(url, self.default_html)
+        self._tree = None
+        self._soup = None
+        self._scrolled = 0
+
+    @property
+    def page_source(self):
+        self._round_trip()
+        return self._html
+
+    def add_cookie(self, cookie):
+        self._round_trip()
+        self.cookies[cookie["name"]] = cookie["value"]
+
+    def delete_cookie(self, name):
+        self._round_trip()
+        self.cookies.pop(name, None)
+
+    def delete_all_cookies(self):
+        self._round_trip()
+        self.cookies.clear()
+
+    def execute_script(self, script, *args):
+        self._round_trip()
+        if "usedJSHeapSize" in script:
+            return 0
+        if "querySelector" in script:
+            if self._soup is None:
+                self._soup = BeautifulSoup(self._html, "lxml")
+            return self._soup.select_one(args[0]) is not None
+        if "getElementsByClassName" in script:
+            # Pretend lazy loading reveals a few more posts per scroll
+            self._scrolled += 1
+            total = len(self._document().xpath(to_xpath(By.CLASS_NAME, args[0])))
+            return min(total, self._scrolled * 2)
+        return None
+
+    def find_element(self, by, value):
+        return self._find(self._document(), by, value, many=False)
+
+    def find_elements(self, by, value):
+        return self._find(self._document(), by, value, many=True)
+
+    def quit(self):
+        pass
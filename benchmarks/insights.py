@@ -0,0 +1,105 @@
+"""Benchmark: page insights from daily rollups vs aggregating the page's posts.
+
+Seeds ``--posts`` posts for one page into a scratch database on MONGO_URI
+(dropped afterwards unless --keep) and builds their rollups. It then times
+both sources of GET /api/pages/{page_id}/insights and checks that they agree.
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/insights.py --posts 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import ASCENDING, DESCENDING, MongoClient  # noqa: E402
+
+from app.services.analytics_service import METRICS, daily_pipeline, rollup_from_group, window_start  # noqa: E402
+
+PAGE_ID = "benchmark-page"
+
+
+def seed(database, count):
+    posts = database["posts"]
+    posts.drop()
+    database["post_daily_rollups"].drop()
+    now = datetime.now()
+    batch = []
+    for i in range(count):
+        batch.append({
+            "post_id": f"post-{i:09d}",
+            "page_id": PAGE_ID,
+            "likes": random.randint(0, 5000),
+            "comments_count": random.randint(0, 300),
+            "shares": random.randint(0, 100),
+            "created_at": now - timedelta(seconds=random.randint(0, 365 * 86400)),
+        })
+        if len(batch) == 10_000:
+            posts.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        posts.insert_many(batch, ordered=False)
+    posts.create_index([("post_id", ASCENDING)], unique=True)
+    posts.create_index([("page_id", ASCENDING), ("created_at", DESCENDING), ("post_id", DESCENDING)])
+
+    rollups = [rollup_from_group(g) for g in posts.aggregate(daily_pipeline({}))]
+    database["post_daily_rollups"].insert_many(rollups)
+    database["post_daily_rollups"].create_index([("page_id", ASCENDING), ("day", ASCENDING)], unique=True)
+
+
+def totals(daily):
+    return {field: sum(day[field] for day in daily) for field in ("posts",) + METRICS}
+
+
+def timed(fn, repeat):
+    values = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        values.append((time.perf_counter() - start) * 1000)
+    return statistics.median(values), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database")
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    database = client["insights_benchmark"]
+    if database["posts"].estimated_document_count() != args.posts:
+        print(f"seeding {args.posts} posts...")
+        seed(database, args.posts)
+
+    try:
+        for days in (7, 30, 90, 365):
+            since = window_start(days)
+
+            def from_rollups():
+                rollups = database["post_daily_rollups"].find({"page_id": PAGE_ID, "day": {"$gte": since}}).sort("day", 1)
+                return totals(list(rollups))
+
+            def from_posts():
+                groups = database["posts"].aggregate(daily_pipeline({"page_id": PAGE_ID, "created_at": {"$gte": since}}))
+                return totals([rollup_from_group(g) for g in groups])
+
+            rollup_ms, rollup_totals = timed(from_rollups, args.repeat)
+            posts_ms, posts_totals = timed(from_posts, args.repeat)
+            print(
+                f"{days:>3} days ({posts_totals['posts']:>7,} posts): rollups {rollup_ms:8.2f}ms   "
+                f"aggregation {posts_ms:8.2f}ms   identical={rollup_totals == posts_totals}"
+            )
+    finally:
+        if not args.keep:
+            client.drop_database(database.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
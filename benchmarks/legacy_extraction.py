@@ -0,0 +1,245 @@
+"""Pre-refactor extractors, kept verbatim as the baseline for benchmarks.
+
+These issue one WebDriver round trip per find_element/find_elements call and
+per ``.text`` read. Nothing in the service imports them.
+"""
+from selenium.webdriver.common.by import By
+
+
+def scrape_company_page(driver):
+    """Extract data from a LinkedIn company page"""
+    data = {
+        "page": {
+            "name": "",
+            "industry": "",
+            "website": "",
+            "company_size": "",
+            "headquarters": "",
+            "founded": "",
+            "specialties": []
+        },
+        "about": "",
+        "recent_posts": []
+    }
+
+    try:
+        # Company name
+        try:
+            name_element = driver.find_element(By.CLASS_NAME, "org-top-card-summary__title")
+            data["page"]["name"] = name_element.text.strip()
+        except:
+            pass
+
+        # Industry and other company info
+        try:
+            info_items = driver.find_elements(By.CLASS_NAME, "org-top-card-summary-info-list__info-item")
+            if info_items:
+                data["page"]["industry"] = info_items[0].text.strip()
+
+            # More detailed company information
+            details = driver.find_elements(By.CLASS_NAME, "org-about-company-module__about-us-item")
+            for detail in details:
+                label = detail.find_element(By.CLASS_NAME, "org-about-company-module__about-us-label").text.strip().lower()
+                value = detail.find_element(By.CLASS_NAME, "org-about-company-module__about-us-text").text.strip()
+
+                if "website" in label:
+                    data["page"]["website"] = value
+                elif "size" in label:
+                    data["page"]["company_size"] = value
+                elif "headquarters" in label:
+                    data["page"]["headquarters"] = value
+                elif "founded" in label:
+                    data["page"]["founded"] = value
+                elif "specialties" in label:
+                    data["page"]["specialties"] = [s.strip() for s in value.split(",")]
+        except:
+            pass
+
+        # About section
+        try:
+            about_section = driver.find_element(By.CLASS_NAME, "org-about-us-organization-description__text")
+            data["about"] = about_section.text.strip()
+        except:
+            pass
+
+        # Recent posts
+        try:
+            posts = driver.find_elements(By.CLASS_NAME, "occludable-update")
+            for i, post in enumerate(posts[:3]):  # Get first 3 posts
+                try:
+                    post_data = {
+                        "text": post.find_element(By.CLASS_NAME, "feed-shared-update-v2__description").text.strip(),
+                        "engagement": {}
+                    }
+
+                    # Try to get engagement metrics
+                    try:
+                        metrics = post.find_elements(By.CLASS_NAME, "social-details-social-counts__item")
+                        for metric in metrics:
+                            count_text = metric.text.strip().lower()
+                            if "like" in count_text:
+                                post_data["engagement"]["likes"] = count_text
+                            elif "comment" in count_text:
+                                post_data["engagement"]["comments"] = count_text
+                    except:
+                        pass
+
+                    data["recent_posts"].append(post_data)
+                except:
+                    continue
+        except:
+            pass
+
+    except Exception as e:
+        data["error"] = str(e)
+
+    return data
+
+def scrape_profile_page(driver):
+    """Extract data from a LinkedIn user profile page"""
+    data = {
+        "user": {
+            "name": "",
+            "headline": "",
+            "location": "",
+            "connections": "",
+            "about": ""
+        },
+        "experience": [],
+        "education": []
+    }
+
+    try:
+        # Basic profile information
+        try:
+            data["user"]["name"] = driver.find_element(By.CLASS_NAME, "text-heading-xlarge").text.strip()
+            data["user"]["headline"] = driver.find_element(By.CLASS_NAME, "text-body-medium").text.strip()
+
+            location_element = driver.find_element(By.CSS_SELECTOR, ".pv-text-details__left-panel .text-body-small")
+            data["user"]["location"] = location_element.text.strip()
+
+            connections_element = driver.find_element(By.CSS_SELECTOR, ".pv-text-details__right-panel .text-body-small")
+            data["user"]["connections"] = connections_element.text.strip()
+        except:
+            pass
+
+        # About section
+        try:
+            about_section = driver.find_element(By.ID, "about")
+            about_text = about_section.find_element(By.XPATH, "./following-sibling::div[1]//span")
+            data["user"]["about"] = about_text.text.strip()
+        except:
+            pass
+
+        # Experience section
+        try:
+            experience_section = driver.find_element(By.ID, "experience")
+            experience_items = experience_section.find_elements(By.XPATH, "./following-sibling::div[1]//li")
+
+            for item in experience_items:
+                try:
+                    exp = {
+                        "title": item.find_element(By.CLASS_NAME, "t-bold").text.strip(),
+                        "company": item.find_element(By.CLASS_NAME, "t-normal").text.strip(),
+                        "duration": item.find_elements(By.CLASS_NAME, "t-normal")[1].text.strip() if len(item.find_elements(By.CLASS_NAME, "t-normal")) > 1 else ""
+                    }
+                    data["experience"].append(exp)
+                except:
+                    continue
+        except:
+            pass
+
+        # Education section
+        try:
+            education_section = driver.find_element(By.ID, "education")
+            education_items = education_section.find_elements(By.XPATH, "./following-sibling::div[1]//li")
+
+            for item in education_items:
+                try:
+                    edu = {
+                        "school": item.find_element(By.CLASS_NAME, "t-bold").text.strip(),
+                        "degree": item.find_element(By.CLASS_NAME, "t-normal").text.strip() if item.find_elements(By.CLASS_NAME, "t-normal") else "",
+                        "years": item.find_elements(By.CLASS_NAME, "t-normal")[1].text.strip() if len(item.find_elements(By.CLASS_NAME, "t-normal")) > 1 else ""
+                    }
+                    data["education"].append(edu)
+                except:
+                    continue
+        except:
+            pass
+
+    except Exception as e:
+        data["error"] = str(e)
+
+    return data
+
+def scrape_post_page(driver):
+    """Extract data from a LinkedIn post page"""
+    data = {
+        "post": {
+            "author": "",
+            "author_headline": "",
+            "content": "",
+            "timestamp": "",
+            "engagement": {
+                "likes": "",
+                "comments": "",
+                "reposts": ""
+            }
+        },
+        "comments": []
+    }
+
+    try:
+        # Post author
+        try:
+            author_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__name")
+            data["post"]["author"] = author_element.text.strip()
+
+            headline_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__description")
+            data["post"]["author_headline"] = headline_element.text.strip()
+
+            timestamp_element = driver.find_element(By.CLASS_NAME, "feed-shared-actor__sub-description")
+            data["post"]["timestamp"] = timestamp_element.text.strip()
+        except:
+            pass
+
+        # Post content
+        try:
+            content_element = driver.find_element(By.CLASS_NAME, "feed-shared-update-v2__description")
+            data["post"]["content"] = content_element.text.strip()
+        except:
+            pass
+
+        # Engagement metrics
+        try:
+            metrics = driver.find_elements(By.CLASS_NAME, "social-details-social-counts__item")
+            for metric in metrics:
+                count_text = metric.text.strip().lower()
+                if "like" in count_text:
+                    data["post"]["engagement"]["likes"] = count_text
+                elif "comment" in count_text:
+                    data["post"]["engagement"]["comments"] = count_text
+                elif "repost" in count_text:
+                    data["post"]["engagement"]["reposts"] = count_text
+        except:
+            pass
+
+        # Comments
+        try:
+            comments = driver.find_elements(By.CLASS_NAME, "comments-comment-item")
+            for i, comment in enumerate(comments[:5]):  # Get first 5 comments
+                try:
+                    comment_data = {
+                        "author": comment.find_element(By.CLASS_NAME, "comments-post-meta__name-text").text.strip(),
+                        "text": comment.find_element(By.CLASS_NAME, "comments-comment-item__main-content").text.strip()
+                    }
+                    data["comments"].append(comment_data)
+                except:
+                    continue
+        except:
+            pass
+
+    except Exception as e:
+        data["error"] = str(e)
+
+    return data
@@ -0,0 +1,70 @@
+"""Load test: read-endpoint latency while scrapes are running.
+
+Fires ``--scrapes`` concurrent POST /api/scraper/scrape calls against a running
+server and, while they are in flight, hammers the read endpoints and reports
+their latency percentiles.
+
+    python benchmarks/load_read_latency.py --base-url http://localhost:8000 --scrapes 4
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+READ_PATHS = ["/api/posts/", "/api/scraper/logs", "/api/scraper/executor"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scrapes", type=int, default=4)
+    parser.add_argument("--url", default="https://www.linkedin.com/company/microsoft")
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+
+    scrape_status = []
+
+    def scrape():
+        response = requests.post(
+            f"{args.base_url}/api/scraper/scrape",
+            json={"url": args.url, "type": "company"},
+            timeout=300,
+        )
+        scrape_status.append(response.status_code)
+
+    scrapers = [threading.Thread(target=scrape) for _ in range(args.scrapes)]
+    for thread in scrapers:
+        thread.start()
+    time.sleep(0.5)
+
+    session = requests.Session()
+    latencies = {path: [] for path in READ_PATHS}
+    for i in range(args.reads):
+        path = READ_PATHS[i % len(READ_PATHS)]
+        start = time.perf_counter()
+        session.get(f"{args.base_url}{path}", timeout=30)
+        latencies[path].append((time.perf_counter() - start) * 1000)
+
+    for thread in scrapers:
+        thread.join()
+
+    print(f"scrapes: {args.scrapes} -> status codes {sorted(scrape_status)}")
+    for path, values in latencies.items():
+        print(
+            f"{path:28} n={len(values):4} "
+            f"p50={statistics.median(values):7.2f}ms "
+            f"p99={percentile(values, 99):7.2f}ms "
+            f"max={max(values):7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark: skip/limit vs keyset cursor pagination on a large posts collection.
+
+Seeds ``--docs`` posts into a scratch database on MONGO_URI (dropped
+afterwards unless --keep). It then times fetching one page at increasing
+depths with both strategies, using the same sort and indexes as
+GET /api/posts/.
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/pagination.py --docs 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import ASCENDING, DESCENDING, MongoClient  # noqa: E402
+
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter  # noqa: E402
+
+SORT = [("created_at", DESCENDING), ("post_id", DESCENDING)]
+
+
+def seed(collection, count):
+    collection.drop()
+    base = datetime(2020, 1, 1)
+    batch = []
+    for i in range(count):
+        batch.append({
+            "post_id": f"post-{i:09d}",
+            "page_id": f"page-{i % 500}",
+            "content": "x" * 200,
+            "likes": i % 1000,
+            "comments_count": i % 50,
+            "shares": i % 20,
+            "created_at": base + timedelta(seconds=i // 3),
+        })
+        if len(batch) == 10_000:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+    collection.create_index([("post_id", ASCENDING)], unique=True)
+    collection.create_index(SORT)
+
+
+def timed(fn, repeat):
+    values = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - start) * 1000)
+    return statistics.median(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database")
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    database = client["pagination_benchmark"]
+    collection = database["posts"]
+    if collection.estimated_document_count() != args.docs:
+        print(f"seeding {args.docs} posts...")
+        seed(collection, args.docs)
+
+    try:
+        depths = [0, 1_000, 10_000, 100_000, args.docs // 2, args.docs - args.limit]
+        for depth in sorted({d for d in depths if 0 <= d < args.docs}):
+            # The cursor a client would hold after paging down to ``depth``
+            cursor = None
+            if depth:
+                previous = collection.find({}, {"created_at": 1, "post_id": 1}).sort(SORT).skip(depth - 1).limit(1).next()
+                cursor = encode_cursor([previous["created_at"], previous["post_id"]])
+
+            def by_skip():
+                list(collection.find().sort(SORT).skip(depth).limit(args.limit))
+
+            def by_cursor():
+                query = keyset_filter(SORT, decode_cursor(cursor)) if cursor else {}
+                list(collection.find(query).sort(SORT).limit(args.limit))
+
+            print(
+                f"depth {depth:>10,}: skip/limit {timed(by_skip, args.repeat):8.2f}ms   "
+                f"cursor {timed(by_cursor, args.repeat):8.2f}ms"
+            )
+    finally:
+        if not args.keep:
+            client.drop_database(database.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""Benchmark: offline scrape latency, throughput and memory, saved as JSON.
+
+Serves the recorded company, profile and post pages in ``fixtures/`` from a
+local HTTP server and scrapes them without LinkedIn or a session:
+
+- scrape_page: app.services.scraper_service.scrape_page on a thread pool,
+               as the scrape workers run it
+- api:         POST /api/scraper/scrape in-process (httpx ASGITransport),
+               including the executor, change tracking, series and log writes
+
+Both run for each page type, tier and concurrency level. The ``http`` tier
+fetches the page with requests; the ``browser`` tier loads it in
+FakeWebDriver (``--rtt`` seconds per WebDriver call), or in real headless
+Chrome with ``--chrome``. Chrome still visits linkedin.com once per browser
+to set the cookie, so that mode needs network access.
+
+Every request uses a page URL of its own, so neither the scrape cache nor
+in-flight coalescing answers it. MongoDB is mongomock (pip install
+mongomock-motor) unless ``--mongo-uri`` is given; the app's database is
+written to, so point that at a scratch server.
+
+Results go to ``--output`` (by default benchmarks/results/scrape-<commit>.json);
+``--compare`` prints the change from an earlier results file.
+
+    python benchmarks/scrape_suite.py --concurrency 1,4 --requests 20
+    python benchmarks/scrape_suite.py --compare benchmarks/results/scrape-abc1234.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from fake_webdriver import FakeWebDriver  # noqa: E402
+
+FIXTURES = os.path.join(HERE, "fixtures")
+PAGE_TYPES = ("company", "profile", "post")
+
+# URL of the i-th page of each type; the server serves the fixture by the first path segment
+URL_PATTERNS = {
+    "company": "/company/acme-robotics-{i}/",
+    "profile": "/in/jane-doe-{i}/",
+    "post": "/posts/acme-robotics_launch-activity-{activity}/",
+}
+FIXTURE_BY_SEGMENT = {"company": "company", "in": "profile", "posts": "post"}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as LinkedIn serves it
+    # Headers and body go out as separate writes; Nagle would hold the body for a delayed ACK
+    disable_nagle_algorithm = True
+    pages = {}
+
+    def do_GET(self):
+        segment = self.path.lstrip("/").split("/", 1)[0]
+        body = self.pages.get(FIXTURE_BY_SEGMENT.get(segment))
+        if body is None:
+            body = b"<html><body></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    for page_type in PAGE_TYPES:
+        with open(os.path.join(FIXTURES, f"{page_type}.html"), "rb") as f:
+            FixtureHandler.pages[page_type] = f.read()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class ServedWebDriver(FakeWebDriver):
+    """FakeWebDriver that loads pages from the fixture server, as a browser would"""
+
+    def __init__(self, base_url, rtt=0.0):
+        super().__init__(rtt=rtt)
+        self.base_url = base_url
+
+    def get(self, url):
+        super().get(url)
+        if url.startswith(self.base_url):
+            with urllib.request.urlopen(url) as response:
+                self._html = response.read().decode()
+
+
+class PageUrls:
+    """A new page URL of each type on every call, safe to share between threads"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def next(self, page_type):
+        with self._lock:
+            self._count += 1
+            i = self._count
+        path = URL_PATTERNS[page_type].format(i=i, activity=7100000000000000000 + i)
+        return self.base_url + path
+
+
+def configure(args):
+    """Settings the app reads at import time; anything already in the environment wins"""
+    workers = str(max(args.concurrency))
+    for name, value in {
+        "MONGO_URI": args.mongo_uri or "mongodb://localhost:27017",
+        "LI_AT": "benchmark",
+        "SCRAPER_EXECUTOR": "thread",
+        "SCRAPER_MAX_WORKERS": workers,
+        "SCRAPER_MAX_QUEUE": workers,
+        "DRIVER_POOL_SIZE": workers,
+        "DRIVER_POOL_WARM": "false",
+        "SCHEDULER_ENABLED": "false",
+    }.items():
+        os.environ.setdefault(name, value)
+    if not args.mongo_uri:
+        use_mongomock()
+
+
+def use_mongomock():
+    try:
+        import mongomock.collection
+        import mongomock_motor
+        import motor.motor_asyncio
+    except ImportError:
+        sys.exit("Without --mongo-uri this benchmark needs mongomock-motor (pip install mongomock-motor)")
+    motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+    # mongomock predates the sort argument pymongo passes for bulk update_one
+    add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    mongomock.collection.BulkOperationBuilder.add_update = add_update_without_sort
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process, plus that of reaped child processes"""
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return round(own, 1), round(children, 1)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(scenario, page_type, tier, concurrency, latencies, errors, wall, stages=None):
+    result = {
+        "scenario": scenario,
+        "type": page_type,
+        "tier": tier,
+        "concurrency": concurrency,
+        "requests": len(latencies) + errors,
+        "ok": len(latencies),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {},
+    }
+    if latencies:
+        result["latency_ms"] = {
+            **{f"p{pct}": round(percentile(latencies, pct), 2) for pct in PERCENTILES},
+            "mean": round(statistics.mean(latencies), 2),
+            "max": round(max(latencies), 2),
+        }
+    if stages:
+        result["stage_median_ms"] = {name: round(statistics.median(values) * 1000, 2) for name, values in stages.items()}
+    result["peak_rss_mb"], result["peak_rss_children_mb"] = peak_rss_mb()
+    return result
+
+
+def run_scrape_page(urls, page_type, tier, concurrency, requests, warmup):
+    from app.services.scraper_service import scrape_page
+
+    def one(_):
+        start = time.perf_counter()
+        result = scrape_page(urls.next(page_type), page_type, "benchmark")
+        return (time.perf_counter() - start) * 1000, result
+
+    latencies, stages, errors = [], defaultdict(list), 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(warmup)))
+        start = time.perf_counter()
+        futures = [pool.submit(one, i) for i in range(requests)]
+        for future in futures:
+            try:
+                ms, result = future.result()
+            except Exception as e:
+                errors += 1
+                print(f" scrape_page {page_type} failed: {e}")
+                continue
+            if "error" in result["data"] or result["tier"] != tier:
+                errors += 1
+                continue
+            latencies.append(ms)
+            for name, seconds in result["timings"].items():
+                stages[name].append(seconds)
+        wall = time.perf_counter() - start
+    return summarize("scrape_page", page_type, tier, concurrency, latencies, errors, wall, stages)
+
+
+async def run_api(client, urls, page_type, tier, concurrency, requests, warmup):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/scraper/scrape", json={"url": urls.next(page_type), "type": page_type, "force": True}
+            )
+            return (time.perf_counter() - start) * 1000, response
+
+    await asyncio.gather(*[one() for _ in range(warmup)])
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one() for _ in range(requests)], return_exceptions=True)
+    wall = time.perf_counter() - start
+
+    latencies, errors = [], 0
+    for result in results:
+        if isinstance(result, Exception):
+            errors += 1
+            print(f" API scrape of a {page_type} page failed: {result}")
+            continue
+        ms, response = result
+        body = response.json()
+        if response.status_code != 200 or body.get("status") != "success" or body.get("tier") != tier:
+            errors += 1
+            continue
+        latencies.append(ms)
+    return summarize("api", page_type, tier, concurrency, latencies, errors, wall)
+
+
+async def run_api_suite(args, urls, set_tier):
+    import httpx
+    from app.core.database import check_mongo_connection, close_mongo_connection
+    from app.core.indexes import ensure_indexes
+    from app.main import app
+    from app.services.session_registry import session_registry
+
+    # The parts of the app's startup a scrape needs; no scheduler, job runner or warm-up
+    await check_mongo_connection()
+    await ensure_indexes()
+    await session_registry.load()
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300) as client:
+            for tier in args.tiers:
+                set_tier(tier)
+                for page_type in args.types:
+                    for concurrency in args.concurrency:
+                        result = await run_api(client, urls, page_type, tier, concurrency, args.requests, args.warmup)
+                        report(result)
+                        results.append(result)
+    finally:
+        await close_mongo_connection()
+    return results
+
+
+def report(result):
+    latency = result["latency_ms"]
+    print(
+        f"{result['scenario']:<12} {result['type']:<8} {result['tier']:<8} c={result['concurrency']:<3} "
+        f"ok={result['ok']:<4} err={result['errors']:<3} "
+        f"p50={latency.get('p50', 0):8.1f}ms p95={latency.get('p95', 0):8.1f}ms p99={latency.get('p99', 0):8.1f}ms "
+        f"{result['throughput_rps']:7.1f}/s  rss={result['peak_rss_mb']:.0f}MB"
+    )
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path, results):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(result):
+        return result["scenario"], result["type"], result["tier"], result["concurrency"]
+
+    before = {key(result): result for result in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit') or baseline_path}:")
+    for result in results:
+        old = before.get(key(result))
+        if old is None or not old["latency_ms"] or not result["latency_ms"]:
+            continue
+        changes = []
+        for metric in ("p50", "p95"):
+            was, now = old["latency_ms"][metric], result["latency_ms"][metric]
+            changes.append(f"{metric} {was:.1f}->{now:.1f}ms ({(now - was) / was * 100:+.0f}%)")
+        was, now = old["throughput_rps"], result["throughput_rps"]
+        if was:
+            changes.append(f"throughput {was:.1f}->{now:.1f}/s ({(now - was) / was * 100:+.0f}%)")
+        print(f"{' '.join(map(str, key(result))):<34} {'  '.join(changes)}")
+
+
+def csv_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=csv_list, default=["scrape_page", "api"])
+    parser.add_argument("--types", type=csv_list, default=list(PAGE_TYPES))
+    parser.add_argument("--tiers", type=csv_list, default=["http", "browser"])
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in csv_list(v)], default=[1, 4])
+    parser.add_argument("--requests", type=int, default=20, help="timed scrapes per type, tier and concurrency")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed scrapes before each run")
+    parser.add_argument("--rtt", type=float, default=0.002, help="seconds per fake WebDriver call")
+    parser.add_argument("--chrome", action="store_true", help="use real headless Chrome for the browser tier")
+    parser.add_argument("--mongo-uri", help="MongoDB to write to instead of mongomock")
+    parser.add_argument("--output", help="results file (default benchmarks/results/scrape-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    configure(args)
+    from app.core.config import settings
+    from app.services.driver_pool import driver_pool, launch_driver
+    from app.services.scraper_service import scrape_executor
+
+    server, base_url = start_fixture_server()
+    urls = PageUrls(base_url)
+    driver_pool.factory = launch_driver if args.chrome else (lambda: ServedWebDriver(base_url, rtt=args.rtt))
+
+    def set_tier(tier):
+        # The browser tier is what runs when the plain HTTP fetch is skipped or falls short
+        settings.SCRAPER_HTTP_FIRST = tier == "http"
+
+    results = []
+    try:
+        if "scrape_page" in args.scenarios:
+            for tier in args.tiers:
+                set_tier(tier)
+                for page_type in args.types:
+                    for concurrency in args.concurrency:
+                        result = run_scrape_page(urls, page_type, tier, concurrency, args.requests, args.warmup)
+                        report(result)
+                        results.append(result)
+        if "api" in args.scenarios:
+            results.extend(asyncio.run(run_api_suite(args, urls, set_tier)))
+    finally:
+        scrape_executor.shutdown()
+        driver_pool.close()
+        server.shutdown()
+
+    commit = git_commit()
+    output = args.output or os.path.join(HERE, "results", f"scrape-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                "driver": "chrome" if args.chrome else "fake",
+                "rtt": args.rtt,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "mongo": "external" if args.mongo_uri else "mongomock",
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
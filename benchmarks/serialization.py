@@ -0,0 +1,109 @@
+"""Benchmark: encoding list responses of raw MongoDB documents.
+
+Builds ``--docs`` scraper-log-shaped documents (ObjectId, datetimes, nested
+scraped data) and times three ways of turning ``{"logs": [...]}`` into a
+response body:
+
+- loop:        stringify each ``_id`` in Python, then FastAPI's
+               jsonable_encoder and JSONResponse, as the routes used to
+- to_jsonable: copy through app.core.serialization.to_jsonable, then json.dumps
+- bson:        BSONResponse, which hands the documents straight to orjson
+
+No database is needed.
+
+    python benchmarks/serialization.py --docs 1000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core.serialization import BSONResponse, to_jsonable  # noqa: E402
+
+
+def make_documents(count):
+    now = datetime.now()
+    documents = []
+    for i in range(count):
+        documents.append({
+            "_id": ObjectId(),
+            "page_id": f"page-{i % 50}",
+            "url": f"https://www.linkedin.com/company/page-{i % 50}/",
+            "url_key": f"linkedin.com/company/page-{i % 50}",
+            "scraped_at": now - timedelta(minutes=i),
+            "status": "success",
+            "message": "Successfully scraped company page",
+            "type": "company",
+            "tier": random.choice(("http", "browser")),
+            "timings": {"navigate": random.random(), "wait": random.random(), "parse": random.random() / 10},
+            "data": {
+                "page": {"name": f"Company {i}", "industry": "Software", "followers": f"{i * 37:,} followers"},
+                "about": "Lorem ipsum dolor sit amet " * 10,
+                "recent_posts": [
+                    {"urn": f"urn:li:activity:{i}{j}", "text": "Post text " * 20,
+                     "engagement": {"likes": str(j * 11), "comments": str(j), "reposts": "0"}}
+                    for j in range(3)
+                ],
+                "page_type": "company",
+            },
+        })
+    return documents
+
+
+def via_loop(documents):
+    # The routes mutated the documents they had just fetched; copy so runs compare fairly
+    logs = [dict(document) for document in documents]
+    for log in logs:
+        log["_id"] = str(log["_id"])
+    return JSONResponse(jsonable_encoder({"logs": logs})).body
+
+
+def via_to_jsonable(documents):
+    return json.dumps(to_jsonable({"logs": documents}), separators=(",", ":")).encode()
+
+
+def via_bson(documents):
+    return BSONResponse({"logs": documents}).body
+
+
+def timed(fn, documents, repeat):
+    values = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(documents)
+        values.append((time.perf_counter() - start) * 1000)
+    return statistics.median(values), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs)
+    results = {}
+    for name, fn in (("loop", via_loop), ("to_jsonable", via_to_jsonable), ("bson", via_bson)):
+        results[name] = timed(fn, documents, args.repeat)
+
+    baseline = results["loop"][0]
+    reference = json.loads(results["loop"][1])
+    for name, (ms, body) in results.items():
+        print(
+            f"{name:<12} {ms:8.2f}ms  {len(body) / 1024:8.1f} KiB  x{baseline / ms:5.1f}  "
+            f"same content={json.loads(body) == reference}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Shared fixtures: the app against an in-memory MongoDB (mongomock-motor).
+
+Every test gets a fresh database. Nothing here needs Chrome, LinkedIn or
+a MongoDB server; see requirements-dev.txt.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read at import time, so they are set before the app is imported
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("LI_AT", "test-cookie")
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+os.environ.setdefault("SCRAPE_JOBS_INLINE", "false")
+os.environ.setdefault("DRIVER_POOL_WARM", "false")
+os.environ.setdefault("SCRAPER_HTTP_FIRST", "false")
+os.environ.setdefault("ENTITY_CACHE_TTL", "0")
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+import mongomock.collection  # noqa: E402
+import motor.motor_asyncio  # noqa: E402
+
+# mongomock predates the sort argument pymongo passes for bulk update_one
+_add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+
+def _add_update_without_sort(self, *args, sort=None, **kwargs):
+    return _add_update(self, *args, **kwargs)
+
+
+mongomock.collection.BulkOperationBuilder.add_update = _add_update_without_sort
+# mongomock-motor's with_options returns a synchronous collection; read preferences mean nothing to it
+mongomock_motor.AsyncMongoMockCollection.with_options = lambda self, **kwargs: self
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database(monkeypatch):
+    """A fresh in-memory MongoDB for each test"""
+    from app.core.database import MongoDB
+
+    monkeypatch.setattr(motor.motor_asyncio, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+    MongoDB.close()
+    yield
+    MongoDB.close()
+
+
+@pytest.fixture
+async def client():
+    """HTTP client for the app, without its lifespan (no scheduler, job runner or browsers)"""
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+@pytest.fixture
+async def sessions():
+    """The LI_AT session registered, as the app's startup does"""
+    from app.services.session_registry import session_registry
+
+    await session_registry.load()
+    return session_registry
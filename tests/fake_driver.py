@@ -0,0 +1,38 @@
+"""A minimal stand-in for Selenium's Chrome driver, enough for DriverPool and scrape_page"""
+
+
+class FakeDriver:
+    """Serves ``html`` for every page, or ``pages[url]``; lands on ``redirect`` when set"""
+
+    def __init__(self, html="<html><body></body></html>", pages=None, redirect=None):
+        self.html = html
+        self.pages = pages or {}
+        self.redirect = redirect
+        self.current_url = "about:blank"
+        self.cookies = {}
+        self.quit_called = False
+
+    def get(self, url):
+        self.current_url = self.redirect or url
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie["name"]] = cookie["value"]
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def execute_script(self, script, *args):
+        # Heap size for the pool's health check, a loaded feed for scrolling,
+        # and "ready" for readiness waits
+        if "usedJSHeapSize" in script:
+            return 0
+        if "getElementsByClassName" in script:
+            return 3
+        return True
+
+    @property
+    def page_source(self):
+        return self.pages.get(self.current_url, self.html)
+
+    def quit(self):
+        self.quit_called = True
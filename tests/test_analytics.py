@@ -0,0 +1,24 @@
+import pytest
+
+from app.services.analytics_service import page_insights
+
+pytestmark = pytest.mark.anyio
+
+# 23:30 in UTC-5 is 04:30 the next day in UTC, the day MongoDB groups it into
+OFFSET_POST = {"page_id": "acme", "post_id": "p1", "likes": 10, "created_at": "2026-10-10T23:30:00-05:00"}
+
+
+def days(insights):
+    return [(day["day"], day["posts"], day["likes"]) for day in insights["daily"]]
+
+
+async def test_offset_timestamps_roll_up_into_their_utc_day(client):
+    assert (await client.post("/api/posts/", json=OFFSET_POST)).status_code == 200
+    assert (await client.put("/api/posts/p1", json={**OFFSET_POST, "likes": 25})).status_code == 200
+    bulk = await client.post("/api/posts/bulk", json=[{**OFFSET_POST, "likes": 40}])
+    assert bulk.json()["failed"] == 0
+
+    rollups = await page_insights("acme", 3650)
+    posts = await page_insights("acme", 3650, source="posts")
+    assert days(rollups) == days(posts)
+    assert [(day.isoformat(), count, likes) for day, count, likes in days(rollups)] == [("2026-10-11T00:00:00", 1, 40)]
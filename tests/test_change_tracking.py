@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.core.database import scrape_current_collection, scrape_diffs_collection, scraper_collection
+from app.core.indexes import ensure_indexes
+from app.models.scraper import ScraperLog
+from app.services.change_tracking import content_hash, record_version
+from app.services.scraper_service import save_scrape_log
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://www.linkedin.com/company/acme-robotics/"
+
+
+def scrape(posts, **page):
+    return {
+        "_id": ObjectId(), "url": URL, "url_key": URL, "type": "company", "scraped_at": datetime(2026, 10, 1),
+        "data": {"page": {"name": "Acme Robotics", **page}, "recent_posts": posts},
+    }
+
+
+def test_relative_timestamps_do_not_change_the_hash():
+    first = scrape([{"text": "Launch", "timestamp": "1h"}])["data"]
+    later = scrape([{"text": "Launch", "timestamp": "2d"}])["data"]
+    assert content_hash(first) == content_hash(later)
+    assert content_hash(first) != content_hash(scrape([{"text": "Launch day", "timestamp": "1h"}])["data"])
+
+
+async def test_rescrape_with_only_relative_timestamps_is_unchanged():
+    first = await record_version(scrape([{"text": "Launch", "timestamp": "1h"}]))
+    again = await record_version(scrape([{"text": "Launch", "timestamp": "2d"}]))
+    assert again == {**first, "changed": False}
+    assert await scrape_diffs_collection.count_documents({}) == 1
+
+
+async def test_orphaned_diff_gives_its_version_up(client):
+    await ensure_indexes()
+    await record_version(scrape([]))
+    # A writer that stopped after its diff, before moving the current version
+    stopped = datetime.now(timezone.utc) - timedelta(minutes=5)
+    await scrape_diffs_collection.insert_one({
+        "_id": ObjectId.from_datetime(stopped), "url_key": URL, "type": "company", "version": 2,
+        "snapshot": False, "hash": "x", "log_id": "x", "scraped_at": datetime(2026, 10, 1), "changes": [],
+    })
+
+    document = scrape([], industry="Robotics")
+    version = await record_version(document)
+    assert version["changed"] and version["version"] == 2
+    diff = await scrape_diffs_collection.find_one({"version": 2})
+    assert diff["log_id"] == str(document["_id"])
+    current = await scrape_current_collection.find_one({"url_key": URL})
+    assert current["version"] == 2 and current["data"]["page"]["industry"] == "Robotics"
+
+
+async def test_log_by_id_serves_the_data_of_its_version(client):
+    for document in (scrape([]), scrape([], industry="Robotics")):
+        version = await record_version(document)
+        document.pop("data")
+        await scraper_collection.insert_one({**document, "status": "success", "version": version["version"]})
+
+    first = await scraper_collection.find_one({"version": 1})
+    response = await client.get(f"/api/scraper/logs/{first['_id']}")
+    assert response.status_code == 200
+    assert response.json()["data"] == {"page": {"name": "Acme Robotics"}, "recent_posts": []}
+
+
+async def test_unchanged_scrape_stores_a_lean_log_pointing_at_the_first():
+    def log():
+        return ScraperLog(
+            url=URL, url_key=URL, type="company", scraped_at=datetime(2026, 10, 1), status="success",
+            message="Scraping completed successfully", data={"page": {"name": "Acme Robotics"}},
+        )
+
+    first_id = await save_scrape_log(log())
+    again = log()
+    again_id = await save_scrape_log(again)
+
+    assert again_id != first_id and again.same_as == first_id
+    stored = await scraper_collection.find_one({"_id": ObjectId(again_id)})
+    assert stored["changed"] is False and stored["same_as"] == first_id and stored["version"] == 1
+    assert "data" not in stored
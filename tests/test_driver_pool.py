@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.driver_pool import DriverPool
+from app.services.session_registry import SessionBlockedError
+from fake_driver import FakeDriver
+
+
+def make_pool():
+    launched = []
+
+    def factory():
+        launched.append(FakeDriver())
+        return launched[-1]
+
+    return DriverPool(factory, size=1, max_uses=10, lease_timeout=1, max_heap_mb=512), launched
+
+
+def test_blocked_session_keeps_the_browser_but_signs_in_again():
+    pool, launched = make_pool()
+    with pytest.raises(SessionBlockedError):
+        with pool.lease("bad-cookie"):
+            raise SessionBlockedError("expired")
+
+    with pool.lease("good-cookie") as driver:
+        assert driver is launched[0]
+        assert driver.cookies == {"li_at": "good-cookie"}
+    stats = pool.stats()
+    assert stats["launched"] == 1
+    assert stats["recycled_crashed"] == 0
+
+
+def test_crashed_browser_is_discarded():
+    pool, launched = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.lease("cookie"):
+            raise RuntimeError("chrome not reachable")
+
+    with pool.lease("cookie") as driver:
+        assert driver is launched[1]
+    assert launched[0].quit_called
+    assert pool.stats()["recycled_crashed"] == 1
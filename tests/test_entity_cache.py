@@ -0,0 +1,163 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.database import pages_collection
+from app.services.entity_cache import EntityCache, MemoryBackend, RedisBackend, entity_cache
+from app.services.normalization import normalize_scrapes
+from app.services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+PAGE = {"page_id": "acme", "name": "Acme", "url": "https://www.linkedin.com/company/acme/"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The slice of redis-py's asyncio client that RedisBackend uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.expiry[key] = ex
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def info(self, section):
+        return {"used_memory": sum(len(value) for value in self.values.values())}
+
+    async def dbsize(self):
+        return len(self.values)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """The app's entity cache, switched on with a fresh memory backend on a fake clock"""
+    clock = FakeClock()
+    monkeypatch.setattr(entity_cache, "backend", MemoryBackend(100, clock))
+    monkeypatch.setattr(entity_cache, "ttl", 60)
+    monkeypatch.setattr(entity_cache, "_inflight", SingleFlight())
+    monkeypatch.setattr(entity_cache, "_stats", dict.fromkeys(entity_cache._stats, 0))
+    return clock
+
+
+async def rename_in_db(name):
+    # A write the API does not see, so only expiry or an invalidation shows it
+    await pages_collection.update_one({"page_id": "acme"}, {"$set": {"name": name}})
+
+
+async def page_name(client):
+    return (await client.get("/api/pages/acme")).json()["page"]["name"]
+
+
+async def test_second_read_is_served_from_the_cache(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    assert await page_name(client) == "Acme"
+    await rename_in_db("Renamed")
+
+    assert await page_name(client) == "Acme"
+    stats = await entity_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+async def test_missing_entity_is_not_cached(client, clock):
+    assert (await client.get("/api/pages/acme")).status_code == 404
+    await client.post("/api/pages/", json=PAGE)
+    assert await page_name(client) == "Acme"
+
+
+async def test_entries_expire_after_the_ttl(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    await page_name(client)
+    await rename_in_db("Renamed")
+
+    clock.now += 59
+    assert await page_name(client) == "Acme"
+    clock.now += 2
+    assert await page_name(client) == "Renamed"
+
+
+async def test_etag_answers_if_none_match_with_304(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    first = await client.get("/api/pages/acme")
+    etag = first.headers["ETag"]
+
+    unchanged = await client.get("/api/pages/acme", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.headers["ETag"] == etag
+    weak = await client.get("/api/pages/acme", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert weak.status_code == 304
+
+    await client.put("/api/pages/acme", json={**PAGE, "name": "Renamed"})
+    changed = await client.get("/api/pages/acme", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+async def test_put_invalidates(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    await page_name(client)
+    await client.put("/api/pages/acme", json={**PAGE, "name": "Renamed"})
+    assert await page_name(client) == "Renamed"
+
+
+async def test_delete_invalidates(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    await page_name(client)
+    await client.delete("/api/pages/acme")
+    assert (await client.get("/api/pages/acme")).status_code == 404
+
+
+async def test_bulk_upsert_invalidates(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    await page_name(client)
+    response = await client.post("/api/pages/bulk", json=[{**PAGE, "name": "Renamed"}])
+    assert response.status_code == 200
+    assert await page_name(client) == "Renamed"
+
+
+async def test_normalized_scrape_invalidates(client, clock):
+    await client.post("/api/pages/", json=PAGE)
+    await page_name(client)
+    await normalize_scrapes([{
+        "url": PAGE["url"], "type": "company", "status": "success", "scraped_at": datetime(2026, 10, 1),
+        "data": {"page": {"name": "Acme Robotics"}},
+    }])
+    assert await page_name(client) == "Acme Robotics"
+
+
+async def test_redis_backend_serves_and_invalidates_entries():
+    redis = FakeRedis()
+    cache = EntityCache(RedisBackend(redis), ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"page_id": "acme", "name": "Acme"}
+
+    first = await cache.get("pages", "acme", load)
+    second = await cache.get("pages", "acme", load)
+    assert loads == [1]
+    assert second.body == first.body and second.etag == first.etag
+    assert redis.expiry == {"entity:pages:acme": 60}
+
+    await cache.invalidate("pages", ["acme"])
+    assert redis.values == {}
+    await cache.get("pages", "acme", load)
+    assert loads == [1, 1]
+
+    stats = await cache.stats()
+    assert (stats["backend"], stats["keys"], stats["hits"], stats["misses"]) == ("redis", 1, 1, 2)
@@ -0,0 +1,77 @@
+import os
+
+from app.services import extraction
+from app.services.extraction import Text, extract_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+def extract_fixture(page_type: str) -> dict:
+    with open(os.path.join(FIXTURES, f"{page_type}.html")) as f:
+        return extract_page(page_type, f.read())
+
+
+def test_company_page():
+    data = extract_fixture("company")
+
+    assert data["page"] == {
+        "name": "Acme Robotics",
+        "industry": "Industrial Automation",
+        "followers": "1,234,567 followers",
+        "website": "https://acme-robotics.example.com",
+        "company_size": "1,001-5,000 employees",
+        "headquarters": "San Francisco, California",
+        "founded": "2009",
+        "specialties": ["Robotics", "Computer Vision", "Motion Planning", "Fleet Management"],
+    }
+    assert data["about"].startswith("Acme Robotics builds autonomous mobile robots")
+    assert len(data["recent_posts"]) == 3
+    assert data["recent_posts"][1] == {
+        "urn": "urn:li:activity:710001",
+        "timestamp": "2d • Edited",
+        "text": "Update 1: we shipped release 4.1 with faster path planning, a new simulator and fixes for 7 customer-reported issues. #robotics",
+        "engagement": {"likes": "2,468 likes", "comments": "34 comments", "reposts": "3 reposts"},
+    }
+
+
+def test_profile_page():
+    data = extract_fixture("profile")
+
+    assert data["user"] == {
+        "name": "Jordan Rivera",
+        "headline": "Staff Engineer at Acme Robotics",
+        "location": "San Francisco Bay Area",
+        "connections": "500+ connections",
+        "about": "Building robots that work alongside people. Previously perception and planning at several startups.",
+    }
+    assert len(data["experience"]) == 8
+    assert data["experience"][0] == {"title": "Role 0", "company": "Company 0 · Full-time", "duration": "Jan 2010 - Dec 2011 · 2 yrs"}
+    assert data["education"] == [
+        {"school": "University 0", "degree": "BSc, Computer Science", "years": "2000 - 2004"},
+        {"school": "University 1", "degree": "BSc, Computer Science", "years": "2001 - 2005"},
+    ]
+
+
+def test_post_page():
+    data = extract_fixture("post")
+
+    assert data["post"] == {
+        "author": "Acme Robotics",
+        "author_headline": "1,234,567 followers",
+        "content": "We just shipped release 4.2 with faster path planning and a brand new simulator.",
+        "timestamp": "3d • Edited",
+        "engagement": {"likes": "1.2k likes", "comments": "3,401 comments", "reposts": "87 reposts"},
+    }
+    assert len(data["comments"]) == 5
+    assert data["comments"][0] == {"author": "Commenter 0", "text": "Great work on release 4.0!"}
+
+
+def test_missing_required_section_is_an_error(monkeypatch):
+    monkeypatch.setitem(extraction.SPECS, "company", {"page": {"name": Text(".org-top-card-summary__title", required=True)}})
+
+    assert extract_page("company", "<html><body></body></html>") == {"error": "Missing required section page"}
+    assert extract_page("company", '<h1 class="org-top-card-summary__title">Acme</h1>') == {"page": {"name": "Acme"}}
+
+
+def test_unknown_page_type_is_an_error():
+    assert extract_page("group", "<html></html>") == {"error": "Invalid page type specified"}
@@ -0,0 +1,106 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.config import settings
+from app.services import http_fetcher, scraper_service
+from app.services.driver_pool import driver_pool
+from app.services.http_fetcher import fetch_static_page
+from fake_driver import FakeDriver
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+with open(os.path.join(FIXTURES, "company.html")) as f:
+    COMPANY_HTML = f.read()
+
+# The shell LinkedIn serves before its scripts render the rest of the top card
+SHELL_HTML = '<html><body><h1 class="org-top-card-summary__title">Acme Robotics</h1></body></html>'
+
+
+class StubLinkedIn(BaseHTTPRequestHandler):
+    cookies = []
+
+    def do_GET(self):
+        StubLinkedIn.cookies.append(self.headers.get("Cookie"))
+        if self.path.startswith("/company/private/"):
+            self.send_response(302)
+            self.send_header("Location", "/authwall?trk=public_profile")
+            self.end_headers()
+            return
+        body = {
+            "/company/acme-robotics/": COMPANY_HTML,
+            "/company/shell/": SHELL_HTML,
+            "/authwall?trk=public_profile": "<html><body>Sign in</body></html>",
+        }.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def linkedin():
+    """Base URL of a local stub standing in for linkedin.com"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLinkedIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubLinkedIn.cookies = []
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    """Browser-tier fallback that serves the fully rendered company page"""
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver(COMPANY_HTML))
+        return drivers[-1]
+
+    monkeypatch.setattr(settings, "SCRAPER_HTTP_FIRST", True)
+    monkeypatch.setattr(driver_pool, "factory", factory)
+    yield drivers
+    driver_pool.close()
+
+
+def test_static_html_with_required_fields_is_scraped_over_http(linkedin, browser):
+    result = scraper_service.scrape_page(f"{linkedin}/company/acme-robotics/", "company", "cookie-1")
+
+    assert result["tier"] == "http"
+    assert result["data"]["page"]["name"] == "Acme Robotics"
+    assert result["data"]["page"]["industry"] == "Industrial Automation"
+    assert "http_fetch" in result["timings"]
+    assert StubLinkedIn.cookies == ["li_at=cookie-1"]
+    assert browser == []
+
+
+def test_missing_required_fields_fall_back_to_the_browser(linkedin, browser):
+    url = f"{linkedin}/company/shell/"
+    assert fetch_static_page(url, "company", "cookie-1") is None
+
+    result = scraper_service.scrape_page(url, "company", "cookie-1")
+    assert result["tier"] == "browser"
+    assert result["data"]["page"]["industry"] == "Industrial Automation"
+    assert len(browser) == 1
+
+
+def test_login_redirect_is_not_taken_for_the_page(linkedin, monkeypatch):
+    extracted = []
+    monkeypatch.setattr(http_fetcher, "extract_page", lambda *args: extracted.append(args) or {})
+
+    assert fetch_static_page(f"{linkedin}/company/private/", "company", "cookie-1") is None
+    assert fetch_static_page(f"{linkedin}/company/missing/", "company", "cookie-1") is None
+    assert len(StubLinkedIn.cookies) == 3
+    assert extracted == []
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from bson import ObjectId
+
+from app.core.database import scrape_current_collection, scrape_jobs_collection, scraper_collection
+from app.services.driver_pool import driver_pool
+from app.services.job_service import claim_next_job, run_job
+from fake_driver import FakeDriver
+
+pytestmark = pytest.mark.anyio
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "company.html")
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    with open(FIXTURE) as f:
+        html = f.read()
+    monkeypatch.setattr(driver_pool, "factory", lambda: FakeDriver(html))
+    yield
+    driver_pool.close()
+
+
+async def test_job_is_queued_claimed_scraped_and_recorded(client, sessions, fake_browser):
+    url = "https://www.linkedin.com/company/acme-robotics/"
+    submitted = await client.post("/api/scraper/jobs", json={"url": url, "type": "company"})
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    job = await claim_next_job("test-worker")
+    assert str(job["_id"]) == job_id and job["status"] == "running"
+    assert await claim_next_job("other-worker") is None
+    await run_job(job)
+
+    finished = (await client.get(f"/api/scraper/jobs/{job_id}")).json()
+    assert finished["status"] == "done"
+    assert finished["result"] == {"status": "success", "error_message": None}
+    stored = await scrape_jobs_collection.find_one({"_id": ObjectId(job_id)})
+    assert "data" not in stored["result"]
+
+    log = await scraper_collection.find_one({"_id": ObjectId(finished["log_id"])})
+    assert log["status"] == "success" and log["tier"] == "browser"
+    current = await scrape_current_collection.find_one({"type": "company"})
+    assert current["data"]["page"]["name"] == "Acme Robotics"
@@ -0,0 +1,19 @@
+import pytest
+from prometheus_client import REGISTRY
+
+pytestmark = pytest.mark.anyio
+
+
+def requests_seen(method, route, status):
+    return REGISTRY.get_sample_value("http_request_seconds_count", {"method": method, "route": route, "status": status}) or 0
+
+
+@pytest.mark.parametrize("path, route", [
+    ("/api/pages/acme", "/api/pages/{page_id}"),
+    ("/api/scraper/logs/0123456789abcdef01234567", "/api/scraper/logs/{log_id}"),
+    ("/no/such/route", "unmatched"),
+])
+async def test_requests_are_timed_by_route_template(client, path, route):
+    before = requests_seen("GET", route, "404")
+    await client.get(path)
+    assert requests_seen("GET", route, "404") == before + 1
@@ -0,0 +1,96 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import refresh_schedule_collection
+from app.models.schedule import RefreshScheduleCreate
+from app.services.refresh_scheduler import RefreshScheduler
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """Time moves only when the scheduler sleeps"""
+
+    def __init__(self):
+        self.time = datetime(2026, 1, 1)
+
+    def now(self):
+        return self.time
+
+    async def sleep(self, seconds):
+        self.time += timedelta(seconds=seconds)
+
+
+def make_scheduler(clock, dispatch, **overrides):
+    options = dict(rate_per_minute=6, burst=2, max_queue=100, jitter=0.1, poll_interval=5, retry_delay=60)
+    options.update(overrides)
+    return RefreshScheduler(**options, clock=clock, dispatch=dispatch, rng=random.Random(1))
+
+
+async def run_for(scheduler, clock, duration):
+    end = clock.time + duration
+    while clock.time < end:
+        await scheduler.tick()
+        await clock.sleep(scheduler._idle_time())
+
+
+async def test_dispatches_are_paced_per_domain():
+    clock = FakeClock()
+    sent = []
+
+    async def dispatch(entry):
+        sent.append((clock.now(), entry["domain"]))
+        return "job"
+
+    scheduler = make_scheduler(clock, dispatch)
+    for i in range(30):
+        await scheduler.add(RefreshScheduleCreate(url=f"https://www.linkedin.com/company/c{i}", interval=60))
+    await scheduler.add(RefreshScheduleCreate(url="https://example.org/x", interval=600))
+    await run_for(scheduler, clock, timedelta(hours=1))
+
+    linkedin = [at for at, domain in sent if domain == "linkedin.com"]
+    # 6 per minute after the initial burst of 2, however many pages are due
+    assert 6 * 60 <= len(linkedin) <= 6 * 60 + 2
+    assert any(domain == "example.org" for _, domain in sent)
+
+
+async def test_failed_dispatch_is_retried_with_backoff():
+    clock = FakeClock()
+    attempts = []
+
+    async def dispatch(entry):
+        attempts.append(clock.now())
+        if len(attempts) < 3:
+            raise RuntimeError("MongoDB unavailable")
+        return "job-1"
+
+    scheduler = make_scheduler(clock, dispatch)
+    await scheduler.add(RefreshScheduleCreate(url="https://www.linkedin.com/company/acme", interval=3600))
+    await run_for(scheduler, clock, timedelta(hours=1))
+
+    first, second, third = attempts
+    assert round((second - first).total_seconds()) == 60
+    assert round((third - second).total_seconds()) == 120
+    entry = await refresh_schedule_collection.find_one({})
+    assert entry["last_dispatched"] == third
+    assert entry["last_job_id"] == "job-1"
+    assert entry["failures"] == 0
+
+
+async def test_rate_limited_entry_is_not_marked_dispatched():
+    clock = FakeClock()
+
+    async def dispatch(entry):
+        return "job"
+
+    scheduler = make_scheduler(clock, dispatch, burst=1)
+    for i in range(2):
+        await scheduler.add(RefreshScheduleCreate(url=f"https://www.linkedin.com/company/c{i}", interval=3600))
+    clock.time += timedelta(hours=1)
+    assert await scheduler.tick() == 1
+
+    undispatched = await refresh_schedule_collection.find_one({"last_job_id": None})
+    assert undispatched.get("last_dispatched") is None
+    assert undispatched["next_due"] <= clock.now()
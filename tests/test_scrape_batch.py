@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.api.routes import scraper as scraper_routes
+from app.core.config import settings
+from app.core.database import scraper_collection
+from app.models.scraper import ScrapeRequest, ScraperLog
+
+pytestmark = pytest.mark.anyio
+
+
+async def fake_execute_scrape(request, wait=False):
+    return ScraperLog(
+        url=str(request.url), url_key=str(request.url), scraped_at=datetime.now(), status="success",
+        message="ok", type=request.type, tier="http", data={"page": {"name": str(request.url)}},
+    )
+
+
+async def test_disconnect_still_stores_the_logs_already_streamed(monkeypatch, sessions):
+    monkeypatch.setattr(scraper_routes, "execute_scrape", fake_execute_scrape)
+    monkeypatch.setattr(settings, "SCRAPE_BATCH_CHUNK", 50)
+    requests = [ScrapeRequest(url=f"https://www.linkedin.com/company/acme-{i}/") for i in range(3)]
+
+    response = await scraper_routes.scrape_linkedin_pages(requests)
+    lines = response.body_iterator
+    first = json.loads(await lines.__anext__())
+    # The client goes away before the chunk is full, so before it was flushed
+    await lines.aclose()
+
+    assert await scraper_collection.find_one({"_id": ObjectId(first["log_id"])}) is not None
+
+
+async def test_invalid_entries_fail_alone(monkeypatch, sessions, client):
+    monkeypatch.setattr(scraper_routes, "execute_scrape", fake_execute_scrape)
+    batch = [
+        {"url": "https://www.linkedin.com/company/acme/"},
+        {"url": "not a url"},
+        "https://www.linkedin.com/company/bare-string/",
+        {"url": "https://www.linkedin.com/in/jane/", "type": "profile"},
+    ]
+
+    response = await client.post("/api/scraper/scrape/batch", json=batch)
+    assert response.status_code == 200
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+
+    assert sorted(lines) == [0, 1, 2, 3]
+    assert lines[0]["status"] == lines[3]["status"] == "success"
+    assert lines[1]["status"] == "invalid" and lines[1]["url"] == "not a url"
+    assert lines[1]["detail"][0]["loc"] == ["url"]
+    assert lines[2]["status"] == "invalid" and lines[2]["url"] is None
+    assert await scraper_collection.count_documents({}) == 2
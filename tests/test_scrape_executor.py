@@ -0,0 +1,34 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.scraper_service import ScrapeExecutor, ScraperBusyError
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cancelled_caller_keeps_its_slot_until_the_worker_finishes():
+    executor = ScrapeExecutor("thread", max_workers=1, max_queue=0)
+    release = threading.Event()
+    try:
+        caller = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+
+        # The browser is still busy, so the slot is too
+        assert executor.stats()["running"] == 1
+        with pytest.raises(ScraperBusyError):
+            await executor.run(lambda: "next")
+
+        release.set()
+        for _ in range(100):
+            if executor.stats()["running"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.stats()["running"] == 0
+        assert await executor.run(lambda: "next") == "next"
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,25 @@
+import pytest
+
+from app.models.scraper import ScrapeRequest
+from app.services import scraper_service
+from app.services.session_registry import SessionBlockedError, SessionRegistry
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_block_reason_survives_running_out_of_sessions(monkeypatch):
+    registry = SessionRegistry("round_robin", backoff_base=60, backoff_max=600)
+    session = registry.add("only-cookie", "main")
+    monkeypatch.setattr(scraper_service, "session_registry", registry)
+
+    def blocked(url, page_type, cookie):
+        raise SessionBlockedError("checkpoint")
+
+    monkeypatch.setattr(scraper_service, "scrape_page", blocked)
+    log = await scraper_service.execute_scrape(ScrapeRequest(url="https://www.linkedin.com/company/acme/", type="company"))
+
+    assert log.status == "failed"
+    assert log.message == "LinkedIn session blocked"
+    assert log.error_message.startswith("Session main was sent to a checkpoint page")
+    assert "cooling down" in log.error_message
+    assert log.session == session.id and session.blocks == 1
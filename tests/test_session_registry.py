@@ -0,0 +1,17 @@
+import pytest
+
+from app.services.session_registry import block_reason
+
+
+@pytest.mark.parametrize("url, reason", [
+    ("https://www.linkedin.com/login?session_redirect=%2Fcompany%2Facme", "expired"),
+    ("https://www.linkedin.com/uas/login?trk=guest", "expired"),
+    ("https://www.linkedin.com/authwall?trk=gf", "expired"),
+    ("https://www.linkedin.com/checkpoint/challenge/AgF3", "checkpoint"),
+    ("https://www.linkedin.com/company/loginradius/", None),
+    ("https://www.linkedin.com/in/loginov-ivan/", None),
+    ("https://www.linkedin.com/company/checkpoint-systems/", None),
+    ("https://www.linkedin.com/posts/acme_login-tips-activity-7100000000000000000/", None),
+])
+def test_block_reason_matches_login_walls_not_page_names(url, reason):
+    assert block_reason(url) == reason
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_callers_share_one_load():
+    flights = SingleFlight()
+    loads = []
+    release = asyncio.Event()
+
+    async def load():
+        loads.append(1)
+        await release.wait()
+        return {"name": "Acme"}
+
+    callers = [asyncio.create_task(flights.do("pages:acme", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert "pages:acme" in flights and len(flights) == 1
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert loads == [1]
+    assert [flight.shared for flight in results] == [False, True, True, True, True]
+    assert all(flight.result == {"name": "Acme"} for flight in results)
+    assert len(flights) == 0
+
+
+async def test_invalidated_load_is_marked_overtaken():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "old"
+
+    leader = asyncio.create_task(flights.do("pages:acme", load))
+    await asyncio.sleep(0)
+    flights.invalidate(["pages:acme", "pages:other"])
+    release.set()
+
+    assert (await leader).overtaken
+    assert not (await flights.do("pages:acme", load)).overtaken
+
+
+async def test_failed_load_fails_every_waiting_caller():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*[flights.do("k", load) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(flights) == 0
+
+
+async def test_cancelling_the_first_caller_leaves_the_load_to_the_others():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "fresh"
+
+    leader = asyncio.create_task(flights.do("k", load))
+    waiters = [asyncio.create_task(flights.do("k", load)) for _ in range(2)]
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert [(await waiter).result for waiter in waiters] == ["fresh", "fresh"]
+    assert leader.cancelled()
+    assert len(flights) == 0
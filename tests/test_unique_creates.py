@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from app.core.database import pages_collection, posts_collection, users_collection
+from app.core.indexes import ensure_indexes
+
+pytestmark = pytest.mark.anyio
+
+CREATES = [
+    ("/api/pages/", {"page_id": "acme", "name": "Acme", "url": "https://www.linkedin.com/company/acme/"}, pages_collection, "page_id"),
+    ("/api/posts/", {"page_id": "acme", "post_id": "p1", "created_at": "2026-10-10T12:00:00"}, posts_collection, "post_id"),
+    ("/api/users/", {"linkedin_id": "jane", "name": "Jane", "profile_url": "https://www.linkedin.com/in/jane/"}, users_collection, "linkedin_id"),
+]
+
+
+@pytest.mark.parametrize("path, body, collection, key", CREATES)
+async def test_concurrent_duplicate_creates_store_one_document(client, path, body, collection, key):
+    await ensure_indexes()
+    responses = await asyncio.gather(*[client.post(path, json=body) for _ in range(10)])
+
+    assert sorted(response.status_code for response in responses) == [200] + [400] * 9
+    assert await collection.count_documents({key: body[key]}) == 1